@@ -19,9 +19,17 @@ del cliente mediante self.client_address.
 """
 
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import os
+import sys
 
-class MyHTTPRequestHandler(BaseHTTPRequestHandler):
+# La raíz del repositorio, para importar el paquete comun
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
+
+from comun.servidor_http import ManejadorInstrumentado, ServidorInstrumentado
+
+class MyHTTPRequestHandler(ManejadorInstrumentado):
     """
     Manejador de peticiones HTTP personalizado
     """
@@ -32,6 +40,7 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
 
         Rutas implementadas:
         - `/ip`: Devuelve la IP del cliente en formato JSON
+        - `/metrics`: Métricas del servidor en formato Prometheus
 
         Para otras rutas, devuelve un código de estado 404 (Not Found).
         """
@@ -43,12 +52,12 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
         
         if self.path == '/ip':
             ip_client = self._get_client_ip()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
             # Creamos un diccionario con la IP y lo enviamos como JSON
+            # (comprimido si el cliente lo acepta y supera el umbral de compresión)
             ip_json = {"ip": ip_client}
-            self.wfile.write(json.dumps(ip_json, indent=4).encode('utf-8'))
+            self.enviar_cuerpo(200, json.dumps(ip_json, indent=4).encode('utf-8'), 'application/json')
+        elif self.path == '/metrics':
+            self.enviar_metricas()
         else:
             self.send_response(404)
             self.end_headers()
@@ -85,12 +94,16 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
             ip_client = self.client_address[0]
         return ip_client
 
-def create_server(host="localhost", port=8000):
+def create_server(host="localhost", port=8000, log="asincrono"):
     """
     Crea y configura el servidor HTTP
+
+    Args:
+        log: Modo del log de accesos: 'estandar' (síncrono por stderr), 'asincrono'
+             (en segundo plano y por lotes) o 'desactivado'
     """
     server_address = (host, port)
-    httpd = HTTPServer(server_address, MyHTTPRequestHandler)
+    httpd = ServidorInstrumentado(server_address, MyHTTPRequestHandler, rutas=("/ip", "/metrics"), log=log)
     return httpd
 
 def run_server(server):
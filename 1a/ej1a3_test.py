@@ -52,3 +52,19 @@ def test_nonexistent_endpoint(server):
     """
     response = requests.get("http://localhost:8888/nonexistent")
     assert response.status_code == 404, "El código de estado debe ser 404 para rutas inexistentes."
+
+def test_metrics_endpoint(server):
+    """
+    Prueba el endpoint /metrics para validar que cuenta las peticiones por ruta y los 404.
+    """
+    requests.get("http://localhost:8888/ip")
+    requests.get("http://localhost:8888/nonexistent")
+    response = requests.get("http://localhost:8888/metrics")
+    assert response.status_code == 200, "El código de estado debe ser 200."
+    assert response.headers['Content-Type'].startswith('text/plain'), "Las métricas deben estar en texto plano."
+
+    assert 'http_server_requests_total{route="/ip",method="GET",status="200"} 1' in response.text
+    assert 'http_server_requests_total{route="otras",method="GET",status="404"} 1' in response.text, \
+        "Las rutas no declaradas deben agruparse como 'otras'."
+    assert 'http_server_not_found_total 1' in response.text
+    assert 'http_server_request_duration_seconds_count{route="/ip"} 1' in response.text
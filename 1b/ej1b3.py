@@ -21,9 +21,17 @@ error 404 personalizado en formato JSON.
 
 import json
 import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import os
+import sys
 
-class MyHTTPRequestHandler(BaseHTTPRequestHandler):
+# La raíz del repositorio, para importar el paquete comun
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
+
+from comun.servidor_http import ManejadorInstrumentado, ServidorInstrumentado
+
+class MyHTTPRequestHandler(ManejadorInstrumentado):
     """
     Manejador de peticiones HTTP personalizado
     """
@@ -34,16 +42,13 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
 
         Rutas implementadas:
         - `/time`: Devuelve la hora actual del sistema en formato JSON
+        - `/metrics`: Métricas del servidor en formato Prometheus
 
         Para otras rutas, debes devolver un código de estado 404 (Not Found) con un mensaje
         personalizado en formato JSON.
         """
         if self.path == "/time":
             # Esta parte ya está implementada: devuelve la hora del sistema en JSON
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-
             current_time = datetime.datetime.now()
             time_info = {
                 "timestamp": current_time.timestamp(),
@@ -51,7 +56,10 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
                 "readable": current_time.strftime("%Y-%m-%d %H:%M:%S")
             }
 
-            self.wfile.write(json.dumps(time_info).encode())
+            # La hora cambia en cada petición: no se guarda en la caché de compresión
+            self.enviar_cuerpo(200, json.dumps(time_info).encode(), "application/json", cachear=False)
+        elif self.path == "/metrics":
+            self.enviar_metricas()
         else:
             # Implementa aquí el manejo de errores para rutas no definidas
             # Debes:
@@ -74,24 +82,24 @@ class MyHTTPRequestHandler(BaseHTTPRequestHandler):
             # - Para el código: "code" o "status"
             # - Para el mensaje: "message", "descripcion" o "detail"
             # Esta parte ya está implementada: devuelve la hora del sistema en JSON
-            self.send_response(404)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-
             error_info = {
                 'code': 404,
                 'message': f'Recurso {self.path} no encontrado'
             }
 
-            self.wfile.write(json.dumps(error_info).encode())
+            self.enviar_cuerpo(404, json.dumps(error_info).encode(), 'application/json', cachear=False)
 
 
-def create_server(host="localhost", port=8000):
+def create_server(host="localhost", port=8000, log="asincrono"):
     """
     Crea y configura el servidor HTTP
+
+    Args:
+        log: Modo del log de accesos: 'estandar' (síncrono por stderr), 'asincrono'
+             (en segundo plano y por lotes) o 'desactivado'
     """
     server_address = (host, port)
-    httpd = HTTPServer(server_address, MyHTTPRequestHandler)
+    httpd = ServidorInstrumentado(server_address, MyHTTPRequestHandler, rutas=("/time", "/metrics"), log=log)
     return httpd
 
 def run_server(server):
@@ -0,0 +1,114 @@
+"""
+Benchmark de rendimiento del servidor de ej1b3 según el modo del log de accesos.
+
+Lanza --requests peticiones a /time con --clients hilos cliente contra el servidor
+con cada modo de log y muestra las peticiones por segundo:
+
+1. estandar: log_message de http.server, síncrono por stderr
+2. asincrono: registros encolados y escritos por lotes en segundo plano
+3. asincrono 10 %: como el anterior, guardando solo el 10 % de las respuestas correctas
+4. desactivado: sin log de accesos
+
+El log se escribe en un fichero temporal con buffer de línea, como stderr (stderr
+redirigido), no en la terminal, para que el coste sea el de escribir en disco. Los
+clientes usan sockets directamente (la petición ya serializada) para que su coste
+no tape el del servidor, y de cada modo se muestra la mejor de --rounds rondas.
+
+Uso:
+    python ej1b3_bench.py [--requests 2000] [--clients 4] [--rounds 3]
+"""
+
+import argparse
+import contextlib
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+# La raíz del repositorio, para importar el paquete comun
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
+
+from ej1b3 import MyHTTPRequestHandler, create_server
+from comun.registro_accesos import RegistroAccesos
+from comun.servidor_http import ServidorInstrumentado
+
+
+def crear_servidores():
+    """
+    Devuelve, para cada caso, una función que crea el servidor en un puerto libre.
+    """
+    return {
+        "estandar": lambda: create_server("localhost", 0, log="estandar"),
+        "asincrono": lambda: create_server("localhost", 0, log="asincrono"),
+        "asincrono 10 %": lambda: ServidorInstrumentado(
+            ("localhost", 0), MyHTTPRequestHandler, rutas=("/time", "/metrics"),
+            registro_accesos=RegistroAccesos(muestreo=0.1)),
+        "desactivado": lambda: create_server("localhost", 0, log="desactivado"),
+    }
+
+
+def medir(server, num_requests: int, clients: int) -> float:
+    """
+    Devuelve las peticiones por segundo que atiende el servidor.
+    """
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    direccion = ("localhost", server.server_port)
+    peticion_http = b"GET /time HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+    def peticion(_):
+        # El servidor responde con HTTP/1.0 y cierra la conexión tras cada respuesta
+        with socket.create_connection(direccion) as sock:
+            sock.sendall(peticion_http)
+            respuesta = b""
+            while True:
+                datos = sock.recv(4096)
+                if not datos:
+                    break
+                respuesta += datos
+        return int(respuesta.split(b" ", 2)[1])
+
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            list(executor.map(peticion, range(clients * 10)))  # calentamiento
+            inicio = time.perf_counter()
+            codigos = list(executor.map(peticion, range(num_requests)))
+            duracion = time.perf_counter() - inicio
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+    assert all(codigo == 200 for codigo in codigos)
+    return num_requests / duracion
+
+
+def run(num_requests: int = 2000, clients: int = 4, rounds: int = 3) -> Dict[str, float]:
+    """
+    Ejecuta el benchmark y devuelve las peticiones por segundo de cada modo de log.
+    """
+    resultados: Dict[str, float] = {}
+    with tempfile.TemporaryFile("w+", buffering=1) as log, contextlib.redirect_stderr(log):
+        for _ in range(rounds):
+            for nombre, crear in crear_servidores().items():
+                resultados[nombre] = max(resultados.get(nombre, 0.0), medir(crear(), num_requests, clients))
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.requests} peticiones a /time con {args.clients} clientes")
+    resultados = run(args.requests, args.clients, args.rounds)
+    base = resultados["estandar"]
+    for nombre, rps in resultados.items():
+        print(f"{nombre:>16}: {rps:8.0f} peticiones/s ({rps / base:.2f}x)")
@@ -81,3 +81,28 @@ def test_custom_404_error(server):
 
     # Verificar que el mensaje de error incluye la ruta solicitada
     assert test_path in data[message_field], f"El mensaje de error debe incluir la ruta solicitada '{test_path}'."
+
+def test_metrics_endpoint(server):
+    """
+    Prueba el endpoint /metrics para validar que cuenta las peticiones por ruta y los 404.
+    """
+    for _ in range(3):
+        requests.get("http://localhost:8888/time")
+    requests.get("http://localhost:8888/ruta_no_existente")
+    response = requests.get("http://localhost:8888/metrics")
+    assert response.status_code == 200, "El código de estado debe ser 200."
+
+    assert 'http_server_requests_total{route="/time",method="GET",status="200"} 3' in response.text
+    assert 'http_server_not_found_total 1' in response.text
+    assert 'http_server_request_duration_seconds_bucket{route="/time",le="+Inf"} 3' in response.text
+    assert 'http_server_requests_in_flight 1' in response.text, "La propia petición a /metrics está en curso."
+
+def test_compressed_404(server):
+    """
+    Prueba que un 404 mayor que el umbral de compresión se envía comprimido si el cliente lo acepta.
+    """
+    test_path = "/" + "ruta_no_existente/" * 100
+    response = requests.get(f"http://localhost:8888{test_path}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 404, "El código de estado debe ser 404 para rutas inexistentes."
+    assert response.headers.get('Content-Encoding') == 'gzip', "El error debe enviarse comprimido con gzip."
+    assert json.loads(response.text)['message'] == f"Recurso {test_path} no encontrado"
@@ -0,0 +1,225 @@
+"""
+Análisis vectorizado de la disponibilidad de bicicletas con NumPy.
+
+Convierte una instantánea de station_status (lista de StationStatusInfo o
+StationStatusTable) en arrays de NumPy una sola vez y calcula sobre ellos los
+resúmenes habituales sin recorrer las estaciones en Python:
+
+- Total de bicicletas, anclajes y bicicletas por tipo
+- Proporción de estaciones operativas
+- Proporción de bicicletas fuera de servicio
+- Agrupaciones por distrito, uniendo con los datos de station_information (ej1c2)
+"""
+
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from ej1c3 import StationStatus, StationStatusInfo, StationStatusTable
+
+
+class SnapshotArrays:
+    """
+    Columnas de una instantánea como arrays de NumPy (una posición por estación).
+
+    Los valores ausentes se tratan como 0.
+
+    Atributos:
+        station_ids: Lista de IDs de estación
+        num_bikes_available, num_bikes_disabled, num_docks_available: Arrays de enteros
+        operational: Array booleano (en servicio y permite alquilar y devolver)
+        vehicle_type_ids: Lista de tipos de vehículo
+        vehicle_counts: Matriz (estaciones x tipos) con las bicicletas por tipo
+    """
+
+    def __init__(self, station_ids: List[str], num_bikes_available: np.ndarray,
+                 num_bikes_disabled: np.ndarray, num_docks_available: np.ndarray,
+                 operational: np.ndarray, vehicle_type_ids: List[str], vehicle_counts: np.ndarray):
+        self.station_ids = station_ids
+        self.num_bikes_available = num_bikes_available
+        self.num_bikes_disabled = num_bikes_disabled
+        self.num_docks_available = num_docks_available
+        self.operational = operational
+        self.vehicle_type_ids = vehicle_type_ids
+        self.vehicle_counts = vehicle_counts
+
+    def __len__(self) -> int:
+        return len(self.station_ids)
+
+    @classmethod
+    def from_stations(cls, stations: List[StationStatusInfo]) -> 'SnapshotArrays':
+        """
+        Construye los arrays a partir de una lista de StationStatusInfo.
+
+        Args:
+            stations: Estaciones de la instantánea
+
+        Returns:
+            SnapshotArrays: Columnas de la instantánea
+        """
+        vehicle_type_ids = sorted({vtype.vehicle_type_id for station in stations
+                                   for vtype in station.vehicle_types})
+        type_columns = {vehicle_type_id: col for col, vehicle_type_id in enumerate(vehicle_type_ids)}
+        vehicle_counts = np.zeros((len(stations), len(vehicle_type_ids)), dtype=np.int64)
+        for row, station in enumerate(stations):
+            # Un tipo listado dos veces se suma, como en StationStatusTable
+            for vtype in station.vehicle_types:
+                vehicle_counts[row, type_columns[vtype.vehicle_type_id]] += vtype.count or 0
+
+        def column(name):
+            return np.fromiter((getattr(station, name) or 0 for station in stations),
+                               dtype=np.int64, count=len(stations))
+
+        return cls(
+            station_ids=[station.station_id for station in stations],
+            num_bikes_available=column('num_bikes_available'),
+            num_bikes_disabled=column('num_bikes_disabled'),
+            num_docks_available=column('num_docks_available'),
+            operational=np.fromiter((station.is_operational for station in stations),
+                                    dtype=bool, count=len(stations)),
+            vehicle_type_ids=vehicle_type_ids,
+            vehicle_counts=vehicle_counts,
+        )
+
+    @classmethod
+    def from_table(cls, table: StationStatusTable) -> 'SnapshotArrays':
+        """
+        Construye los arrays a partir de una StationStatusTable sin recorrer las estaciones.
+
+        Args:
+            table: Instantánea en formato de estructura de arrays
+
+        Returns:
+            SnapshotArrays: Columnas de la instantánea
+        """
+        def column(name):
+            values = np.frombuffer(getattr(table, name), dtype=getattr(table, name).typecode)
+            return np.where(values == -1, 0, values).astype(np.int64)
+
+        status = np.frombuffer(table.status, dtype=np.int8)
+        renting = np.frombuffer(table.is_renting, dtype=np.int8)
+        returning = np.frombuffer(table.is_returning, dtype=np.int8)
+        vehicle_type_ids = sorted(table.vehicle_types)
+        vehicle_counts = np.empty((len(table), len(vehicle_type_ids)), dtype=np.int64)
+        for col, vehicle_type_id in enumerate(vehicle_type_ids):
+            vehicle_counts[:, col] = np.frombuffer(table.vehicle_types[vehicle_type_id], dtype=np.int16)
+
+        return cls(
+            station_ids=list(table.station_ids),
+            num_bikes_available=column('num_bikes_available'),
+            num_bikes_disabled=column('num_bikes_disabled'),
+            num_docks_available=column('num_docks_available'),
+            operational=(status == StationStatus.IN_SERVICE.value) & (renting == 1) & (returning == 1),
+            vehicle_type_ids=vehicle_type_ids,
+            vehicle_counts=vehicle_counts,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Union[List[StationStatusInfo], StationStatusTable]) -> 'SnapshotArrays':
+        """
+        Construye los arrays a partir de una lista de estaciones, una StationStatusSnapshot
+        o una StationStatusTable.
+        """
+        if isinstance(snapshot, StationStatusTable):
+            return cls.from_table(snapshot)
+        return cls.from_stations(list(getattr(snapshot, 'stations', snapshot)))
+
+
+def summarize(arrays: SnapshotArrays) -> Dict[str, Union[int, float, Dict]]:
+    """
+    Calcula el resumen de disponibilidad de toda la instantánea.
+
+    Args:
+        arrays: Columnas de la instantánea
+
+    Returns:
+        Dict: Diccionario con:
+            - stations: Número de estaciones
+            - total_bikes, total_docks: Bicicletas y anclajes disponibles
+            - bikes_by_type: Diccionario tipo de vehículo -> bicicletas disponibles
+            - operational_share: Proporción de estaciones operativas (0-1)
+            - disabled_ratio: Bicicletas fuera de servicio / total de bicicletas (0-1)
+    """
+    bikes = int(arrays.num_bikes_available.sum())
+    disabled = int(arrays.num_bikes_disabled.sum())
+    by_type = arrays.vehicle_counts.sum(axis=0)
+    return {
+        'stations': len(arrays),
+        'total_bikes': bikes,
+        'total_docks': int(arrays.num_docks_available.sum()),
+        'bikes_by_type': {vehicle_type_id: int(count)
+                          for vehicle_type_id, count in zip(arrays.vehicle_type_ids, by_type)},
+        'operational_share': float(arrays.operational.mean()) if len(arrays) else 0.0,
+        'disabled_ratio': disabled / (bikes + disabled) if bikes + disabled else 0.0,
+    }
+
+
+def district_from_cross_street(station_info: Dict) -> Optional[str]:
+    """
+    Extrae el distrito del campo cross_street de station_information.
+
+    En Barcelona cross_street tiene el formato "02-Eixample/05-el Fort Pienc"
+    (distrito/barrio).
+
+    Args:
+        station_info: Información de una estación (ver ej1c2.get_station_info)
+
+    Returns:
+        Optional[str]: Distrito de la estación, o None si no se puede determinar
+    """
+    cross_street = station_info.get('cross_street')
+    if not cross_street:
+        return None
+    return cross_street.split('/')[0].strip() or None
+
+
+def summarize_by_district(arrays: SnapshotArrays, stations_data: Dict,
+                          district_key: Callable[[Dict], Optional[str]] = district_from_cross_street
+                          ) -> Dict[str, Dict[str, Union[int, float, Dict]]]:
+    """
+    Calcula el resumen de disponibilidad agrupado por distrito.
+
+    Las estaciones sin información de distrito se agrupan bajo la clave 'unknown'.
+
+    Args:
+        arrays: Columnas de la instantánea
+        stations_data: Datos de station_information (ver ej1c2.get_stations_data)
+        district_key: Función que obtiene el distrito de la información de una estación
+
+    Returns:
+        Dict[str, Dict]: Diccionario distrito -> resumen con el formato de summarize()
+    """
+    districts_by_id = {}
+    for station_info in (stations_data or {}).get('stations', []):
+        districts_by_id[station_info.get('station_id')] = district_key(station_info)
+    labels = np.array([districts_by_id.get(station_id) or 'unknown' for station_id in arrays.station_ids],
+                      dtype=object)
+    if not labels.size:
+        return {}
+    names, groups = np.unique(labels.astype(str), return_inverse=True)
+    num_groups = len(names)
+
+    def group_sum(values):
+        return np.bincount(groups, weights=values, minlength=num_groups)
+
+    stations = np.bincount(groups, minlength=num_groups)
+    bikes = group_sum(arrays.num_bikes_available)
+    disabled = group_sum(arrays.num_bikes_disabled)
+    docks = group_sum(arrays.num_docks_available)
+    operational = group_sum(arrays.operational.astype(np.int64))
+    by_type = [group_sum(arrays.vehicle_counts[:, col]) for col in range(len(arrays.vehicle_type_ids))]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        disabled_ratio = np.nan_to_num(disabled / (bikes + disabled))
+
+    return {
+        str(name): {
+            'stations': int(stations[group]),
+            'total_bikes': int(bikes[group]),
+            'total_docks': int(docks[group]),
+            'bikes_by_type': {vehicle_type_id: int(counts[group])
+                              for vehicle_type_id, counts in zip(arrays.vehicle_type_ids, by_type)},
+            'operational_share': float(operational[group] / stations[group]),
+            'disabled_ratio': float(disabled_ratio[group]),
+        }
+        for group, name in enumerate(names)
+    }
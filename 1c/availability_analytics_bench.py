@@ -0,0 +1,101 @@
+"""
+Benchmark de availability_analytics frente a la versión con bucles de Python.
+
+Compara el cálculo del resumen de disponibilidad y de la agrupación por distrito
+recorriendo los objetos StationStatusInfo y sus get_available_bikes_by_type()
+con la versión vectorizada de NumPy (incluida o no la conversión a arrays).
+
+Uso:
+    python availability_analytics_bench.py [--stations 500 5000 50000] [--repeat 5]
+"""
+
+import argparse
+import random
+import timeit
+from collections import defaultdict
+from typing import Dict, List
+
+from ej1c3 import StationStatusInfo, StationStatusTable
+from ej1c3_bench import synthetic_station
+from availability_analytics import (
+    SnapshotArrays, summarize, summarize_by_district, district_from_cross_street
+)
+
+DISTRICTS = ["01-Ciutat Vella", "02-Eixample", "03-Sants-Montjuïc", "04-Les Corts", "05-Sarrià-Sant Gervasi",
+             "06-Gràcia", "07-Horta-Guinardó", "08-Nou Barris", "09-Sant Andreu", "10-Sant Martí"]
+
+
+def summarize_loop(stations: List[StationStatusInfo]) -> Dict:
+    """
+    Versión de referencia de summarize() con bucles de Python.
+    """
+    bikes = disabled = docks = operational = 0
+    by_type = defaultdict(int)
+    for station in stations:
+        bikes += station.num_bikes_available or 0
+        disabled += station.num_bikes_disabled or 0
+        docks += station.num_docks_available or 0
+        operational += station.is_operational
+        for vehicle_type_id, count in station.get_available_bikes_by_type().items():
+            by_type[vehicle_type_id] += count
+    return {
+        'stations': len(stations),
+        'total_bikes': bikes,
+        'total_docks': docks,
+        'bikes_by_type': dict(by_type),
+        'operational_share': operational / len(stations) if stations else 0.0,
+        'disabled_ratio': disabled / (bikes + disabled) if bikes + disabled else 0.0,
+    }
+
+
+def summarize_by_district_loop(stations: List[StationStatusInfo], stations_data: Dict) -> Dict:
+    """
+    Versión de referencia de summarize_by_district() con bucles de Python.
+    """
+    districts = {info['station_id']: district_from_cross_street(info) for info in stations_data['stations']}
+    groups = defaultdict(list)
+    for station in stations:
+        groups[districts.get(station.station_id) or 'unknown'].append(station)
+    return {district: summarize_loop(group) for district, group in groups.items()}
+
+
+def build(num_stations: int, seed: int = 0):
+    rng = random.Random(seed)
+    stations = [StationStatusInfo(synthetic_station(i, 1759834959, rng)) for i in range(num_stations)]
+    stations_data = {'stations': [
+        {'station_id': str(i), 'cross_street': f"{rng.choice(DISTRICTS)}/barrio"} for i in range(num_stations)
+    ]}
+    return stations, stations_data
+
+
+def run(sizes: List[int], repeat: int = 5) -> Dict[int, Dict[str, float]]:
+    """
+    Ejecuta el benchmark y devuelve, por tamaño, el mejor tiempo en segundos de cada variante.
+    """
+    results = {}
+    for size in sizes:
+        stations, stations_data = build(size)
+        table = StationStatusTable.from_stations(stations)
+        arrays = SnapshotArrays.from_stations(stations)
+        cases = {
+            'summary_loop': lambda: summarize_loop(stations),
+            'summary_numpy': lambda: summarize(arrays),
+            'summary_numpy+convert': lambda: summarize(SnapshotArrays.from_stations(stations)),
+            'summary_numpy+table': lambda: summarize(SnapshotArrays.from_table(table)),
+            'district_loop': lambda: summarize_by_district_loop(stations, stations_data),
+            'district_numpy': lambda: summarize_by_district(arrays, stations_data),
+        }
+        results[size] = {name: min(timeit.repeat(case, number=1, repeat=repeat)) for name, case in cases.items()}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stations", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size, timings in run(args.stations, args.repeat).items():
+        print(f"\n{size} estaciones")
+        for name, seconds in timings.items():
+            print(f"{name:>24}: {seconds * 1000:9.3f} ms")
@@ -0,0 +1,125 @@
+"""
+Tests para availability_analytics.py
+Este archivo contiene pruebas para verificar los resúmenes vectorizados de
+disponibilidad y la agrupación por distrito.
+"""
+
+import pytest
+
+from ej1c3 import StationStatusInfo, StationStatusTable, StationStatusSnapshot
+from availability_analytics import (
+    SnapshotArrays, summarize, summarize_by_district, district_from_cross_street
+)
+from availability_analytics_bench import summarize_loop, summarize_by_district_loop, build
+
+
+@pytest.fixture
+def stations():
+    """
+    Fixture que proporciona tres estaciones, una de ellas en mantenimiento
+    """
+    return [
+        StationStatusInfo({
+            "station_id": "1", "status": "IN_SERVICE", "is_renting": True, "is_returning": True,
+            "num_bikes_available": 12, "num_bikes_disabled": 1, "num_docks_available": 33,
+            "vehicle_types_available": [{"vehicle_type_id": "BOOST", "count": 3},
+                                        {"vehicle_type_id": "ICONIC", "count": 9}],
+        }),
+        StationStatusInfo({
+            "station_id": "2", "status": "IN_SERVICE", "is_renting": True, "is_returning": True,
+            "num_bikes_available": 2, "num_bikes_disabled": 3, "num_docks_available": 23,
+            "vehicle_types_available": [{"vehicle_type_id": "BOOST", "count": 2}],
+        }),
+        StationStatusInfo({
+            "station_id": "9", "status": "MAINTENANCE", "is_renting": False, "is_returning": False,
+            "num_bikes_available": 0, "num_bikes_disabled": 1, "num_docks_available": 15,
+            "vehicle_types_available": [],
+        }),
+    ]
+
+
+@pytest.fixture
+def stations_data():
+    """
+    Fixture que proporciona los datos de station_information de las estaciones
+    """
+    return {"stations": [
+        {"station_id": "1", "cross_street": "02-Eixample/05-el Fort Pienc"},
+        {"station_id": "2", "cross_street": "02-Eixample/07-la Sagrada Família"},
+        {"station_id": "9", "cross_street": "01-Ciutat Vella/03-el Barri Gòtic"},
+    ]}
+
+
+def test_summarize(stations):
+    """
+    Verificar el resumen de disponibilidad de la instantánea
+    """
+    summary = summarize(SnapshotArrays.from_stations(stations))
+
+    assert summary['stations'] == 3
+    assert summary['total_bikes'] == 14, "Debe sumar las bicicletas disponibles"
+    assert summary['total_docks'] == 71, "Debe sumar los anclajes disponibles"
+    assert summary['bikes_by_type'] == {"BOOST": 5, "ICONIC": 9}, "Debe sumar las bicicletas por tipo"
+    assert summary['operational_share'] == pytest.approx(2 / 3), "Dos de tres estaciones están operativas"
+    assert summary['disabled_ratio'] == pytest.approx(5 / 19), "Debe calcular la proporción de averiadas"
+    assert summary == summarize_loop(stations), "Debe coincidir con la versión con bucles"
+
+
+def test_from_table_and_snapshot(stations):
+    """
+    Verificar que los arrays construidos desde una tabla o una instantánea son equivalentes
+    """
+    expected = summarize(SnapshotArrays.from_stations(stations))
+    from_table = summarize(SnapshotArrays.from_snapshot(StationStatusTable.from_stations(stations)))
+    from_snapshot = summarize(SnapshotArrays.from_snapshot(StationStatusSnapshot(stations)))
+    assert from_table == expected, "La conversión desde StationStatusTable debe ser equivalente"
+    assert from_snapshot == expected, "La conversión desde StationStatusSnapshot debe ser equivalente"
+
+
+def test_duplicated_vehicle_type(stations):
+    """
+    Verificar que un tipo listado dos veces se suma igual desde las estaciones y desde la tabla
+    """
+    duplicated = StationStatusInfo({
+        "station_id": "4", "status": "IN_SERVICE", "is_renting": True, "is_returning": True,
+        "num_bikes_available": 5, "num_bikes_disabled": 0, "num_docks_available": 10,
+        "vehicle_types_available": [{"vehicle_type_id": "BOOST", "count": 2},
+                                    {"vehicle_type_id": "BOOST", "count": 3}],
+    })
+    from_stations = summarize(SnapshotArrays.from_stations(stations + [duplicated]))
+    from_table = summarize(SnapshotArrays.from_table(StationStatusTable.from_stations(stations + [duplicated])))
+    assert from_stations['bikes_by_type'] == {"BOOST": 10, "ICONIC": 9}, "Las cantidades repetidas deben sumarse"
+    assert from_stations == from_table, "Ambas conversiones deben dar los mismos totales"
+
+
+def test_summarize_by_district(stations, stations_data):
+    """
+    Verificar la agrupación por distrito uniendo con station_information
+    """
+    stations_data["stations"].pop()
+    by_district = summarize_by_district(SnapshotArrays.from_stations(stations), stations_data)
+
+    assert set(by_district) == {"02-Eixample", "unknown"}, "La estación sin información va a 'unknown'"
+    assert by_district["02-Eixample"]['total_bikes'] == 14
+    assert by_district["02-Eixample"]['bikes_by_type'] == {"BOOST": 5, "ICONIC": 9}
+    assert by_district["unknown"]['operational_share'] == 0.0
+
+
+def test_matches_loop_version():
+    """
+    Verificar que la versión vectorizada coincide con la de bucles en datos sintéticos
+    """
+    stations, stations_data = build(200)
+    arrays = SnapshotArrays.from_stations(stations)
+    assert summarize(arrays) == summarize_loop(stations)
+    vectorized = summarize_by_district(arrays, stations_data)
+    loop = summarize_by_district_loop(stations, stations_data)
+    assert set(vectorized) == set(loop)
+    for district, summary in loop.items():
+        assert vectorized[district]['total_bikes'] == summary['total_bikes']
+        assert vectorized[district]['operational_share'] == pytest.approx(summary['operational_share'])
+
+
+def test_district_from_cross_street():
+    assert district_from_cross_street({"cross_street": "02-Eixample/05-el Fort Pienc"}) == "02-Eixample"
+    assert district_from_cross_street({}) is None
@@ -16,8 +16,12 @@ Tu tarea es completar la implementación de las funciones indicadas.
 """
 
 import requests
-from typing import Optional, Dict, Tuple
-import pandas as pd
+from typing import TYPE_CHECKING, Optional, Dict, Tuple
+
+# pandas tarda cientos de milisegundos en importarse y solo lo necesita
+# create_stations_dataframe, así que se importa dentro de esa función
+if TYPE_CHECKING:
+    import pandas as pd
 
 def get_stations_data()-> Optional[Dict]:
     """
@@ -80,7 +84,7 @@ def get_station_info(stations_data, station_id)-> Optional[Dict]:
     return None
 
 
-def get_station_coordinates(station_info)-> Optional[pd.DataFrame]:
+def get_station_coordinates(station_info)-> Optional[Tuple[float, float]]:
     """
     Extrae las coordenadas (latitud y longitud) de una estación.
 
@@ -111,7 +115,7 @@ def get_station_coordinates(station_info)-> Optional[pd.DataFrame]:
     return None
 
 
-def create_stations_dataframe(stations_data)-> Optional[pd.DataFrame]:
+def create_stations_dataframe(stations_data)-> Optional["pd.DataFrame"]:
     """
     Crea un DataFrame de pandas con información básica de todas las estaciones.
 
@@ -132,7 +136,9 @@ def create_stations_dataframe(stations_data)-> Optional[pd.DataFrame]:
 
     if not stations_data or not isinstance(stations_data, dict) or 'stations' not in stations_data:    # solución
         return None
-    
+
+    import pandas as pd
+
     df_stations = pd.DataFrame()
     
     # Creamos una lista de diccionarios con la información de cada estación
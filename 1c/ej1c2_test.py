@@ -5,11 +5,19 @@ de las funciones para consultar información de estaciones del sistema de bicicl
 compartidas de Barcelona mediante la API GBFS.
 """
 
+import os
+import sys
 import pytest
 import pandas as pd
 import requests
 from unittest.mock import patch, MagicMock
 
+# La raíz del repositorio, para importar el paquete comun
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
+
+from comun.pruebas import modulos_importados
 from ej1c2 import get_stations_data, get_station_info, get_station_coordinates, create_stations_dataframe
 
 @pytest.fixture
@@ -346,3 +354,13 @@ def test_create_stations_dataframe_invalid_input():
     df = create_stations_dataframe(empty_data)
     assert isinstance(df, pd.DataFrame), "Debe devolver un DataFrame vacío cuando no hay estaciones"
     assert len(df) == 0, "El DataFrame debe estar vacío cuando no hay estaciones"
+
+
+def test_importacion_sin_modulos_pesados():
+    """
+    Prueba de regresión del tiempo de importación: ej1c2 no debe cargar pandas
+    hasta que se usa la función que lo necesita.
+    """
+    modulos = modulos_importados("ej1c2", os.path.dirname(os.path.abspath(__file__)))
+    assert "ej1c2" in modulos, "La salida de -X importtime debe incluir el módulo"
+    assert "pandas" not in modulos, "Importar ej1c2 no debe importar pandas"
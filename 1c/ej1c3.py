@@ -22,9 +22,13 @@ Esta práctica refuerza conceptos de POO en Python como:
 """
 
 import requests
+import bisect
 import enum
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, List, Dict, Optional, Tuple
 from datetime import datetime
 
 
@@ -38,16 +42,31 @@ class StationStatus(enum.Enum):
     MAINTENANCE = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class VehicleType:
     """
     Clase que representa un tipo de vehículo y su cantidad disponible.
     """
-    # Añade aquí los atributos necesarios: tipo de vehículo (vehicle_type_id) y cantidad (count)
-    def __init__(self, vehicle_type_id, count) -> 'VehicleType':
-        # Inicialización de los atributos
-        self.vehicle_type_id = vehicle_type_id
-        self.count = count
+    # Atributos: tipo de vehículo (vehicle_type_id) y cantidad (count)
+    vehicle_type_id: str
+    count: int
+
+    def __post_init__(self):
+        # Los tipos se repiten en todas las estaciones: compartimos una única cadena
+        if isinstance(self.vehicle_type_id, str):
+            self.vehicle_type_id = sys.intern(self.vehicle_type_id)
+
+
+# Campos que se comparan al calcular los cambios entre dos instantáneas
+STATION_DIFF_FIELDS = (
+    'status',
+    'num_bikes_available',
+    'num_bikes_disabled',
+    'num_docks_available',
+    'is_renting',
+    'is_returning',
+    'last_reported',
+)
 
 
 class StationStatusInfo:
@@ -66,6 +85,19 @@ class StationStatusInfo:
         vehicle_types_available: Lista de tipos de vehículos disponibles
     """
 
+    # Sin __dict__ por instancia: una instantánea completa contiene cientos de estaciones
+    __slots__ = (
+        'station_id',
+        'status',
+        'num_bikes_available',
+        'num_bikes_disabled',
+        'num_docks_available',
+        'is_renting',
+        'is_returning',
+        'last_reported',
+        'vehicle_types',
+    )
+
     def __init__(self, station_data)-> 'StationStatusInfo':
         """
         Inicializa una instancia de StationStatusInfo a partir de los datos
@@ -78,6 +110,8 @@ class StationStatusInfo:
         # a partir del diccionario station_data
 
         self.station_id = station_data.get('station_id')
+        if isinstance(self.station_id, str):
+            self.station_id = sys.intern(self.station_id)
         self.status = station_data.get('status')
         if self.status == 'IN_SERVICE':
             self.status = StationStatus.IN_SERVICE
@@ -89,16 +123,29 @@ class StationStatusInfo:
         self.is_renting = station_data.get('is_renting')
         self.is_returning = station_data.get('is_returning')
         self.last_reported = station_data.get('last_reported')
-        self.vehicle_types_available = station_data.get('vehicle_types_available')
 
-        # Process vehicle types
-        self.vehicle_types = []
-        vehicle_types = station_data.get('vehicle_types_available', [])
-        for vtype in vehicle_types:
-            self.vehicle_types.append(VehicleType(
+        # Process vehicle types (no guardamos la lista original: se reconstruye bajo demanda)
+        vehicle_types = station_data.get('vehicle_types_available') or []
+        self.vehicle_types = tuple(
+            VehicleType(
                 vehicle_type_id=vtype.get('vehicle_type_id'),
                 count=vtype.get('count', 0)
-            ))
+            )
+            for vtype in vehicle_types
+        )
+
+    @property
+    def vehicle_types_available(self) -> List[Dict[str, Any]]:
+        """
+        Lista de tipos de vehículos disponibles en el formato original de la API.
+
+        Returns:
+            List[Dict[str, Any]]: Lista de diccionarios con vehicle_type_id y count
+        """
+        return [
+            {'vehicle_type_id': vtype.vehicle_type_id, 'count': vtype.count}
+            for vtype in self.vehicle_types
+        ]
 
     @property
     def is_operational(self) -> bool:
@@ -131,6 +178,29 @@ class StationStatusInfo:
             for vtype in self.vehicle_types
         }                                               # solución
 
+    def diff(self, other: 'StationStatusInfo') -> Dict[str, Tuple[Any, Any]]:
+        """
+        Compara esta estación con una versión anterior de la misma estación.
+
+        Args:
+            other: Estado anterior de la estación
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: Diccionario campo -> (valor anterior, valor nuevo)
+                                        con solo los campos que han cambiado
+        """
+        changes = {}
+        for name in STATION_DIFF_FIELDS:
+            old_value = getattr(other, name)
+            new_value = getattr(self, name)
+            if old_value != new_value:
+                changes[name] = (old_value, new_value)
+        old_types = other.get_available_bikes_by_type()
+        new_types = self.get_available_bikes_by_type()
+        if old_types != new_types:
+            changes['vehicle_types'] = (old_types, new_types)
+        return changes
+
     def __str__(self) -> str:
         """
         Devuelve una representación en string de la estación con su estado actual.
@@ -146,22 +216,450 @@ class StationStatusInfo:
                 f"Estado: {self.status}")
 
 
+class StationStatusTable:
+    """
+    Representación compacta (estructura de arrays) de una instantánea completa.
+
+    Cada atributo numérico se guarda en un array.array con una posición por estación,
+    de modo que una instantánea de cientos de estaciones ocupa unos pocos kilobytes
+    en lugar de cientos de objetos. Los valores ausentes se guardan como -1.
+
+    Las columnas de tipos de vehículo valen 0 en las estaciones que no listan ese
+    tipo; una máscara aparte indica qué tipos listaba cada estación, para que
+    get_station() devuelva exactamente los de la estación original.
+
+    Atributos:
+        station_ids: Lista de IDs de estación (cadenas internadas)
+        last_updated: Timestamp de la consulta
+        status, num_bikes_available, num_bikes_disabled, num_docks_available,
+        is_renting, is_returning, last_reported: Columnas de la instantánea
+        vehicle_types: Diccionario vehicle_type_id -> array con la cantidad por estación
+    """
+
+    # Código de tipo de array.array para cada columna
+    COLUMNS = {
+        'status': 'b',
+        'num_bikes_available': 'h',
+        'num_bikes_disabled': 'h',
+        'num_docks_available': 'h',
+        'is_renting': 'b',
+        'is_returning': 'b',
+        'last_reported': 'q',
+    }
+
+    __slots__ = ('station_ids', 'last_updated', 'vehicle_types', '_listed', '_index') + tuple(COLUMNS)
+
+    def __init__(self, last_updated: Optional[int] = None):
+        """
+        Inicializa una tabla vacía.
+
+        Args:
+            last_updated: Timestamp de la consulta a la que corresponde la tabla
+        """
+        self.station_ids: List[str] = []
+        self.last_updated = last_updated
+        self.vehicle_types: Dict[str, array] = {}
+        # vehicle_type_id -> 1 en las filas de las estaciones que listan ese tipo
+        self._listed: Dict[str, bytearray] = {}
+        # Índice station_id -> fila, construido solo cuando se consulta
+        self._index: Optional[Dict[str, int]] = None
+        for name, typecode in self.COLUMNS.items():
+            setattr(self, name, array(typecode))
+
+    @classmethod
+    def from_stations(cls, stations: List[StationStatusInfo],
+                      last_updated: Optional[int] = None) -> 'StationStatusTable':
+        """
+        Construye la tabla a partir de una lista de objetos StationStatusInfo.
+
+        Args:
+            stations: Estaciones de la instantánea
+            last_updated: Timestamp de la consulta
+
+        Returns:
+            StationStatusTable: Tabla con una fila por estación
+        """
+        table = cls(last_updated)
+        for station in stations:
+            table.append(station)
+        return table
+
+    def append(self, station: StationStatusInfo) -> None:
+        """
+        Añade una estación al final de la tabla.
+
+        Args:
+            station: Estado de la estación
+        """
+        row = len(self.station_ids)
+        if self._index is not None:
+            self._index[station.station_id] = row
+        self.station_ids.append(station.station_id)
+        self.status.append(station.status.value)
+        for name in ('num_bikes_available', 'num_bikes_disabled', 'num_docks_available',
+                     'last_reported'):
+            value = getattr(station, name)
+            getattr(self, name).append(-1 if value is None else value)
+        for name in ('is_renting', 'is_returning'):
+            value = getattr(station, name)
+            getattr(self, name).append(-1 if value is None else int(value))
+        # Un tipo listado dos veces se suma en una sola posición de su columna
+        vehicle_counts: Dict[str, int] = {}
+        for vtype in station.vehicle_types:
+            vehicle_counts[vtype.vehicle_type_id] = vehicle_counts.get(vtype.vehicle_type_id, 0) + vtype.count
+        for vehicle_type_id, count in vehicle_counts.items():
+            counts = self.vehicle_types.get(vehicle_type_id)
+            if counts is None:
+                # Tipo nuevo: las filas anteriores no tenían bicicletas de este tipo
+                counts = self.vehicle_types[vehicle_type_id] = array('h', bytes(2 * row))
+                self._listed[vehicle_type_id] = bytearray(row)
+            counts.append(count)
+            self._listed[vehicle_type_id].append(1)
+        for vehicle_type_id, counts in self.vehicle_types.items():
+            if len(counts) == row:
+                counts.append(0)
+                self._listed[vehicle_type_id].append(0)
+
+    def __len__(self) -> int:
+        return len(self.station_ids)
+
+    def index_of(self, station_id: str) -> Optional[int]:
+        """
+        Devuelve la fila de una estación, o None si no está en la tabla.
+        """
+        if self._index is None:
+            self._index = {sid: row for row, sid in enumerate(self.station_ids)}
+        return self._index.get(station_id)
+
+    def get_station(self, station_id: str) -> Optional[StationStatusInfo]:
+        """
+        Reconstruye el objeto StationStatusInfo de una estación.
+
+        Args:
+            station_id: ID de la estación
+
+        Returns:
+            Optional[StationStatusInfo]: Estado de la estación, o None si no existe
+        """
+        row = self.index_of(station_id)
+        if row is None:
+            return None
+
+        def value(name):
+            raw = getattr(self, name)[row]
+            return None if raw == -1 else raw
+
+        def flag(name):
+            raw = getattr(self, name)[row]
+            return None if raw == -1 else bool(raw)
+
+        return StationStatusInfo({
+            'station_id': station_id,
+            'status': StationStatus(self.status[row]).name,
+            'num_bikes_available': value('num_bikes_available'),
+            'num_bikes_disabled': value('num_bikes_disabled'),
+            'num_docks_available': value('num_docks_available'),
+            'is_renting': flag('is_renting'),
+            'is_returning': flag('is_returning'),
+            'last_reported': value('last_reported'),
+            'vehicle_types_available': [
+                {'vehicle_type_id': vehicle_type_id, 'count': counts[row]}
+                for vehicle_type_id, counts in self.vehicle_types.items()
+                if self._listed[vehicle_type_id][row]
+            ],
+        })
+
+    def nbytes(self) -> int:
+        """
+        Devuelve el tamaño aproximado en bytes de las columnas numéricas.
+        """
+        columns = [getattr(self, name) for name in self.COLUMNS]
+        columns.extend(self.vehicle_types.values())
+        return (sum(column.itemsize * len(column) for column in columns)
+                + sum(len(mask) for mask in self._listed.values()))
+
+
+@dataclass
+class StationStatusChanges:
+    """
+    Conjunto de cambios entre dos consultas consecutivas de station_status.
+
+    Atributos:
+        added: Estaciones que no existían en la consulta anterior
+        removed: IDs de las estaciones que han desaparecido del feed
+        changed: Diccionario station_id -> {campo: (valor anterior, valor nuevo)}
+        last_updated: Timestamp de la consulta que ha generado los cambios
+    """
+    added: List[StationStatusInfo] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: Dict[str, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)
+    last_updated: Optional[int] = None
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        Indica si no se ha producido ningún cambio.
+        """
+        return not (self.added or self.removed or self.changed)
+
+
+class AvailabilityIndex:
+    """
+    Índice ordenado de disponibilidad de bicicletas de una instantánea.
+
+    Para cada criterio (total de bicicletas o un tipo de vehículo concreto) y para
+    cada subconjunto (todas las estaciones o solo las operativas) mantiene las filas
+    ordenadas por cantidad, de modo que las consultas por umbral y los top-k se
+    resuelven con bisect sin recorrer todas las estaciones. Cada índice se construye
+    la primera vez que se consulta.
+    """
+
+    def __init__(self, stations: List[StationStatusInfo]):
+        """
+        Inicializa el índice.
+
+        Args:
+            stations: Lista de estaciones; las filas devueltas son posiciones en ella
+        """
+        self.stations = stations
+        # (vehicle_type, operational) -> (cantidades ordenadas, filas en el mismo orden)
+        self._sorted: Dict[Tuple[Optional[str], bool], Tuple[List[int], List[int]]] = {}
+
+    def _get(self, vehicle_type: Optional[str], operational: bool) -> Tuple[List[int], List[int]]:
+        key = (vehicle_type, operational)
+        entry = self._sorted.get(key)
+        if entry is None:
+            pairs = []
+            for row, station in enumerate(self.stations):
+                if operational and not station.is_operational:
+                    continue
+                if vehicle_type is None:
+                    count = station.num_bikes_available
+                else:
+                    count = station.get_available_bikes_by_type().get(vehicle_type, 0)
+                if count is not None:
+                    pairs.append((count, row))
+            pairs.sort()
+            entry = self._sorted[key] = ([count for count, _ in pairs], [row for _, row in pairs])
+        return entry
+
+    def at_least(self, min_count: int, vehicle_type: Optional[str] = None,
+                 operational: bool = False) -> List[int]:
+        """
+        Devuelve las filas con al menos min_count bicicletas, de menor a mayor cantidad.
+
+        Args:
+            min_count: Número mínimo de bicicletas
+            vehicle_type: Tipo de vehículo; None para el total de bicicletas
+            operational: Si es True, solo estaciones completamente operativas
+
+        Returns:
+            List[int]: Posiciones de las estaciones en la lista original
+        """
+        counts, rows = self._get(vehicle_type, operational)
+        return rows[bisect.bisect_left(counts, min_count):]
+
+    def count_at_least(self, min_count: int, vehicle_type: Optional[str] = None,
+                       operational: bool = False) -> int:
+        """
+        Devuelve cuántas estaciones tienen al menos min_count bicicletas.
+        """
+        counts, _ = self._get(vehicle_type, operational)
+        return len(counts) - bisect.bisect_left(counts, min_count)
+
+    def top_k(self, k: int, vehicle_type: Optional[str] = None, operational: bool = False) -> List[int]:
+        """
+        Devuelve las k filas con más bicicletas, de mayor a menor cantidad.
+
+        Args:
+            k: Número de filas a devolver
+            vehicle_type: Tipo de vehículo; None para el total de bicicletas
+            operational: Si es True, solo estaciones completamente operativas
+
+        Returns:
+            List[int]: Posiciones de las estaciones en la lista original
+        """
+        if k <= 0:
+            return []
+        _, rows = self._get(vehicle_type, operational)
+        return rows[:-k - 1:-1]
+
+
+class StationStatusSnapshot:
+    """
+    Resultado de una única consulta a station_status con consultas en memoria.
+
+    Construye al crearse un índice por station_id y un índice ordenado por número
+    de bicicletas disponibles, de modo que las búsquedas no vuelven a descargar
+    ni a recorrer todo el feed.
+
+    Atributos:
+        stations: Lista de estaciones en el orden del feed
+        last_updated: Timestamp de la última actualización de los datos
+        fetched_at: Instante (time.monotonic) en el que se obtuvieron los datos
+        ttl: Segundos de validez de los datos indicados por el feed
+    """
+
+    def __init__(self, stations: List[StationStatusInfo], last_updated: Optional[int] = None,
+                 fetched_at: Optional[float] = None, ttl: Optional[int] = None):
+        """
+        Inicializa la instantánea y construye sus índices.
+
+        Args:
+            stations: Lista de estaciones obtenidas de la API
+            last_updated: Timestamp de la última actualización de los datos
+            fetched_at: Instante de la descarga; por defecto, el momento actual
+            ttl: Segundos de validez de los datos indicados por el feed
+        """
+        self.stations = stations
+        self.last_updated = last_updated
+        self.ttl = ttl
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        self._by_id = {station.station_id: station for station in stations}
+        self.availability = AvailabilityIndex(stations)
+
+    @classmethod
+    def from_feed(cls, data_json: Dict) -> 'StationStatusSnapshot':
+        """
+        Construye la instantánea a partir del JSON completo de station_status.
+
+        Args:
+            data_json: Respuesta del endpoint station_status
+
+        Returns:
+            StationStatusSnapshot: Instantánea con last_updated y ttl del feed
+        """
+        stations = [StationStatusInfo(station) for station in data_json.get('data', {}).get('stations') or []]
+        return cls(stations, data_json.get('last_updated'), ttl=data_json.get('ttl'))
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def __iter__(self):
+        return iter(self.stations)
+
+    def age(self) -> float:
+        """
+        Devuelve los segundos transcurridos desde que se obtuvieron los datos.
+        """
+        return time.monotonic() - self.fetched_at
+
+    def find_station_by_id(self, station_id: str) -> Optional[StationStatusInfo]:
+        """
+        Busca una estación por su ID.
+
+        Args:
+            station_id: ID de la estación a buscar
+
+        Returns:
+            Optional[StationStatusInfo]: La estación, o None si no se encuentra
+        """
+        return self._by_id.get(station_id)
+
+    def get_operational_stations(self) -> List[StationStatusInfo]:
+        """
+        Devuelve las estaciones en servicio.
+
+        Returns:
+            List[StationStatusInfo]: Lista de estaciones operativas
+        """
+        return [station for station in self.stations if station.status == StationStatus.IN_SERVICE]
+
+    def get_stations_with_available_bikes(self, min_bikes: int = 1, vehicle_type: Optional[str] = None,
+                                          operational: bool = False) -> List[StationStatusInfo]:
+        """
+        Devuelve las estaciones con al menos min_bikes disponibles, en el orden del feed.
+
+        Args:
+            min_bikes: Número mínimo de bicicletas requeridas (por defecto 1)
+            vehicle_type: Si se indica, cuenta solo las bicicletas de ese tipo
+            operational: Si es True, solo estaciones completamente operativas
+
+        Returns:
+            List[StationStatusInfo]: Lista de estaciones con bicicletas disponibles
+        """
+        rows = sorted(self.availability.at_least(min_bikes, vehicle_type, operational))
+        return [self.stations[row] for row in rows]
+
+    def get_top_stations(self, k: int, vehicle_type: Optional[str] = None,
+                         operational: bool = False) -> List[StationStatusInfo]:
+        """
+        Devuelve las k estaciones con más bicicletas disponibles, de mayor a menor.
+
+        Args:
+            k: Número de estaciones a devolver
+            vehicle_type: Si se indica, ordena por las bicicletas de ese tipo
+            operational: Si es True, solo estaciones completamente operativas
+
+        Returns:
+            List[StationStatusInfo]: Lista de como mucho k estaciones
+        """
+        return [self.stations[row] for row in self.availability.top_k(k, vehicle_type, operational)]
+
+
+BARCELONA_BASE_URL = "https://barcelona.publicbikesystem.net/customer/gbfs/v2/en"
+
+
 class BarcelonaBikingClient:
     """
     Cliente para consultar el estado de las estaciones de bicicletas de Barcelona.
     """
 
-    def __init__(self):
+    def __init__(self, max_age: float = 0.0, base_url: str = BARCELONA_BASE_URL,
+                 timeout: Optional[float] = None):
         """
         Inicializa el cliente con la URL base de la API.
+
+        Args:
+            max_age: Segundos durante los que se reutiliza la última instantánea en
+                     las consultas (find_station_by_id, etc.). Con 0 siempre se descarga.
+            base_url: URL base de los feeds GBFS (por defecto, la de Barcelona)
+            timeout: Segundos máximos de espera de cada descarga (None, sin límite)
         """
-        self.base_url = "https://barcelona.publicbikesystem.net/customer/gbfs/v2/en"
+        self.base_url = base_url
         self.station_status_url = f"{self.base_url}/station_status"
+        self.max_age = max_age
+        self.timeout = timeout
+        # Campo ttl de la última respuesta recibida
+        self.last_ttl: Optional[int] = None
+        self._snapshot: Optional[StationStatusSnapshot] = None
+        # Última instantánea conocida para el modo incremental, indexada por station_id
+        self._previous_stations: Dict[str, StationStatusInfo] = {}
+
+    def _fetch_station_status(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Descarga el feed station_status y devuelve el JSON completo.
+
+        Args:
+            timeout: Timeout de esta descarga, en segundos (por defecto, self.timeout)
 
-    def get_stations_status(self) -> Tuple[List[StationStatusInfo], Optional[datetime]]:
+        Returns:
+            Optional[Dict]: JSON de la respuesta, o None si el código no es 200
+
+        Raises:
+            requests.exceptions.RequestException: Si falla la petición
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            resp = requests.get(self.station_status_url)
+        else:
+            resp = requests.get(self.station_status_url, timeout=timeout)
+        if resp.status_code != 200:
+            print(f"Error: La petición no fue exitosa. Código de estado: {resp.status_code}")
+            return None
+        data_json = resp.json()
+        self.last_ttl = data_json.get('ttl')
+        return data_json
+
+    def get_stations_status(self, timeout: Optional[float] = None
+                            ) -> Tuple[List[StationStatusInfo], Optional[datetime]]:
         """
         Obtiene el estado actual de todas las estaciones de bicicletas.
 
+        Args:
+            timeout: Timeout de la descarga, en segundos (por defecto, self.timeout)
+
         Returns:
             Tuple[List[StationStatusInfo], Optional[datetime]]:
                 - Lista de objetos StationStatusInfo, uno por cada estación
@@ -174,32 +672,100 @@ class BarcelonaBikingClient:
         # 4. Extraer el timestamp de last_updated de la respuesta
         # 5. Manejar posibles errores (conexión, formato, etc.)
         try:
-            # Realizamos la petición GET a la url
-            resp = requests.get(self.station_status_url)
-        # Verificamos que la respuesta es correcta (código 200)
-            if resp.status_code == 200:
-                # Devolvemos los datos en formato JSON
-                data_json = resp.json()
-                stations_list = data_json.get('data', {}).get('stations', {})
-                last_updated = data_json.get('last_updated')
-                # Verificamos que stations_data no es None y tiene la estructura esperada
-                if not stations_list:
-                    return None
-                stations_list_tupla = []
-                for station in stations_list:
-                    station = StationStatusInfo(station)
-                    stations_list_tupla.append(station)
-                stations_tupla = (stations_list_tupla, last_updated)
-                return stations_tupla
-            else:
-                # Si status_code no es 200, imprimimos un mensaje de error
-                print(f"Error: La petición no fue exitosa. Código de estado: {resp.status_code}")
+            # Realizamos la petición GET a la url y verificamos el código 200
+            data_json = self._fetch_station_status(timeout)
+            if data_json is None:
                 return None
+            stations_list = data_json.get('data', {}).get('stations', {})
+            last_updated = data_json.get('last_updated')
+            # Verificamos que stations_data no es None y tiene la estructura esperada
+            if not stations_list:
+                return None
+            stations_list_tupla = []
+            for station in stations_list:
+                station = StationStatusInfo(station)
+                stations_list_tupla.append(station)
+            stations_tupla = (stations_list_tupla, last_updated)
+            return stations_tupla
         except requests.exceptions.RequestException:
             # Capturamos cualquier error que pueda ocurrir durante la petición
             stations_tupla = ([], None)
             return stations_tupla
 
+    def get_stations_status_incremental(self) -> Tuple[List[StationStatusInfo], Optional[datetime], StationStatusChanges]:
+        """
+        Obtiene el estado de las estaciones reutilizando la consulta anterior.
+
+        Solo se vuelven a construir los objetos StationStatusInfo de las estaciones
+        cuyo last_reported ha cambiado; el resto se reutilizan tal cual. Además se
+        devuelve el conjunto de cambios respecto a la consulta anterior.
+
+        Returns:
+            Tuple[List[StationStatusInfo], Optional[datetime], StationStatusChanges]:
+                - Lista de objetos StationStatusInfo, uno por cada estación
+                - Timestamp de la última actualización de los datos, o None si hay error
+                - Cambios (altas, bajas y campos modificados) desde la consulta anterior
+        """
+        try:
+            data_json = self._fetch_station_status()
+        except requests.exceptions.RequestException:
+            data_json = None
+        if data_json is None:
+            # Conservamos la instantánea anterior para no emitir bajas falsas
+            return [], None, StationStatusChanges()
+
+        last_updated = data_json.get('last_updated')
+        changes = StationStatusChanges(last_updated=last_updated)
+        previous = self._previous_stations
+        current: Dict[str, StationStatusInfo] = {}
+        for station_data in data_json.get('data', {}).get('stations', []):
+            station_id = station_data.get('station_id')
+            old_station = previous.get(station_id)
+            if old_station is not None and old_station.last_reported == station_data.get('last_reported'):
+                current[station_id] = old_station
+                continue
+            station = StationStatusInfo(station_data)
+            current[station_id] = station
+            if old_station is None:
+                changes.added.append(station)
+            else:
+                station_changes = station.diff(old_station)
+                if station_changes:
+                    changes.changed[station_id] = station_changes
+        changes.removed = [station_id for station_id in previous if station_id not in current]
+
+        self._previous_stations = current
+        return list(current.values()), last_updated, changes
+
+    def get_snapshot(self, max_age: Optional[float] = None,
+                     timeout: Optional[float] = None) -> StationStatusSnapshot:
+        """
+        Devuelve una instantánea del estado de las estaciones.
+
+        Si la última instantánea tiene menos de max_age segundos se reutiliza;
+        en caso contrario se realiza una única descarga con get_stations_status().
+
+        Args:
+            max_age: Antigüedad máxima aceptada en segundos (por defecto, self.max_age)
+            timeout: Timeout de la descarga, en segundos (por defecto, self.timeout)
+
+        Returns:
+            StationStatusSnapshot: Instantánea con las estaciones (vacía si hay error)
+        """
+        if max_age is None:
+            max_age = self.max_age
+        snapshot = self._snapshot
+        if snapshot is not None and max_age > 0 and snapshot.age() < max_age:
+            return snapshot
+
+        result = self.get_stations_status(timeout)
+        stations, last_updated = result if result else ([], None)
+        snapshot = StationStatusSnapshot(stations, last_updated, ttl=self.last_ttl)
+        # Solo guardamos las consultas correctas para no reutilizar un error
+        if stations:
+            self._snapshot = snapshot
+        return snapshot
+
     def find_station_by_id(self, station_id: str) -> Optional[StationStatusInfo]:
         """
         Busca una estación específica por su ID.
@@ -211,14 +777,7 @@ class BarcelonaBikingClient:
             Optional[StationStatusInfo]: Objeto con la información de la estación,
                                          o None si no se encuentra
         """
-        # Implementa aquí la lógica para buscar y devolver una estación por su ID
-
-        for station in BarcelonaBikingClient.get_stations_status(self):
-            i = 0
-            if station[i].station_id == station_id:
-                return station[i]
-            else:
-                return None
+        return self.get_snapshot().find_station_by_id(station_id)
 
     def get_operational_stations(self) -> List[StationStatusInfo]:
         """
@@ -227,41 +786,31 @@ class BarcelonaBikingClient:
         Returns:
             List[StationStatusInfo]: Lista de estaciones operativas
         """
-        # Implementa aquí la lógica para filtrar y devolver solo las estaciones operativas
-        operational_station_list = []
-        results, updated = BarcelonaBikingClient.get_stations_status(self)
-        for station in results:
-            if station.status == StationStatus.IN_SERVICE:
-                operational_station_list.append(station)
-        return operational_station_list
+        return self.get_snapshot().get_operational_stations()
 
-    def get_stations_with_available_bikes(self, min_bikes: int = 1) -> List[StationStatusInfo]:
+    def get_stations_with_available_bikes(self, min_bikes: int = 1, vehicle_type: Optional[str] = None,
+                                          operational: bool = False) -> List[StationStatusInfo]:
         """
         Obtiene la lista de estaciones que tienen al menos min_bikes disponibles.
         
         Args:
             min_bikes: Número mínimo de bicicletas requeridas (por defecto 1)
+            vehicle_type: Si se indica, cuenta solo las bicicletas de ese tipo (p. ej. 'BOOST')
+            operational: Si es True, solo devuelve estaciones completamente operativas
 
         Returns:
             List[StationStatusInfo]: Lista de estaciones con bicicletas disponibles
         """
-        # Implementa aquí la lógica para filtrar y devolver las estaciones
-        # con al menos min_bikes disponibles
-        available_bikes_station_list = []
-        for station in BarcelonaBikingClient.get_stations_status(self):
-            i = 0
-            if station[i].num_bikes_available >= min_bikes:
-                available_bikes_station_list.append(station[i])
-                i += 1
-            return available_bikes_station_list
+        return self.get_snapshot().get_stations_with_available_bikes(min_bikes, vehicle_type, operational)
 
 
 if __name__ == "__main__":
     # Ejemplo de uso del cliente
     client = BarcelonaBikingClient()
 
-    # Obtener el estado de todas las estaciones
-    stations, last_updated = client.get_stations_status()
+    # Obtener el estado de todas las estaciones con una única descarga
+    snapshot = client.get_snapshot()
+    stations, last_updated = snapshot.stations, snapshot.last_updated
 
     if stations:
         # Mostrar información sobre el conjunto de datos
@@ -269,11 +818,11 @@ if __name__ == "__main__":
         print(f"Total de estaciones: {len(stations)}")
 
         # Mostrar estaciones operativas
-        operational = client.get_operational_stations()
+        operational = snapshot.get_operational_stations()
         print(f"\nEstaciones operativas: {len(operational)} de {len(stations)}")
 
         # Mostrar estaciones con bicicletas disponibles
-        with_bikes = client.get_stations_with_available_bikes(min_bikes=5)
+        with_bikes = snapshot.get_stations_with_available_bikes(min_bikes=5)
         print(f"\nEstaciones con al menos 5 bicicletas: {len(with_bikes)}")
 
         if stations:
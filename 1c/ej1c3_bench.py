@@ -0,0 +1,110 @@
+"""
+Benchmark de memoria para las representaciones del estado de las estaciones de ej1c3.
+
+Simula un día completo de consultas (por defecto 500 estaciones x 1.440 instantáneas,
+una por minuto) y mide con tracemalloc la memoria que ocupa guardar todas las
+instantáneas como:
+
+1. Los diccionarios JSON tal y como los devuelve la API
+2. Listas de objetos StationStatusInfo (con __slots__)
+3. Objetos StationStatusTable (estructura de arrays)
+
+Uso:
+    python ej1c3_bench.py [--stations 500] [--snapshots 1440]
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Callable, Dict, List
+
+from ej1c3 import StationStatusInfo, StationStatusTable
+
+VEHICLE_TYPE_IDS = ("ICONIC", "BOOST")
+
+
+def synthetic_station(station_id: int, timestamp: int, rng: random.Random) -> Dict:
+    """
+    Genera los datos de una estación con el formato del endpoint station_status.
+
+    Args:
+        station_id: Número de la estación
+        timestamp: Timestamp del reporte
+        rng: Generador de números aleatorios
+
+    Returns:
+        Dict: Diccionario con los datos de la estación
+    """
+    iconic = rng.randint(0, 20)
+    boost = rng.randint(0, 10)
+    return {
+        "station_id": str(station_id),
+        "num_bikes_available": iconic + boost,
+        "num_bikes_disabled": rng.randint(0, 3),
+        "num_docks_available": rng.randint(0, 30),
+        "num_docks_disabled": 0,
+        "last_reported": timestamp - rng.randint(0, 120),
+        "is_charging_station": True,
+        "status": "IN_SERVICE" if rng.random() > 0.05 else "MAINTENANCE",
+        "is_installed": True,
+        "is_renting": True,
+        "is_returning": True,
+        "traffic": None,
+        "vehicle_types_available": [
+            {"vehicle_type_id": VEHICLE_TYPE_IDS[0], "count": iconic},
+            {"vehicle_type_id": VEHICLE_TYPE_IDS[1], "count": boost},
+        ],
+    }
+
+
+def measure(build: Callable[[], List]) -> int:
+    """
+    Devuelve los bytes que siguen reservados tras ejecutar build().
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def run(num_stations: int = 500, num_snapshots: int = 1440, seed: int = 0) -> Dict[str, int]:
+    """
+    Ejecuta el benchmark y devuelve los bytes ocupados por cada representación.
+    """
+    start = 1759834959
+
+    def snapshots():
+        rng = random.Random(seed)
+        for minute in range(num_snapshots):
+            timestamp = start + 60 * minute
+            yield timestamp, [synthetic_station(i, timestamp, rng) for i in range(num_stations)]
+
+    results = {
+        "json": measure(lambda: [stations for _, stations in snapshots()]),
+        "StationStatusInfo": measure(lambda: [
+            [StationStatusInfo(station) for station in stations]
+            for _, stations in snapshots()
+        ]),
+        "StationStatusTable": measure(lambda: [
+            StationStatusTable.from_stations([StationStatusInfo(s) for s in stations], timestamp)
+            for timestamp, stations in snapshots()
+        ]),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stations", type=int, default=500)
+    parser.add_argument("--snapshots", type=int, default=1440)
+    args = parser.parse_args()
+
+    print(f"{args.stations} estaciones x {args.snapshots} instantáneas")
+    results = run(args.stations, args.snapshots)
+    baseline = results["json"]
+    for name, size in results.items():
+        print(f"{name:>20}: {size / 2**20:8.1f} MiB ({size / baseline:.2f}x)")
@@ -10,7 +10,12 @@ from datetime import datetime
 import requests
 from unittest.mock import patch, MagicMock
 
-from ej1c3 import StationStatus, VehicleType, StationStatusInfo, BarcelonaBikingClient
+import copy
+
+from ej1c3 import (
+    StationStatus, VehicleType, StationStatusInfo, StationStatusChanges, StationStatusTable,
+    AvailabilityIndex, StationStatusSnapshot, BarcelonaBikingClient
+)
 
 @pytest.fixture
 def sample_station_status_response():
@@ -274,6 +279,20 @@ class TestStationStatusInfo:
         assert bikes_by_type["BOOST"] == 3, "Debe haber 3 bicicletas BOOST"
         assert bikes_by_type["ICONIC"] == 9, "Debe haber 9 bicicletas ICONIC"
     
+    def test_compact_representation(self, station_data_operational, station_data_maintenance):
+        """
+        Verificar que las estaciones no usan __dict__ y comparten los IDs de tipo de vehículo
+        """
+        station1 = StationStatusInfo(station_data_operational)
+        station9 = StationStatusInfo(station_data_maintenance)
+
+        assert not hasattr(station1, '__dict__'), "StationStatusInfo debe usar __slots__"
+        assert not hasattr(station1.vehicle_types[0], '__dict__'), "VehicleType debe usar __slots__"
+        assert station1.vehicle_types[0].vehicle_type_id is station9.vehicle_types[0].vehicle_type_id, \
+            "Los IDs de tipo de vehículo deben estar internados"
+        assert station1.vehicle_types_available == station_data_operational["vehicle_types_available"], \
+            "vehicle_types_available debe reconstruir la lista original"
+
     def test_str_representation(self, station_data_operational):
         """
         Verificar que el método __str__ devuelve una representación adecuada
@@ -286,6 +305,59 @@ class TestStationStatusInfo:
         assert "12" in str_rep, "La representación debe incluir el número de bicicletas disponibles"
         assert "IN_SERVICE" in str_rep, "La representación debe incluir el estado"
 
+class TestStationStatusTable:
+    """
+    Pruebas para la clase StationStatusTable
+    """
+
+    def test_from_stations(self, station_data_operational, station_data_maintenance):
+        """
+        Verificar que la tabla guarda una fila por estación y permite reconstruirlas
+        """
+        stations = [StationStatusInfo(station_data_operational), StationStatusInfo(station_data_maintenance)]
+        table = StationStatusTable.from_stations(stations, 1759835019)
+
+        assert len(table) == 2, "La tabla debe tener 2 filas"
+        assert list(table.num_bikes_available) == [12, 0], "La columna de bicicletas debe ser correcta"
+        assert list(table.vehicle_types["BOOST"]) == [3, 0], "La columna BOOST debe ser correcta"
+        assert table.index_of("9") == 1, "La estación 9 debe estar en la fila 1"
+        assert table.index_of("999") is None, "Una estación inexistente no tiene fila"
+
+        station = table.get_station("9")
+        assert station.status == StationStatus.MAINTENANCE, "El estado debe reconstruirse"
+        assert station.is_renting is False, "Los booleanos deben reconstruirse"
+        assert station.diff(stations[1]) == {}, "La estación reconstruida debe ser igual a la original"
+        assert table.nbytes() > 0, "El tamaño de la tabla debe ser positivo"
+
+    def test_new_vehicle_type_is_backfilled(self, station_data_operational):
+        """
+        Verificar que un tipo de vehículo que aparece más tarde se rellena con ceros
+        """
+        extra = copy.deepcopy(station_data_operational)
+        extra["station_id"] = "2"
+        extra["vehicle_types_available"].append({"vehicle_type_id": "CARGO", "count": 1})
+        table = StationStatusTable.from_stations([StationStatusInfo(station_data_operational),
+                                                  StationStatusInfo(extra)])
+
+        assert list(table.vehicle_types["CARGO"]) == [0, 1], "Las filas anteriores deben valer 0"
+        first = table.get_station("1")
+        assert "CARGO" not in first.get_available_bikes_by_type(), \
+            "La estación reconstruida solo debe listar sus propios tipos"
+
+    def test_duplicated_vehicle_type_is_merged(self, station_data_operational):
+        """
+        Verificar que un tipo listado dos veces se suma sin desalinear su columna
+        """
+        duplicated = copy.deepcopy(station_data_operational)
+        duplicated["station_id"] = "2"
+        duplicated["vehicle_types_available"].append({"vehicle_type_id": "BOOST", "count": 2})
+        table = StationStatusTable.from_stations([StationStatusInfo(duplicated),
+                                                  StationStatusInfo(station_data_operational)])
+
+        assert list(table.vehicle_types["BOOST"]) == [5, 3], "Debe haber una posición por estación"
+        assert table.get_station("2").get_available_bikes_by_type()["BOOST"] == 5, \
+            "La estación reconstruida debe tener el tipo una sola vez"
+
 class TestBarcelonaBikingClient:
     """
     Pruebas para la clase BarcelonaBikingClient
@@ -397,3 +469,173 @@ class TestBarcelonaBikingClient:
         # Probar con un umbral diferente
         with_any_bike = client.get_stations_with_available_bikes(min_bikes=1)
         assert len(with_any_bike) == 1, "Solo debe haber 1 estación con bicicletas"
+
+
+class TestStationStatusSnapshot:
+    """
+    Pruebas para la clase StationStatusSnapshot y su reutilización en el cliente
+    """
+
+    @pytest.fixture
+    def stations(self, sample_station_status_response):
+        return [StationStatusInfo(s) for s in sample_station_status_response["data"]["stations"]]
+
+    def test_snapshot_queries(self, stations):
+        """
+        Verificar las consultas en memoria de la instantánea
+        """
+        snapshot = StationStatusSnapshot(stations, 1759835019)
+
+        assert len(snapshot) == 3, "La instantánea debe tener 3 estaciones"
+        assert snapshot.find_station_by_id("2") is stations[1], "Debe encontrarse la estación 2"
+        assert snapshot.find_station_by_id("999") is None, "Una estación inexistente devuelve None"
+        assert [s.station_id for s in snapshot.get_operational_stations()] == ["1", "2"], \
+            "Solo las estaciones 1 y 2 están en servicio"
+        assert [s.station_id for s in snapshot.get_stations_with_available_bikes(2)] == ["1", "2"], \
+            "Deben devolverse las estaciones con al menos 2 bicicletas en el orden del feed"
+        assert snapshot.get_stations_with_available_bikes(13) == [], "Ninguna estación tiene 13 bicicletas"
+        assert len(snapshot.get_stations_with_available_bikes(0)) == 3, "Todas tienen al menos 0 bicicletas"
+
+    def test_availability_index(self, stations):
+        """
+        Verificar las consultas por umbral y top-k del índice de disponibilidad
+        """
+        index = AvailabilityIndex(stations)
+
+        assert index.at_least(2) == [1, 0], "Las filas deben ordenarse por cantidad ascendente"
+        assert index.count_at_least(1) == 2, "Dos estaciones tienen al menos 1 bicicleta"
+        assert index.top_k(1) == [0], "La estación con más bicicletas es la de la fila 0"
+        assert index.top_k(10) == [0, 1, 2], "top_k no debe devolver más filas de las existentes"
+        assert index.top_k(0) == [], "top_k(0) debe devolver una lista vacía"
+        assert index.at_least(3, vehicle_type="BOOST") == [0], "Solo la estación 1 tiene 3 BOOST"
+        assert index.at_least(1, vehicle_type="CARGO") == [], "Un tipo inexistente cuenta como 0"
+
+    def test_combined_filters(self, stations):
+        """
+        Verificar los filtros combinados por tipo de vehículo y estaciones operativas
+        """
+        stations[0].is_renting = False
+        snapshot = StationStatusSnapshot(stations, 1759835019)
+
+        boost = snapshot.get_stations_with_available_bikes(2, vehicle_type="BOOST")
+        assert [s.station_id for s in boost] == ["1", "2"], "Las estaciones 1 y 2 tienen al menos 2 BOOST"
+        boost_operational = snapshot.get_stations_with_available_bikes(2, vehicle_type="BOOST", operational=True)
+        assert [s.station_id for s in boost_operational] == ["2"], "La estación 1 no está operativa"
+        top = snapshot.get_top_stations(2, vehicle_type="ICONIC")
+        assert top[0].station_id == "1", "La estación 1 es la que más ICONIC tiene"
+
+    @patch('ej1c3.BarcelonaBikingClient.get_stations_status')
+    def test_client_reuses_fresh_snapshot(self, mock_get_stations_status, stations):
+        """
+        Verificar que las consultas del cliente reutilizan la instantánea dentro de max_age
+        """
+        mock_get_stations_status.return_value = (stations, 1759835019)
+
+        client = BarcelonaBikingClient(max_age=60)
+        client.find_station_by_id("1")
+        client.get_operational_stations()
+        client.get_stations_with_available_bikes(min_bikes=5)
+        assert mock_get_stations_status.call_count == 1, "Solo debe realizarse una descarga"
+
+        client.get_snapshot(max_age=0)
+        assert mock_get_stations_status.call_count == 2, "Con max_age=0 debe volver a descargarse"
+
+    @patch('ej1c3.BarcelonaBikingClient.get_stations_status')
+    def test_client_does_not_cache_errors(self, mock_get_stations_status, stations):
+        """
+        Verificar que una consulta fallida no se reutiliza
+        """
+        mock_get_stations_status.side_effect = [None, (stations, 1759835019)]
+
+        client = BarcelonaBikingClient(max_age=60)
+        assert len(client.get_snapshot()) == 0, "Una consulta fallida devuelve una instantánea vacía"
+        assert len(client.get_snapshot()) == 3, "La siguiente consulta debe volver a descargar"
+
+class TestIncrementalStationStatus:
+    """
+    Pruebas para el modo incremental de BarcelonaBikingClient
+    """
+
+    @staticmethod
+    def _mock_response(payload):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = payload
+        return mock_response
+
+    @patch('ej1c3.requests.get')
+    def test_first_poll_adds_all_stations(self, mock_get, sample_station_status_response):
+        """
+        Verificar que la primera consulta marca todas las estaciones como nuevas
+        """
+        mock_get.return_value = self._mock_response(sample_station_status_response)
+
+        client = BarcelonaBikingClient()
+        stations, last_updated, changes = client.get_stations_status_incremental()
+
+        assert len(stations) == 3, "Deben devolverse 3 estaciones"
+        assert last_updated == 1759835019, "El timestamp de actualización debe ser correcto"
+        assert [s.station_id for s in changes.added] == ["1", "2", "9"], "Todas las estaciones deben ser nuevas"
+        assert changes.removed == [] and changes.changed == {}, "No debe haber bajas ni modificaciones"
+
+    @patch('ej1c3.StationStatusInfo')
+    @patch('ej1c3.requests.get')
+    def test_unchanged_stations_are_reused(self, mock_get, mock_station_cls, sample_station_status_response):
+        """
+        Verificar que solo se reconstruyen las estaciones cuyo last_reported ha cambiado
+        """
+        mock_station_cls.side_effect = StationStatusInfo
+        second = copy.deepcopy(sample_station_status_response)
+        second["data"]["stations"][0]["last_reported"] += 60
+        second["data"]["stations"][0]["num_bikes_available"] = 10
+        second["data"]["stations"][0]["vehicle_types_available"][1]["count"] = 7
+        mock_get.side_effect = [self._mock_response(sample_station_status_response),
+                                self._mock_response(second)]
+
+        client = BarcelonaBikingClient()
+        first_stations, _, _ = client.get_stations_status_incremental()
+        mock_station_cls.reset_mock()
+        stations, _, changes = client.get_stations_status_incremental()
+
+        assert mock_station_cls.call_count == 1, "Solo debe reconstruirse la estación modificada"
+        assert stations[1] is first_stations[1], "Las estaciones sin cambios deben reutilizarse"
+        assert changes.added == [] and changes.removed == [], "No debe haber altas ni bajas"
+        assert set(changes.changed) == {"1"}, "Solo debe cambiar la estación 1"
+        assert changes.changed["1"]["num_bikes_available"] == (12, 10), "Debe registrarse el valor anterior y el nuevo"
+        assert changes.changed["1"]["vehicle_types"][1]["ICONIC"] == 7, "Deben registrarse los cambios por tipo"
+
+    @patch('ej1c3.requests.get')
+    def test_removed_stations(self, mock_get, sample_station_status_response):
+        """
+        Verificar que se detectan las estaciones que desaparecen del feed
+        """
+        second = copy.deepcopy(sample_station_status_response)
+        del second["data"]["stations"][2]
+        mock_get.side_effect = [self._mock_response(sample_station_status_response),
+                                self._mock_response(second)]
+
+        client = BarcelonaBikingClient()
+        client.get_stations_status_incremental()
+        stations, _, changes = client.get_stations_status_incremental()
+
+        assert len(stations) == 2, "Deben quedar 2 estaciones"
+        assert changes.removed == ["9"], "La estación 9 debe figurar como eliminada"
+        assert changes.is_empty is False, "El conjunto de cambios no debe estar vacío"
+
+    @patch('ej1c3.requests.get')
+    def test_error_keeps_previous_snapshot(self, mock_get, sample_station_status_response):
+        """
+        Verificar que un error de conexión no genera bajas falsas
+        """
+        mock_get.side_effect = [self._mock_response(sample_station_status_response),
+                                requests.exceptions.RequestException("Error de conexión"),
+                                self._mock_response(sample_station_status_response)]
+
+        client = BarcelonaBikingClient()
+        client.get_stations_status_incremental()
+        stations, last_updated, changes = client.get_stations_status_incremental()
+        assert stations == [] and last_updated is None, "Debe devolverse una lista vacía y None"
+        assert isinstance(changes, StationStatusChanges) and changes.is_empty, "No debe haber cambios"
+
+        _, _, changes = client.get_stations_status_incremental()
+        assert changes.is_empty, "Tras recuperarse no debe haber cambios respecto a la última consulta válida"
@@ -0,0 +1,207 @@
+"""
+Cliente GBFS para varios sistemas de bicicletas a la vez.
+
+BarcelonaBikingClient trabaja con un único sistema. MultiSystemClient recibe las URLs
+de descubrimiento (gbfs.json) de muchos sistemas, localiza en cada una el feed
+station_status y los descarga todos en paralelo desde un único proceso:
+
+- Una sola requests.Session compartida, con un pool de conexiones por host
+  reutilizado entre descargas (keep-alive).
+- Un límite de peticiones simultáneas por host, para no saturar a los proveedores
+  que alojan varios sistemas en el mismo servidor.
+- Las URLs de station_status obtenidas del descubrimiento se guardan, de modo que
+  en las siguientes consultas solo se descarga station_status. Si esa descarga
+  falla, la URL se olvida y la siguiente consulta vuelve a hacer el descubrimiento.
+
+Los resultados se devuelven como StationStatusSnapshot indexadas por sistema y los
+errores por separado: un sistema que falla, o que responde con un JSON que no tiene
+la forma esperada, no interrumpe la descarga de los demás.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ej1c3 import StationStatusSnapshot
+
+# Errores de un sistema que se devuelven en errors en lugar de propagarse. Los de
+# tipo, atributo y clave aparecen cuando el JSON no tiene la estructura GBFS esperada
+FETCH_ERRORS = (requests.exceptions.RequestException, ValueError, AttributeError, TypeError, KeyError)
+
+
+def find_feed_url(discovery: Dict, feed_name: str = 'station_status',
+                  language: Optional[str] = 'en') -> Optional[str]:
+    """
+    Busca la URL de un feed en la respuesta de descubrimiento gbfs.json.
+
+    Args:
+        discovery: JSON de gbfs.json ({"data": {"<idioma>": {"feeds": [...]}}})
+        feed_name: Nombre del feed buscado
+        language: Idioma preferido; si no existe se usa el primero disponible
+
+    Returns:
+        Optional[str]: URL del feed, o None si no aparece
+    """
+    languages = (discovery or {}).get('data') or {}
+    if not isinstance(languages, dict):
+        return None
+    # GBFS 3.0 publica los feeds directamente en data.feeds, sin idiomas
+    if 'feeds' in languages:
+        candidates = [languages]
+    else:
+        candidates = [languages[language]] if language in languages else []
+        candidates += [value for key, value in languages.items() if key != language]
+    for entry in candidates:
+        for feed in (entry or {}).get('feeds') or []:
+            if feed.get('name') == feed_name:
+                return feed.get('url')
+    return None
+
+
+class MultiSystemClient:
+    """
+    Cliente que descarga station_status de varios sistemas GBFS en paralelo.
+
+    Atributos:
+        systems: Diccionario nombre del sistema -> URL de gbfs.json
+        status_urls: URLs de station_status ya descubiertas, por sistema
+    """
+
+    def __init__(self, systems: Union[Mapping[str, str], Iterable[str]], max_workers: int = 16,
+                 per_host_limit: int = 4, timeout: float = 10.0, language: Optional[str] = 'en'):
+        """
+        Inicializa el cliente.
+
+        Args:
+            systems: URLs de gbfs.json, o diccionario nombre -> URL. Si se pasa una lista,
+                     el nombre de cada sistema es su URL.
+            max_workers: Número máximo de descargas simultáneas en total
+            per_host_limit: Número máximo de descargas simultáneas contra un mismo host
+            timeout: Timeout de cada petición, en segundos
+            language: Idioma preferido de los feeds
+        """
+        if isinstance(systems, Mapping):
+            self.systems: Dict[str, str] = dict(systems)
+        else:
+            self.systems = {url: url for url in systems}
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.language = language
+        self.status_urls: Dict[str, str] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(len(self.systems), 1), pool_maxsize=per_host_limit)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._host_limits.get(host)
+            if semaphore is None:
+                semaphore = self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return semaphore
+
+    def _get_json(self, url: str) -> Dict:
+        """
+        Realiza una petición GET respetando el límite por host y devuelve el JSON.
+
+        Raises:
+            requests.exceptions.RequestException: Si falla la petición o el código no es 2xx
+            ValueError: Si la respuesta no es JSON
+        """
+        with self._host_limit(url):
+            resp = self.session.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _status_url(self, name: str) -> str:
+        url = self.status_urls.get(name)
+        if url is None:
+            discovery = self._get_json(self.systems[name])
+            url = find_feed_url(discovery, 'station_status', self.language)
+            if url is None:
+                raise ValueError(f"El sistema {name} no publica station_status")
+            self.status_urls[name] = url
+        return url
+
+    def fetch_system(self, name: str) -> StationStatusSnapshot:
+        """
+        Descarga station_status de un sistema.
+
+        Args:
+            name: Nombre del sistema
+
+        Returns:
+            StationStatusSnapshot: Instantánea del sistema
+
+        Raises:
+            requests.exceptions.RequestException, ValueError: Si falla alguna descarga
+            AttributeError, TypeError, KeyError: Si algún JSON no tiene la estructura esperada
+        """
+        url = self._status_url(name)
+        try:
+            return StationStatusSnapshot.from_feed(self._get_json(url))
+        except FETCH_ERRORS:
+            # La URL puede haber cambiado: se vuelve a descubrir en la próxima consulta
+            self.status_urls.pop(name, None)
+            raise
+
+    def fetch_all(self, names: Optional[Iterable[str]] = None
+                  ) -> Tuple[Dict[str, StationStatusSnapshot], Dict[str, str]]:
+        """
+        Descarga station_status de todos los sistemas (o de los indicados) en paralelo.
+
+        Args:
+            names: Sistemas a descargar; por defecto, todos
+
+        Returns:
+            Tuple[Dict[str, StationStatusSnapshot], Dict[str, str]]:
+                - Instantáneas de los sistemas descargados correctamente
+                - Mensajes de error de los sistemas que han fallado
+        """
+        names = list(self.systems if names is None else names)
+        snapshots: Dict[str, StationStatusSnapshot] = {}
+        errors: Dict[str, str] = {}
+        if not names:
+            return snapshots, errors
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(names))) as executor:
+            futures = {name: executor.submit(self.fetch_system, name) for name in names}
+            for name, future in futures.items():
+                try:
+                    snapshots[name] = future.result()
+                except FETCH_ERRORS as e:
+                    errors[name] = f"{type(e).__name__}: {e}"
+        return snapshots, errors
+
+    def close(self) -> None:
+        """
+        Cierra las conexiones de la sesión compartida.
+        """
+        self.session.close()
+
+    def __enter__(self) -> 'MultiSystemClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+if __name__ == '__main__':
+    import sys
+
+    urls = sys.argv[1:] or ["https://barcelona-sp.publicbikesystem.net/customer/gbfs/v2/gbfs.json"]
+    with MultiSystemClient(urls) as client:
+        snapshots, errors = client.fetch_all()
+    for name, snapshot in snapshots.items():
+        bikes = sum(station.num_bikes_available or 0 for station in snapshot)
+        print(f"{name}: {len(snapshot)} estaciones, {bikes} bicicletas disponibles")
+    for name, error in errors.items():
+        print(f"{name}: ERROR {error}")
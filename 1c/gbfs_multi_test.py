@@ -0,0 +1,125 @@
+"""
+Tests para gbfs_multi.py
+Este archivo contiene pruebas para verificar el cliente GBFS de varios sistemas:
+descubrimiento de feeds, descargas en paralelo, errores y límite por host.
+"""
+
+import threading
+import time
+import pytest
+import responses
+from unittest.mock import MagicMock
+
+from gbfs_multi import MultiSystemClient, find_feed_url
+
+
+def discovery(base, languages=("en",)):
+    return {"last_updated": 1, "ttl": 0, "data": {
+        language: {"feeds": [
+            {"name": "station_information", "url": f"{base}/{language}/station_information"},
+            {"name": "station_status", "url": f"{base}/{language}/station_status"},
+        ]}
+        for language in languages
+    }}
+
+
+def status(num_stations):
+    return {"last_updated": 1759835019, "ttl": 15, "data": {"stations": [
+        {"station_id": str(i), "status": "IN_SERVICE", "num_bikes_available": i} for i in range(num_stations)
+    ]}}
+
+
+@pytest.fixture
+def mock_responses():
+    """
+    Fixture que simula dos sistemas en hosts distintos y uno sin station_status
+    """
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add(responses.GET, "https://a.example/gbfs.json", json=discovery("https://a.example"))
+        rsps.add(responses.GET, "https://a.example/en/station_status", json=status(3))
+        rsps.add(responses.GET, "https://b.example/gbfs.json", json=discovery("https://b.example", ("es", "ca")))
+        rsps.add(responses.GET, "https://b.example/es/station_status", json=status(5))
+        rsps.add(responses.GET, "https://c.example/gbfs.json", json={"data": {"en": {"feeds": []}}})
+        rsps.add(responses.GET, "https://d.example/gbfs.json", status=503)
+        rsps.add(responses.GET, "https://e.example/gbfs.json", json=["no", "es", "gbfs"])
+        rsps.add(responses.GET, "https://f.example/gbfs.json", json=discovery("https://f.example"))
+        rsps.add(responses.GET, "https://f.example/en/station_status", json={"data": ["estaciones"]})
+        yield rsps
+
+
+def test_find_feed_url():
+    assert find_feed_url(discovery("https://x", ("es", "en"))) == "https://x/en/station_status"
+    assert find_feed_url(discovery("https://x", ("es",))) == "https://x/es/station_status", \
+        "Si no existe el idioma preferido debe usarse otro"
+    assert find_feed_url({"data": {"feeds": [{"name": "station_status", "url": "u"}]}}) == "u", \
+        "Debe aceptar el formato de GBFS 3.0"
+    assert find_feed_url(None) is None
+
+
+def test_fetch_all(mock_responses):
+    """
+    Verificar que se devuelven las instantáneas por sistema y los errores por separado
+    """
+    systems = {name: f"https://{name}.example/gbfs.json" for name in "abcdef"}
+    with MultiSystemClient(systems) as client:
+        snapshots, errors = client.fetch_all()
+
+    assert set(snapshots) == {"a", "b"}, "Deben descargarse los sistemas correctos"
+    assert len(snapshots["a"]) == 3 and len(snapshots["b"]) == 5
+    assert snapshots["a"].ttl == 15 and snapshots["a"].last_updated == 1759835019
+    assert set(errors) == {"c", "d", "e", "f"}, "Los sistemas con error deben aparecer en errors"
+    assert "station_status" in errors["c"]
+
+
+def test_discovery_is_cached(mock_responses):
+    """
+    Verificar que gbfs.json solo se descarga la primera vez
+    """
+    client = MultiSystemClient(["https://a.example/gbfs.json"])
+    client.fetch_all()
+    client.fetch_all()
+    discovery_calls = [call for call in mock_responses.calls if call.request.url.endswith("gbfs.json")]
+    assert len(discovery_calls) == 1, "El descubrimiento debe reutilizarse"
+    assert client.status_urls == {"https://a.example/gbfs.json": "https://a.example/en/station_status"}
+
+
+def test_failed_status_url_is_rediscovered(mock_responses):
+    """
+    Verificar que la URL de station_status se vuelve a descubrir después de un error
+    """
+    client = MultiSystemClient({"f": "https://f.example/gbfs.json"})
+    _, errors = client.fetch_all()
+    assert "f" in errors and client.status_urls == {}, "La URL que ha fallado debe olvidarse"
+
+    client.fetch_all()
+    discovery_calls = [call for call in mock_responses.calls if call.request.url.endswith("gbfs.json")]
+    assert len(discovery_calls) == 2, "El descubrimiento debe repetirse tras el error"
+
+
+def test_per_host_limit():
+    """
+    Verificar que no se superan las peticiones simultáneas por host
+    """
+    client = MultiSystemClient({f"s{i}": f"https://same.example/{i}/gbfs.json" for i in range(8)},
+                               max_workers=8, per_host_limit=2)
+    client.status_urls = {name: f"https://same.example/{name}/station_status" for name in client.systems}
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_get(url, timeout):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(url)
+        response = MagicMock()
+        response.json.return_value = status(1)
+        return response
+
+    client.session.get = fake_get
+    snapshots, errors = client.fetch_all()
+
+    assert len(snapshots) == 8 and not errors
+    assert max(peak) <= 2, "No debe haber más de 2 peticiones simultáneas al mismo host"
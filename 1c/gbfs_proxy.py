@@ -0,0 +1,342 @@
+"""
+Proxy con caché del estado de las estaciones de Barcelona.
+
+Cada consumidor interno que llama directamente a la API GBFS de Barcelona hace su
+propia descarga de station_status. Este servidor, hecho con http.server como el de
+ej1b3, mantiene una sola copia en memoria que renueva en segundo plano un
+StationStatusPoller (un BarcelonaBikingClient que sigue el ttl del feed), de modo
+que cientos de consumidores comparten una única descarga:
+
+    GET /status              Documento station_status completo (formato GBFS)
+    GET /stations            Lista de estaciones; admite ?min_bikes=N,
+                             ?vehicle_type=TIPO, ?operational=1 y ?top=K
+    GET /station/<id>        Estado de una estación
+    GET /metrics             Métricas del servidor y del sondeo (Prometheus)
+
+Cuando llega una instantánea nueva se serializan y se comprimen de antemano
+(comun.compresion) los cuerpos de /status, /stations y de cada estación, así que
+atender una petición es buscar unos bytes ya preparados y escribirlos. Las
+consultas con filtros se guardan también, por instantánea, la primera vez que se
+piden. Todas las respuestas llevan el ETag de la instantánea (If-None-Match
+devuelve un 304) y un Cache-Control con los segundos de validez que le quedan.
+
+Ejemplo contra el simulador local:
+
+    server = create_server(port=8900, base_url="http://localhost:8899/en")
+    run_server(server)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ej1c3 import BARCELONA_BASE_URL, BarcelonaBikingClient, StationStatusInfo, StationStatusSnapshot
+from station_status_poller import OverflowPolicy, StationStatusPoller
+
+# La raíz del repositorio, para importar el paquete comun
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
+
+from comun.compresion import Compresor, CuerpoEstatico
+from comun.servidor_http import ManejadorInstrumentado, ServidorInstrumentadoHilos
+
+ROUTES = ("/status", "/stations", "/station/<id>", "/metrics")
+# Consultas con filtros distintas que se guardan por instantánea
+MAX_CACHED_QUERIES = 64
+
+
+def station_to_dict(station: StationStatusInfo) -> Dict[str, Any]:
+    """
+    Convierte un StationStatusInfo en un diccionario con los campos de station_status.
+    """
+    return {
+        'station_id': station.station_id,
+        'status': station.status.name,
+        'num_bikes_available': station.num_bikes_available,
+        'num_bikes_disabled': station.num_bikes_disabled,
+        'num_docks_available': station.num_docks_available,
+        'is_renting': station.is_renting,
+        'is_returning': station.is_returning,
+        'is_operational': station.is_operational,
+        'last_reported': station.last_reported,
+        'vehicle_types_available': station.vehicle_types_available,
+    }
+
+
+class PublishedSnapshot:
+    """
+    Instantánea con sus respuestas ya serializadas y comprimidas.
+
+    Se sustituye entera al llegar una instantánea nueva, así que los manejadores
+    la leen sin locks.
+
+    Atributos:
+        snapshot: StationStatusSnapshot publicada
+        version: Número de instantáneas publicadas hasta esta
+        etag: ETag de todas las respuestas de esta instantánea
+        status_body, stations_body: Cuerpos de /status y /stations sin filtros
+        station_bodies: Cuerpo de /station/<id> de cada estación
+    """
+
+    def __init__(self, snapshot: StationStatusSnapshot, version: int, compressor: Compresor):
+        self.snapshot = snapshot
+        self.version = version
+        self.etag = f'"{snapshot.last_updated}-{version}"'
+        self.published_at = time.monotonic()
+        self._compressor = compressor
+        stations = [station_to_dict(station) for station in snapshot.stations]
+        self.status_body = compressor.preparar(json.dumps({
+            'last_updated': snapshot.last_updated,
+            'ttl': snapshot.ttl,
+            'data': {'stations': stations},
+        }).encode())
+        self.stations_body = self._stations_body(stations)
+        self.station_bodies = {
+            station['station_id']: json.dumps(station).encode() for station in stations
+        }
+        self._queries: Dict[str, CuerpoEstatico] = {}
+        self._lock = threading.Lock()
+
+    def _stations_body(self, stations: List[Dict[str, Any]]) -> CuerpoEstatico:
+        return self._compressor.preparar(json.dumps({
+            'last_updated': self.snapshot.last_updated,
+            'count': len(stations),
+            'stations': stations,
+        }).encode())
+
+    def max_age(self) -> int:
+        """
+        Segundos de validez que le quedan a la instantánea según el ttl del feed.
+        """
+        if not self.snapshot.ttl:
+            return 0
+        return max(int(self.snapshot.ttl - (time.monotonic() - self.published_at)), 0)
+
+    def query(self, query: str) -> CuerpoEstatico:
+        """
+        Devuelve el cuerpo de /stations con los filtros de la query string.
+
+        Raises:
+            ValueError: Si algún filtro numérico no es un entero
+        """
+        body = self._queries.get(query)
+        if body is not None:
+            return body
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        min_bikes = int(params.get('min_bikes', 0))
+        vehicle_type = params.get('vehicle_type') or None
+        operational = params.get('operational', '').lower() in ('1', 'true', 'yes')
+        top = int(params['top']) if 'top' in params else None
+        if top is not None and top < 0:
+            raise ValueError(f"top no puede ser negativo: {top}")
+        if top is not None:
+            stations = self.snapshot.get_top_stations(top, vehicle_type, operational)
+        elif min_bikes > 0 or vehicle_type or operational:
+            stations = self.snapshot.get_stations_with_available_bikes(max(min_bikes, 0), vehicle_type, operational)
+        else:
+            stations = self.snapshot.stations
+        body = self._stations_body([station_to_dict(station) for station in stations])
+        with self._lock:
+            if len(self._queries) < MAX_CACHED_QUERIES:
+                self._queries[query] = body
+        return body
+
+
+class GBFSProxy:
+    """
+    Mantiene en memoria la última instantánea de station_status, renovada en segundo plano.
+
+    Atributos:
+        poller: StationStatusPoller que descarga el feed
+        published: Última PublishedSnapshot (None hasta la primera descarga correcta)
+    """
+
+    def __init__(self, client: Optional[BarcelonaBikingClient] = None, compressor: Optional[Compresor] = None,
+                 min_interval: float = 5.0, max_interval: float = 300.0, default_interval: float = 60.0):
+        """
+        Inicializa el proxy (no descarga nada hasta start()).
+
+        Args:
+            client: Cliente del feed (por defecto, un BarcelonaBikingClient de Barcelona)
+            compressor: Compresor con el que se preparan los cuerpos
+            min_interval, max_interval, default_interval: Intervalos del StationStatusPoller
+        """
+        self.poller = StationStatusPoller(client, min_interval, max_interval, default_interval)
+        self.compressor = compressor or Compresor()
+        self.published: Optional[PublishedSnapshot] = None
+        # Solo interesa la instantánea más reciente
+        self._subscription = self.poller.subscribe(maxsize=1, policy=OverflowPolicy.COALESCE)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._version = 0
+
+    def publish(self, snapshot: StationStatusSnapshot) -> PublishedSnapshot:
+        """
+        Prepara las respuestas de una instantánea y la publica.
+        """
+        self._version += 1
+        published = PublishedSnapshot(snapshot, self._version, self.compressor)
+        self.published = published
+        return published
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            snapshot = self._subscription.get(timeout=0.5)
+            if snapshot is not None:
+                self.publish(snapshot)
+
+    def start(self) -> None:
+        """
+        Arranca el sondeo y la publicación de instantáneas en segundo plano.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gbfs-proxy", daemon=True)
+        self._thread.start()
+        self.poller.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el sondeo y la publicación.
+        """
+        self.poller.stop(timeout)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que haya una instantánea publicada.
+
+        Returns:
+            bool: True si la hay, False si vence el timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.published is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+class GBFSProxyHandler(ManejadorInstrumentado):
+    """
+    Manejador de peticiones HTTP del proxy GBFS
+    """
+
+    def do_GET(self):
+        """
+        Método que se ejecuta cuando se recibe una petición GET.
+
+        Rutas implementadas:
+        - `/status`: Documento station_status completo
+        - `/stations`: Lista de estaciones, con filtros opcionales en la query string
+        - `/station/<id>`: Estado de una estación
+        - `/metrics`: Métricas del servidor y del sondeo en formato Prometheus
+
+        Para otras rutas (o estaciones desconocidas) devuelve un 404 con un mensaje en
+        formato JSON, y un 503 mientras no haya ninguna instantánea.
+        """
+        url = urlsplit(self.path)
+        path = url.path
+        if path == '/metrics':
+            self._update_proxy_metrics()
+            self.enviar_metricas()
+            return
+
+        published: Optional[PublishedSnapshot] = self.server.proxy.published
+        if path not in ('/status', '/stations') and not path.startswith('/station/'):
+            self._send_error(404, f"Recurso {self.path} no encontrado")
+            return
+        if published is None:
+            self._send_error(503, "Instantánea de estaciones aún no disponible")
+            return
+
+        if path == '/status':
+            body = published.status_body
+        elif path == '/stations':
+            try:
+                body = published.query(url.query) if url.query else published.stations_body
+            except ValueError:
+                self._send_error(400, f"Parámetros no válidos: {url.query}")
+                return
+        else:
+            body = published.station_bodies.get(path[len('/station/'):])
+            if body is None:
+                self._send_error(404, f"Estación {path[len('/station/'):]} no encontrada")
+                return
+
+        cache_headers = {'ETag': published.etag, 'Cache-Control': f"max-age={published.max_age()}"}
+        if self.headers.get('If-None-Match') == published.etag:
+            self.send_response(304)
+            for name, value in cache_headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.enviar_cuerpo(200, body, 'application/json', cache_headers)
+
+    def _send_error(self, code: int, message: str) -> None:
+        self.enviar_cuerpo(code, json.dumps({'code': code, 'message': message}).encode(), 'application/json')
+
+    def _update_proxy_metrics(self) -> None:
+        registry = self.server.metricas.registro
+        proxy: GBFSProxy = self.server.proxy
+        metrics = proxy.poller.metrics()
+        published = proxy.published
+        registry.contador("gbfs_proxy_upstream_polls_total", "Descargas de station_status").con().set(metrics['polls'])
+        registry.contador("gbfs_proxy_upstream_errors_total", "Descargas fallidas").con().set(metrics['errors'])
+        registry.gauge("gbfs_proxy_stations", "Estaciones de la instantánea publicada").con().set(
+            len(published.snapshot) if published else 0)
+        registry.gauge("gbfs_proxy_snapshot_age_seconds", "Segundos desde la última publicación").con().set(
+            round(time.monotonic() - published.published_at, 3) if published else -1)
+
+
+def create_server(host="localhost", port=8000, base_url=BARCELONA_BASE_URL, min_interval=5.0,
+                  max_interval=300.0, default_interval=60.0, log="asincrono"):
+    """
+    Crea y configura el servidor HTTP del proxy (el sondeo empieza con run_server o server.proxy.start())
+
+    Args:
+        host, port: Dirección de escucha (port=0 elige un puerto libre)
+        base_url: URL base de los feeds GBFS de origen
+        min_interval, max_interval, default_interval: Intervalos del sondeo, en segundos
+        log: Modo del log de accesos ('estandar', 'asincrono' o 'desactivado')
+    """
+    httpd = ServidorInstrumentadoHilos((host, port), GBFSProxyHandler, rutas=ROUTES, log=log)
+    httpd.proxy = GBFSProxy(BarcelonaBikingClient(base_url=base_url), httpd.compresor,
+                            min_interval, max_interval, default_interval)
+    return httpd
+
+
+def run_server(server):
+    """
+    Inicia el sondeo y el servidor HTTP
+    """
+    server.proxy.start()
+    print(f"Proxy GBFS iniciado en http://{server.server_address[0]}:{server.server_port}/stations")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('Servidor detenido por el usuario.')
+    finally:
+        server.proxy.stop(1)
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Proxy con caché del estado de las estaciones")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--base-url', default=BARCELONA_BASE_URL)
+    parser.add_argument('--min-interval', type=float, default=5.0)
+    args = parser.parse_args()
+    run_server(create_server(args.host, args.port, args.base_url, min_interval=args.min_interval))
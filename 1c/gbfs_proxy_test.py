@@ -0,0 +1,135 @@
+"""
+Tests para gbfs_proxy.py
+Este archivo contiene pruebas para verificar el proxy con caché contra el simulador
+GBFS local: las rutas, los filtros, el ETag, la compresión y la renovación de la
+instantánea.
+"""
+
+import threading
+import time
+import pytest
+import requests
+
+import gbfs_proxy
+import gbfs_simulator
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def stop(server, thread):
+    server.shutdown()
+    server.server_close()
+    thread.join(1)
+
+
+@pytest.fixture
+def upstream():
+    """
+    Fixture que arranca el simulador con 100 estaciones y sin cambios automáticos
+    """
+    server = gbfs_simulator.create_server(host="localhost", port=0, stations=100, ttl=0)
+    thread = start(server)
+    yield server
+    stop(server, thread)
+
+
+@pytest.fixture
+def proxy(upstream):
+    """
+    Fixture que arranca el proxy contra el simulador, sondeando cada 50 ms
+    """
+    server = gbfs_proxy.create_server(host="localhost", port=0,
+                                      base_url=f"http://localhost:{upstream.server_port}/en",
+                                      min_interval=0.05, default_interval=0.05, log="desactivado")
+    thread = start(server)
+    server.proxy.start()
+    assert server.proxy.wait_ready(5), "El proxy debe publicar la primera instantánea"
+    yield server, f"http://localhost:{server.server_port}"
+    server.proxy.stop(1)
+    stop(server, thread)
+
+
+def test_rutas(proxy, upstream):
+    _, url = proxy
+    status = requests.get(f"{url}/status").json()
+    assert len(status["data"]["stations"]) == 100, "/status debe tener todas las estaciones"
+
+    stations = requests.get(f"{url}/stations").json()
+    assert stations["count"] == 100
+    esperada = upstream.simulator.stations()[4]
+    station = requests.get(f"{url}/station/5").json()
+    assert station["station_id"] == "5"
+    assert station["num_bikes_available"] == esperada["num_bikes_available"]
+
+    response = requests.get(f"{url}/station/no-existe")
+    assert response.status_code == 404 and response.json()["code"] == 404
+    assert requests.get(f"{url}/otra").status_code == 404
+
+
+def test_filtros(proxy):
+    server, url = proxy
+    snapshot = server.proxy.published.snapshot
+    con_bicis = requests.get(f"{url}/stations?min_bikes=5").json()
+    assert con_bicis["count"] == len(snapshot.get_stations_with_available_bikes(5))
+    assert all(station["num_bikes_available"] >= 5 for station in con_bicis["stations"])
+
+    top = requests.get(f"{url}/stations?top=3&vehicle_type=BOOST").json()["stations"]
+    assert [s["station_id"] for s in top] == [s.station_id for s in snapshot.get_top_stations(3, "BOOST")]
+    assert requests.get(f"{url}/stations?top=abc").status_code == 400
+
+    requests.get(f"{url}/stations?min_bikes=5")
+    assert len(server.proxy.published._queries) == 2, "Cada consulta distinta se prepara una sola vez"
+
+
+def test_etag_y_compresion(proxy):
+    _, url = proxy
+    response = requests.get(f"{url}/status", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    etag = response.headers["ETag"]
+    assert requests.get(f"{url}/status", headers={"If-None-Match": etag}).status_code == 304
+    assert requests.get(f"{url}/station/1", headers={"If-None-Match": etag}).status_code == 304, \
+        "Todas las respuestas de una instantánea comparten el ETag"
+
+
+def test_renovacion(proxy, upstream):
+    """
+    Verificar que un cambio en el origen llega al proxy sin que los consumidores lo pidan
+    """
+    server, url = proxy
+    etag = requests.get(f"{url}/status").headers["ETag"]
+    upstream.simulator.advance()
+    deadline = time.monotonic() + 5
+    while requests.get(f"{url}/status").headers["ETag"] == etag and time.monotonic() < deadline:
+        time.sleep(0.02)
+    nuevo = requests.get(f"{url}/status")
+    assert nuevo.headers["ETag"] != etag, "El proxy debe publicar la nueva instantánea"
+    assert nuevo.json()["last_updated"] == upstream.simulator.last_updated
+
+
+def test_una_descarga_para_muchos_consumidores(proxy):
+    server, url = proxy
+    polls = server.proxy.poller.metrics()["polls"]
+    with requests.Session() as session:
+        for _ in range(200):
+            session.get(f"{url}/station/7")
+    # Con un sondeo cada 50 ms, 200 peticiones no deben provocar 200 descargas
+    assert server.proxy.poller.metrics()["polls"] - polls < 100
+
+    texto = requests.get(f"{url}/metrics").text
+    assert 'http_server_requests_total{route="/station/<id>",method="GET",status="200"} 200' in texto
+    assert "gbfs_proxy_stations 100" in texto
+
+
+def test_sin_instantanea():
+    server = gbfs_proxy.create_server(host="localhost", port=0, base_url="http://localhost:1/en",
+                                      log="desactivado")
+    thread = start(server)
+    try:
+        response = requests.get(f"http://localhost:{server.server_port}/stations")
+    finally:
+        stop(server, thread)
+    assert response.status_code == 503, "Sin ninguna instantánea el proxy debe responder 503"
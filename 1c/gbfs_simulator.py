@@ -0,0 +1,313 @@
+"""
+Servidor GBFS local para pruebas de carga sin conexión.
+
+ej1c1, ej1c2 y ej1c3 dependen de los endpoints reales de Barcelona, así que no se
+pueden medir sin red ni con un número de estaciones distinto. Este servidor, hecho
+con http.server como los de ej1a3 y ej1b3, publica los mismos feeds para N
+estaciones sintéticas:
+
+    GET /gbfs.json                     Descubrimiento de feeds
+    GET /<idioma>/station_information  Información fija de las estaciones
+    GET /<idioma>/station_status       Estado de las estaciones
+
+El estado cambia con el tiempo: cada ttl segundos una parte de las estaciones
+coge o deja bicicletas y se actualizan last_reported y last_updated. Cada versión
+del documento se serializa una sola vez y se publica con su ETag, de modo que una
+petición con If-None-Match recibe un 304 sin cuerpo mientras no haya cambios.
+
+Para simular un proveedor lento o inestable se puede añadir latencia a cada
+respuesta y devolver errores con una probabilidad dada.
+
+Ejemplo con el cliente de ej1c3:
+
+    server = create_server(port=8899, stations=5000)
+    client = BarcelonaBikingClient(base_url="http://localhost:8899/en")
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+VEHICLE_TYPE_IDS = ("ICONIC", "BOOST")
+# Centro aproximado de Barcelona, alrededor del cual se sitúan las estaciones
+CENTER = (41.3874, 2.1686)
+
+
+class GBFSSimulator:
+    """
+    Estado de un sistema GBFS sintético que evoluciona con el tiempo.
+
+    Atributos:
+        version: Número de veces que ha cambiado station_status
+        last_updated: Timestamp de la última versión de station_status
+    """
+
+    def __init__(self, stations: int = 500, ttl: int = 10, change_ratio: float = 0.1,
+                 language: str = 'en', seed: Optional[int] = 0):
+        """
+        Inicializa el simulador.
+
+        Args:
+            stations: Número de estaciones
+            ttl: Segundos entre cambios de station_status (y valor del campo ttl)
+            change_ratio: Fracción de estaciones que cambian en cada versión
+            language: Idioma bajo el que se publican los feeds
+            seed: Semilla de los datos aleatorios (None, aleatoria)
+        """
+        self.ttl = ttl
+        self.change_ratio = change_ratio
+        self.language = language
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # Periodos de ttl ya aplicados (advance() también puede llamarse a mano)
+        self._ticks = 0
+        self.version = 0
+        self.last_updated = int(time.time())
+
+        self._information = [self._station_information(i) for i in range(1, stations + 1)]
+        self._status = [self._initial_status(info) for info in self._information]
+        self._information_body = self._render({'stations': self._information})
+        self._status_body = self._render({'stations': self._status})
+
+    def _station_information(self, number: int) -> Dict:
+        capacity = self._rng.randint(15, 40)
+        return {
+            'station_id': str(number),
+            'name': f"Estación sintética {number}",
+            'physical_configuration': 'ELECTRICBIKESTATION',
+            'lat': round(CENTER[0] + self._rng.uniform(-0.05, 0.05), 7),
+            'lon': round(CENTER[1] + self._rng.uniform(-0.06, 0.06), 7),
+            'altitude': 0.0,
+            'address': f"Carrer Sintètic, {number}",
+            'post_code': f"080{number % 40:02d}",
+            'capacity': capacity,
+            'is_charging_station': True,
+        }
+
+    def _initial_status(self, info: Dict) -> Dict:
+        capacity = info['capacity']
+        disabled = self._rng.randint(0, 2)
+        bikes = self._rng.randint(0, capacity - disabled)
+        status = {
+            'station_id': info['station_id'],
+            'num_bikes_available': bikes,
+            'num_bikes_disabled': disabled,
+            'num_docks_available': capacity - disabled - bikes,
+            'num_docks_disabled': 0,
+            'last_reported': self.last_updated - self._rng.randint(0, 120),
+            'is_charging_station': True,
+            'status': 'IN_SERVICE' if self._rng.random() > 0.03 else 'MAINTENANCE',
+            'is_installed': True,
+            'is_renting': True,
+            'is_returning': True,
+            'traffic': None,
+        }
+        self._set_vehicle_types(status)
+        return status
+
+    def _set_vehicle_types(self, status: Dict) -> None:
+        bikes = status['num_bikes_available']
+        boost = self._rng.randint(0, bikes)
+        status['vehicle_types_available'] = [
+            {'vehicle_type_id': VEHICLE_TYPE_IDS[0], 'count': bikes - boost},
+            {'vehicle_type_id': VEHICLE_TYPE_IDS[1], 'count': boost},
+        ]
+
+    def _render(self, data: Dict) -> Tuple[bytes, str]:
+        """
+        Serializa un feed con la cabecera GBFS y calcula su ETag.
+        """
+        body = json.dumps({
+            'last_updated': self.last_updated,
+            'ttl': self.ttl,
+            'version': '2.3',
+            'data': data,
+        }).encode()
+        return body, '"' + hashlib.md5(body).hexdigest() + '"'
+
+    def advance(self, steps: int = 1) -> None:
+        """
+        Genera las siguientes versiones de station_status.
+
+        En cada versión cambia change_ratio de las estaciones: alquilan o devuelven
+        algunas bicicletas y se actualiza su last_reported.
+        """
+        with self._lock:
+            self._advance(steps)
+
+    def _advance(self, steps: int) -> None:
+        if steps > 0:
+            for _ in range(steps):
+                self.version += 1
+                self.last_updated += max(self.ttl, 1)
+                changes = max(1, int(len(self._status) * self.change_ratio)) if self._status else 0
+                for status in self._rng.sample(self._status, changes):
+                    movable = status['num_bikes_available'] + status['num_docks_available']
+                    delta = self._rng.randint(-3, 3)
+                    bikes = min(max(status['num_bikes_available'] + delta, 0), movable)
+                    status['num_bikes_available'] = bikes
+                    status['num_docks_available'] = movable - bikes
+                    status['last_reported'] = self.last_updated - self._rng.randint(0, max(self.ttl, 1))
+                    self._set_vehicle_types(status)
+            self._status_body = self._render({'stations': self._status})
+
+    def _catch_up(self) -> None:
+        """
+        Avanza tantas versiones como periodos de ttl hayan pasado desde el arranque.
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            expected = int((time.monotonic() - self._started) // self.ttl)
+            if expected > self._ticks:
+                self._advance(expected - self._ticks)
+                self._ticks = expected
+
+    def discovery(self, base_url: str) -> Tuple[bytes, str]:
+        """
+        Documento gbfs.json con las URLs de los feeds bajo base_url.
+        """
+        feeds = [
+            {'name': name, 'url': f"{base_url}/{self.language}/{name}"}
+            for name in ('station_information', 'station_status')
+        ]
+        return self._render({self.language: {'feeds': feeds}})
+
+    def station_information(self) -> Tuple[bytes, str]:
+        """
+        Cuerpo y ETag de station_information (no cambia).
+        """
+        return self._information_body
+
+    def station_status(self) -> Tuple[bytes, str]:
+        """
+        Cuerpo y ETag de la versión actual de station_status.
+        """
+        self._catch_up()
+        return self._status_body
+
+    def stations(self) -> List[Dict]:
+        """
+        Copia del estado actual de las estaciones.
+        """
+        with self._lock:
+            return [dict(status) for status in self._status]
+
+
+class GBFSSimulatorHandler(BaseHTTPRequestHandler):
+    """
+    Manejador de peticiones HTTP del simulador GBFS
+    """
+
+    def do_GET(self):
+        """
+        Método que se ejecuta cuando se recibe una petición GET.
+
+        Rutas implementadas:
+        - `/gbfs.json`: Descubrimiento de feeds
+        - `/<idioma>/station_information` y `/<idioma>/station_status`: Feeds de estaciones
+
+        Para otras rutas devuelve un 404 con un mensaje en formato JSON.
+        """
+        server = self.server
+        simulator: GBFSSimulator = server.simulator
+        if server.latency > 0:
+            time.sleep(server.latency)
+        if server.error_rate > 0 and server.random.random() < server.error_rate:
+            self._send_error(server.error_status, "Error simulado")
+            return
+
+        path = self.path.split('?', 1)[0]
+        if path == '/gbfs.json':
+            host = self.headers.get('Host') or f"{server.server_address[0]}:{server.server_port}"
+            body, etag = simulator.discovery(f"http://{host}")
+        elif path == f'/{simulator.language}/station_information':
+            body, etag = simulator.station_information()
+        elif path == f'/{simulator.language}/station_status':
+            body, etag = simulator.station_status()
+        else:
+            self._send_error(404, f"Recurso {self.path} no encontrado")
+            return
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', f"max-age={simulator.ttl}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code: int, message: str) -> None:
+        body = json.dumps({'code': code, 'message': message}).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # En las pruebas de carga el log de cada petición por stderr es un cuello de botella
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(host="localhost", port=8000, stations=500, ttl=10, change_ratio=0.1,
+                  latency=0.0, error_rate=0.0, error_status=503, seed=0, quiet=True):
+    """
+    Crea y configura el servidor HTTP del simulador
+
+    Args:
+        host, port: Dirección de escucha (port=0 elige un puerto libre)
+        stations, ttl, change_ratio, seed: Parámetros del GBFSSimulator
+        latency: Segundos de espera añadidos a cada respuesta
+        error_rate: Probabilidad (0-1) de responder con error_status
+        error_status: Código de estado de los errores simulados
+        quiet: Si es True no se escribe el log de cada petición
+    """
+    httpd = ThreadingHTTPServer((host, port), GBFSSimulatorHandler)
+    httpd.daemon_threads = True
+    httpd.simulator = GBFSSimulator(stations, ttl, change_ratio, seed=seed)
+    httpd.latency = latency
+    httpd.error_rate = error_rate
+    httpd.error_status = error_status
+    httpd.random = random.Random(seed)
+    httpd.quiet = quiet
+    return httpd
+
+
+def run_server(server):
+    """
+    Inicia el servidor HTTP
+    """
+    print(f"Simulador GBFS iniciado en http://{server.server_address[0]}:{server.server_port}/gbfs.json "
+          f"({len(server.simulator.stations())} estaciones)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('Servidor detenido por el usuario.')
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor GBFS local con estaciones sintéticas")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--stations', type=int, default=500)
+    parser.add_argument('--ttl', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    run_server(create_server(args.host, args.port, stations=args.stations, ttl=args.ttl,
+                             latency=args.latency, error_rate=args.error_rate))
@@ -0,0 +1,129 @@
+"""
+Tests para gbfs_simulator.py
+Este archivo contiene pruebas para verificar el servidor GBFS local: los feeds que
+publica, los cambios de estado, las cabeceras ttl/ETag y los errores simulados.
+"""
+
+import threading
+import time
+import pytest
+import requests
+
+from gbfs_simulator import GBFSSimulator, create_server
+from gbfs_multi import MultiSystemClient, find_feed_url
+from gbfs_stream import iter_stations_status
+from ej1c3 import BarcelonaBikingClient
+
+
+def start(**options):
+    server = create_server(host="localhost", port=0, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+@pytest.fixture
+def server():
+    """
+    Fixture que arranca el simulador en un puerto libre con 50 estaciones y sin cambios automáticos
+    """
+    server, thread = start(stations=50, ttl=0)
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(1)
+
+
+def base_url(server):
+    return f"http://localhost:{server.server_port}"
+
+
+def test_discovery_y_clientes(server):
+    """
+    Verificar que los clientes existentes funcionan contra el simulador
+    """
+    discovery = requests.get(f"{base_url(server)}/gbfs.json").json()
+    status_url = find_feed_url(discovery, 'station_status')
+    assert status_url == f"{base_url(server)}/en/station_status"
+
+    snapshot = BarcelonaBikingClient(base_url=f"{base_url(server)}/en").get_snapshot()
+    assert len(snapshot) == 50, "Debe publicar todas las estaciones sintéticas"
+    assert snapshot.ttl == 0
+
+    assert len(list(iter_stations_status(status_url))) == 50
+
+    with MultiSystemClient({"simulado": f"{base_url(server)}/gbfs.json"}) as client:
+        snapshots, errors = client.fetch_all()
+    assert errors == {}
+    assert len(snapshots["simulado"]) == 50
+
+    information = requests.get(f"{base_url(server)}/en/station_information").json()["data"]["stations"]
+    assert {"station_id", "name", "lat", "lon", "capacity"} <= set(information[0])
+
+
+def test_etag_y_cambios(server):
+    """
+    Verificar que el ETag solo cambia cuando cambia el estado y que se responde 304
+    """
+    url = f"{base_url(server)}/en/station_status"
+    resp = requests.get(url)
+    etag = resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == "max-age=0"
+
+    not_modified = requests.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304, "Sin cambios debe responder 304"
+    assert not_modified.content == b""
+
+    server.simulator.advance()
+    changed = requests.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["last_updated"] > resp.json()["last_updated"]
+
+
+def test_estado_coherente():
+    """
+    Verificar que los contadores se mantienen coherentes con la capacidad al cambiar
+    """
+    simulator = GBFSSimulator(stations=20, ttl=0, change_ratio=0.5)
+    before = simulator.stations()
+    simulator.advance(10)
+    after = simulator.stations()
+    assert simulator.version == 10
+    assert before != after, "El estado debe cambiar con el tiempo"
+    for old, new in zip(before, after):
+        assert (old["num_bikes_available"] + old["num_docks_available"]
+                == new["num_bikes_available"] + new["num_docks_available"])
+        assert sum(v["count"] for v in new["vehicle_types_available"]) == new["num_bikes_available"]
+
+
+def test_cambios_por_ttl():
+    simulator = GBFSSimulator(stations=5, ttl=1)
+    _, etag = simulator.station_status()
+    time.sleep(1.1)
+    _, new_etag = simulator.station_status()
+    assert simulator.version == 1, "Tras un ttl debe publicarse una versión nueva"
+    assert new_etag != etag
+
+
+def test_latencia_y_errores():
+    """
+    Verificar la latencia añadida, los errores simulados y el 404
+    """
+    server, thread = start(stations=5, ttl=0, latency=0.2, error_rate=1.0, error_status=503)
+    try:
+        start_time = time.monotonic()
+        resp = requests.get(f"{base_url(server)}/en/station_status")
+        assert time.monotonic() - start_time >= 0.2, "Debe añadirse la latencia configurada"
+        assert resp.status_code == 503
+        assert resp.json()["code"] == 503
+
+        server.error_rate = 0.0
+        server.latency = 0.0
+        resp = requests.get(f"{base_url(server)}/no/existe")
+        assert resp.status_code == 404
+        assert resp.json() == {"code": 404, "message": "Recurso /no/existe no encontrado"}
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
@@ -0,0 +1,298 @@
+"""
+Lectura incremental (streaming) de los feeds GBFS.
+
+get_stations_data (ej1c2) y BarcelonaBikingClient.get_stations_status (ej1c3)
+descargan el documento JSON completo y después construyen las listas de estaciones.
+Este módulo lee la respuesta por fragmentos (iter_content) y va entregando las
+estaciones una a una, de modo que el pico de memoria del parseo es proporcional a
+una estación y no a todo el feed.
+
+El lector es un pequeño recorredor de JSON escrito a mano: avanza por los objetos
+que llevan hasta la lista buscada (por defecto data.stations) y decodifica cada
+elemento con json.JSONDecoder.raw_decode en cuanto está completo en el buffer.
+El resto de campos del nivel superior (last_updated, ttl, version...) se guardan
+en FeedStream.header.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+
+from ej1c3 import BARCELONA_BASE_URL, StationStatusInfo, StationStatusTable
+
+STATION_INFORMATION_URL = f"{BARCELONA_BASE_URL}/station_information"
+STATION_STATUS_URL = f"{BARCELONA_BASE_URL}/station_status"
+
+_WHITESPACE = " \t\n\r"
+# Errores de un documento mal formado o de una conexión cortada a mitad de la lectura
+STREAM_ERRORS = (ValueError, requests.exceptions.RequestException)
+# Tamaño a partir del cual se descarta del buffer el texto ya procesado
+_COMPACT_THRESHOLD = 1 << 16
+
+
+class FeedStream:
+    """
+    Iterador sobre los elementos de una lista de un documento JSON recibido por fragmentos.
+
+    Atributos:
+        header: Campos del nivel superior del documento fuera de la ruta; los que aparecen
+                antes de la lista están disponibles desde el primer elemento y el
+                resto al terminar la iteración.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], path: Sequence[str] = ('data', 'stations')):
+        """
+        Inicializa el lector.
+
+        Args:
+            chunks: Fragmentos de bytes del documento (por ejemplo, resp.iter_content())
+            path: Claves que llevan desde la raíz hasta la lista a recorrer
+        """
+        self.path = tuple(path)
+        self.header: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+
+    # Gestión del buffer
+
+    def _fill(self) -> bool:
+        """
+        Añade el siguiente fragmento al buffer. Devuelve False si ya no hay más datos.
+        """
+        if self._exhausted:
+            return False
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._exhausted = True
+        return False
+
+    def _peek(self) -> str:
+        """
+        Salta los espacios y devuelve el siguiente carácter, o '' al final del documento.
+        """
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"JSON inesperado en la posición {self._pos}: se esperaba {char!r}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """
+        Decodifica el siguiente valor completo, leyendo más fragmentos si hace falta.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Un número al final del buffer puede continuar en el siguiente fragmento
+            if end == len(self._buffer) and not self._exhausted:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    # Recorrido del documento
+
+    def _walk_object(self, depth: int) -> Iterator[Any]:
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == self.path[depth]:
+                if depth == len(self.path) - 1:
+                    yield from self._walk_array()
+                else:
+                    yield from self._walk_object(depth + 1)
+            else:
+                value = self._value()
+                if depth == 0:
+                    self.header[key] = value
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"JSON inesperado en la posición {self._pos - 1}: {char!r}")
+
+    def _walk_array(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"JSON inesperado en la posición {self._pos - 1}: {char!r}")
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._walk_object(0)
+
+
+def iter_feed(url: str, path: Sequence[str] = ('data', 'stations'),
+              chunk_size: int = 16384) -> Optional[FeedStream]:
+    """
+    Realiza una petición GET en modo streaming y devuelve un FeedStream sobre la respuesta.
+
+    La conexión se cierra al terminar (o abandonar) la iteración.
+
+    Args:
+        url: URL del feed
+        path: Claves que llevan hasta la lista a recorrer
+        chunk_size: Tamaño de los fragmentos leídos de la conexión
+
+    Returns:
+        Optional[FeedStream]: Lector de la respuesta, o None si hay un error o el código no es 200
+    """
+    try:
+        resp = requests.get(url, stream=True)
+    except requests.exceptions.RequestException as e:
+        print(f"Error al realizar la petición: {e}")
+        return None
+    if resp.status_code != 200:
+        print(f"Error: La petición no fue exitosa. Código de estado: {resp.status_code}")
+        resp.close()
+        return None
+
+    def chunks():
+        try:
+            yield from resp.iter_content(chunk_size)
+        finally:
+            resp.close()
+
+    return FeedStream(chunks(), path)
+
+
+def iter_stations_status(url: str = STATION_STATUS_URL) -> Iterator[StationStatusInfo]:
+    """
+    Descarga station_status en streaming y entrega un StationStatusInfo por estación.
+
+    Si el documento está mal formado o la conexión se corta a mitad de la descarga,
+    se muestra el error y la iteración termina (como cuando falla la petición).
+
+    Args:
+        url: URL del endpoint station_status
+
+    Yields:
+        StationStatusInfo: Estado de cada estación, en el orden del feed
+    """
+    stream = iter_feed(url)
+    if stream is None:
+        return
+    try:
+        for station_data in stream:
+            yield StationStatusInfo(station_data)
+    except STREAM_ERRORS as e:
+        print(f"Error al leer station_status: {e}")
+
+
+def get_stations_status_table(url: str = STATION_STATUS_URL) -> Tuple[StationStatusTable, Optional[int]]:
+    """
+    Descarga station_status en streaming directamente a una StationStatusTable.
+
+    Ni el documento JSON ni los objetos StationStatusInfo se conservan: solo las
+    columnas compactas de la tabla.
+
+    Args:
+        url: URL del endpoint station_status
+
+    Returns:
+        Tuple[StationStatusTable, Optional[int]]: Tabla con las estaciones (vacía si hay
+                                                  error) y timestamp last_updated
+    """
+    table = StationStatusTable()
+    stream = iter_feed(url)
+    if stream is None:
+        return table, None
+    try:
+        for station_data in stream:
+            table.append(StationStatusInfo(station_data))
+    except STREAM_ERRORS as e:
+        # No se devuelve una tabla a medias
+        print(f"Error al leer station_status: {e}")
+        return StationStatusTable(), None
+    table.last_updated = stream.header.get('last_updated')
+    return table, table.last_updated
+
+
+def create_stations_dataframe_streaming(url: str = STATION_INFORMATION_URL):
+    """
+    Descarga station_information en streaming y construye el DataFrame de estaciones.
+
+    Devuelve el mismo DataFrame que ej1c2.create_stations_dataframe, pero los datos
+    se van añadiendo por columnas estación a estación en lugar de cargar primero
+    todo el documento y la lista de diccionarios.
+
+    Args:
+        url: URL del endpoint station_information
+
+    Returns:
+        pandas.DataFrame: DataFrame con una fila por estación ('lat'/'lon' renombradas
+                          a 'latitude'/'longitude'), o None si hay un error
+    """
+    import pandas as pd
+
+    stream = iter_feed(url)
+    if stream is None:
+        return None
+    columns: Dict[str, List[Any]] = {}
+    rows = 0
+    try:
+        for station in stream:
+            for key, value in station.items():
+                column = columns.get(key)
+                if column is None:
+                    # Columna nueva: las estaciones anteriores no tenían este campo
+                    column = columns[key] = [None] * rows
+                column.append(value)
+            rows += 1
+            for column in columns.values():
+                if len(column) < rows:
+                    column.append(None)
+    except STREAM_ERRORS as e:
+        print(f"Error al leer station_information: {e}")
+        return None
+    df_stations = pd.DataFrame(columns)
+    df_stations.rename(columns={'lat': 'latitude', 'lon': 'longitude'}, inplace=True)
+    return df_stations
+
+
+if __name__ == '__main__':
+    table, last_updated = get_stations_status_table()
+    print(f"Estaciones: {len(table)} (last_updated={last_updated}, {table.nbytes()} bytes en columnas)")
+    df = create_stations_dataframe_streaming()
+    if df is not None:
+        print(df.head())
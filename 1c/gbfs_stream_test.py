@@ -0,0 +1,169 @@
+"""
+Tests para gbfs_stream.py
+Este archivo contiene pruebas para verificar la lectura incremental de los feeds
+GBFS, fragmento a fragmento, y los constructores de StationStatusTable y DataFrame.
+"""
+
+import json
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from ej1c3 import StationStatusInfo
+from gbfs_stream import (
+    FeedStream, iter_stations_status, get_stations_status_table, create_stations_dataframe_streaming
+)
+
+
+@pytest.fixture
+def status_document():
+    """
+    Fixture que proporciona un documento station_status con casos difíciles para el lector
+    """
+    return {
+        "last_updated": 1759835019,
+        "ttl": 0,
+        "data": {
+            "other": {"stations": ["no es la lista buscada"]},
+            "stations": [
+                {
+                    "station_id": str(i),
+                    "name": "Pl. Catalunya {]\" ñ €",
+                    "num_bikes_available": 12345 + i,
+                    "status": "IN_SERVICE",
+                    "last_reported": 1759834959,
+                    "vehicle_types_available": [{"vehicle_type_id": "BOOST", "count": i}],
+                }
+                for i in range(20)
+            ],
+        },
+        "version": "2.3",
+    }
+
+
+def chunked(document, size):
+    data = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 100000])
+def test_feed_stream_matches_json(status_document, size):
+    """
+    Verificar que el lector devuelve los mismos elementos que json.loads con cualquier tamaño de fragmento
+    """
+    stream = FeedStream(chunked(status_document, size))
+    items = list(stream)
+
+    assert items == status_document["data"]["stations"], "Los elementos deben coincidir con el documento"
+    assert stream.header == {"last_updated": 1759835019, "ttl": 0, "version": "2.3"}, \
+        "Deben guardarse los campos del nivel superior"
+
+
+def test_feed_stream_is_lazy(status_document):
+    """
+    Verificar que el lector no consume todo el documento para entregar el primer elemento
+    """
+    chunks = chunked(status_document, 16)
+    consumed = []
+
+    def source():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    stream = FeedStream(source())
+    first = next(iter(stream))
+    assert first["station_id"] == "0"
+    assert stream.header["last_updated"] == 1759835019, "last_updated precede a la lista"
+    assert len(consumed) < len(chunks) / 2, "Solo deben leerse los fragmentos necesarios"
+
+
+def test_feed_stream_edge_cases():
+    assert list(FeedStream([b'{"data": {"stations": []}}'])) == [], "Una lista vacía no produce elementos"
+    assert list(FeedStream([b'{"data": {}}'])) == [], "Sin la lista no se producen elementos"
+    with pytest.raises(ValueError):
+        list(FeedStream([b'{"data": {"stations": [1 2]}}']))
+
+
+def _mock_stream_response(document, status_code=200):
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.iter_content.return_value = chunked(document, 50)
+    return mock_response
+
+
+@patch('gbfs_stream.requests.get')
+def test_iter_stations_status(mock_get, status_document):
+    """
+    Verificar que se descarga en streaming y se construyen objetos StationStatusInfo
+    """
+    mock_get.return_value = _mock_stream_response(status_document)
+
+    stations = list(iter_stations_status("http://localhost/station_status"))
+
+    mock_get.assert_called_once_with("http://localhost/station_status", stream=True)
+    assert len(stations) == 20 and all(isinstance(s, StationStatusInfo) for s in stations)
+    assert mock_get.return_value.close.called, "La conexión debe cerrarse al terminar"
+
+
+@patch('gbfs_stream.requests.get')
+def test_get_stations_status_table(mock_get, status_document):
+    mock_get.return_value = _mock_stream_response(status_document)
+
+    table, last_updated = get_stations_status_table()
+
+    assert len(table) == 20, "La tabla debe tener 20 filas"
+    assert last_updated == 1759835019
+    assert list(table.vehicle_types["BOOST"]) == list(range(20))
+
+
+@patch('gbfs_stream.requests.get')
+def test_errors(mock_get, status_document):
+    mock_get.return_value = _mock_stream_response(status_document, status_code=500)
+    assert create_stations_dataframe_streaming() is None, "Un código distinto de 200 devuelve None"
+
+    mock_get.side_effect = requests.exceptions.RequestException("Error de conexión")
+    table, last_updated = get_stations_status_table()
+    assert len(table) == 0 and last_updated is None, "Un error de conexión devuelve una tabla vacía"
+
+
+@patch('gbfs_stream.requests.get')
+def test_truncated_response(mock_get, status_document):
+    """
+    Verificar que un documento cortado o una conexión caída a mitad se tratan como errores
+    """
+    truncated = b"".join(chunked(status_document, 50))[:700]
+    mock_get.return_value = _mock_stream_response(status_document)
+    mock_get.return_value.iter_content.return_value = [truncated]
+    table, last_updated = get_stations_status_table()
+    assert len(table) == 0 and last_updated is None, "Un documento cortado devuelve una tabla vacía"
+    assert create_stations_dataframe_streaming() is None, "Un documento cortado devuelve None"
+    assert len(list(iter_stations_status())) < 20, "La iteración debe terminar sin excepción"
+
+    def dropped_connection(chunk_size):
+        yield truncated
+        raise requests.exceptions.ChunkedEncodingError("Conexión cortada")
+
+    mock_get.return_value.iter_content.side_effect = dropped_connection
+    table, last_updated = get_stations_status_table()
+    assert len(table) == 0 and last_updated is None, "Una conexión cortada devuelve una tabla vacía"
+    assert mock_get.return_value.close.called, "La conexión debe cerrarse también tras un error"
+
+
+@patch('gbfs_stream.requests.get')
+def test_create_stations_dataframe_streaming(mock_get):
+    """
+    Verificar que el DataFrame coincide con el de ej1c2, incluidos los campos opcionales
+    """
+    document = {"data": {"stations": [
+        {"station_id": "1", "name": "A", "lat": 41.39, "lon": 2.18},
+        {"station_id": "2", "name": "B", "lat": 41.40, "lon": 2.17, "capacity": 20},
+        {"station_id": "3", "name": "C", "lat": 41.41, "lon": 2.16},
+    ]}}
+    mock_get.return_value = _mock_stream_response(document)
+
+    df = create_stations_dataframe_streaming()
+
+    assert list(df.columns) == ["station_id", "name", "latitude", "longitude", "capacity"]
+    assert len(df) == 3
+    assert df["capacity"].isna().tolist() == [True, False, True], "Los campos ausentes deben quedar vacíos"
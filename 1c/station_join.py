@@ -0,0 +1,167 @@
+"""
+Unión de station_information (ej1c2) y station_status (ej1c3) en una única tabla.
+
+ej1c2 obtiene la información fija de las estaciones (nombre, coordenadas, capacidad)
+y ej1c3 su estado en tiempo real, pero hasta ahora quien necesitaba ambas cosas
+tenía que cruzarlas con bucles anidados por station_id. StationJoin descarga los
+dos feeds en paralelo y devuelve un DataFrame indexado por station_id con las
+columnas de ambos.
+
+Como station_information cambia muy poco, su mitad de la tabla se construye una vez
+y se reutiliza: en las siguientes llamadas a refresh() solo se descarga y se
+recalcula la parte de station_status, salvo que la información tenga más de
+information_max_age segundos.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from ej1c2 import get_stations_data
+from ej1c3 import BarcelonaBikingClient, StationStatusInfo, StationStatusSnapshot
+
+# Columnas de station_information que se incluyen en la tabla unida
+INFORMATION_COLUMNS = ['name', 'latitude', 'longitude', 'capacity', 'address', 'post_code']
+
+
+def information_dataframe(stations_data: Optional[Dict]) -> pd.DataFrame:
+    """
+    Construye la mitad fija de la tabla a partir de station_information.
+
+    Args:
+        stations_data: Datos de estaciones obtenidos con get_stations_data()
+
+    Returns:
+        pd.DataFrame: DataFrame indexado por station_id con INFORMATION_COLUMNS
+                      (las que existan en los datos)
+    """
+    stations = (stations_data or {}).get('stations') or []
+    df = pd.DataFrame(stations)
+    if df.empty:
+        return pd.DataFrame(columns=INFORMATION_COLUMNS, index=pd.Index([], name='station_id'))
+    df = df.rename(columns={'lat': 'latitude', 'lon': 'longitude'})
+    df['station_id'] = df['station_id'].astype(str)
+    columns = [column for column in INFORMATION_COLUMNS if column in df.columns]
+    return df.set_index('station_id')[columns]
+
+
+def status_dataframe(stations: List[StationStatusInfo]) -> pd.DataFrame:
+    """
+    Construye la mitad en tiempo real de la tabla a partir de station_status.
+
+    Args:
+        stations: Estaciones de una instantánea de station_status
+
+    Returns:
+        pd.DataFrame: DataFrame indexado por station_id con los contadores de la
+                      estación y una columna bikes_<tipo> por tipo de vehículo
+    """
+    columns: Dict[str, List[Any]] = {
+        'status': [station.status.name for station in stations],
+        'num_bikes_available': [station.num_bikes_available for station in stations],
+        'num_bikes_disabled': [station.num_bikes_disabled for station in stations],
+        'num_docks_available': [station.num_docks_available for station in stations],
+        'is_renting': [station.is_renting for station in stations],
+        'is_returning': [station.is_returning for station in stations],
+        'is_operational': [station.is_operational for station in stations],
+        'last_reported': [station.last_reported for station in stations],
+    }
+    by_type = [station.get_available_bikes_by_type() for station in stations]
+    for vehicle_type_id in sorted({vehicle_type_id for counts in by_type for vehicle_type_id in counts}):
+        columns[f'bikes_{vehicle_type_id}'] = [counts.get(vehicle_type_id, 0) for counts in by_type]
+    index = pd.Index([str(station.station_id) for station in stations], name='station_id')
+    return pd.DataFrame(columns, index=index)
+
+
+class StationJoin:
+    """
+    Tabla unida de station_information y station_status que se refresca por partes.
+
+    Atributos:
+        table: Último DataFrame unido (None hasta la primera llamada a refresh())
+        snapshot: Última instantánea de station_status utilizada
+    """
+
+    def __init__(self, client: Optional[BarcelonaBikingClient] = None,
+                 information_max_age: float = 3600.0, how: str = 'left'):
+        """
+        Inicializa la unión.
+
+        Args:
+            client: Cliente de station_status (por defecto, un BarcelonaBikingClient nuevo)
+            information_max_age: Segundos tras los que se vuelve a descargar station_information
+            how: Tipo de unión de pandas ('left' conserva todas las estaciones de
+                 station_information, 'inner' solo las que tienen estado, ...)
+        """
+        self.client = client or BarcelonaBikingClient()
+        self.information_max_age = information_max_age
+        self.how = how
+        self.table: Optional[pd.DataFrame] = None
+        self.snapshot: Optional[StationStatusSnapshot] = None
+        self._information: Optional[pd.DataFrame] = None
+        self._information_fetched_at: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="station-join")
+
+    def _information_is_fresh(self) -> bool:
+        # Sin una descarga correcta (_information_fetched_at is None) nunca está al día
+        return (self._information_fetched_at is not None
+                and time.monotonic() - self._information_fetched_at < self.information_max_age)
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Descarga los feeds necesarios y recalcula la tabla unida.
+
+        station_information y station_status se descargan en paralelo cuando hacen
+        falta los dos; si la información está al día solo se descarga el estado.
+
+        Returns:
+            pd.DataFrame: Tabla unida indexada por station_id
+        """
+        status_future = self._executor.submit(self.client.get_snapshot, 0)
+        if not self._information_is_fresh():
+            stations_data = self._executor.submit(get_stations_data).result()
+            if stations_data:
+                self._information = information_dataframe(stations_data)
+                self._information_fetched_at = time.monotonic()
+            elif self._information is None:
+                # Sin información anterior se une con una tabla vacía, pero sin marcarla
+                # como descargada: el siguiente refresco vuelve a intentarlo
+                self._information = information_dataframe(None)
+            # Si la descarga falla y hay información anterior, se conserva
+        self.snapshot = status_future.result()
+
+        status = status_dataframe(self.snapshot.stations)
+        self.table = self._information.join(status, how=self.how)
+        return self.table
+
+    def get_station(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve la fila de una estación de la última tabla como diccionario.
+
+        Args:
+            station_id: ID de la estación
+
+        Returns:
+            Optional[Dict[str, Any]]: Columnas de la estación, o None si no existe
+        """
+        if self.table is None or station_id not in self.table.index:
+            return None
+        return self.table.loc[station_id].to_dict()
+
+    def close(self) -> None:
+        """
+        Libera los hilos utilizados para las descargas en paralelo.
+        """
+        self._executor.shutdown(wait=False)
+
+
+if __name__ == '__main__':
+    join = StationJoin()
+    table = join.refresh()
+    print(table.head())
+    print(f"\nTotal de estaciones: {len(table)}")
+    print(f"Bicicletas disponibles: {int(table['num_bikes_available'].sum())} "
+          f"en {int(table['capacity'].sum())} plazas")
+    join.close()
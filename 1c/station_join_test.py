@@ -0,0 +1,123 @@
+"""
+Tests para station_join.py
+Este archivo contiene pruebas para verificar la unión de station_information y
+station_status en una única tabla indexada por station_id.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from ej1c3 import StationStatusInfo, StationStatusSnapshot
+from station_join import StationJoin, information_dataframe, status_dataframe
+
+
+@pytest.fixture
+def stations_data():
+    """
+    Fixture que proporciona los datos de station_information
+    """
+    return {"stations": [
+        {"station_id": "1", "name": "GRAN VIA CORTS CATALANES, 760", "lat": 41.3979779, "lon": 2.1801069,
+         "capacity": 46, "address": "GRAN VIA CORTS CATALANES, 760", "post_code": "08013"},
+        {"station_id": "2", "name": "C/ ROGER DE FLOR, 126", "lat": 41.3954877, "lon": 2.1771985,
+         "capacity": 29, "address": "C/ ROGER DE FLOR, 126", "post_code": "08013"},
+    ]}
+
+
+def make_snapshot(bikes):
+    return StationStatusSnapshot([
+        StationStatusInfo({
+            "station_id": "1", "status": "IN_SERVICE", "is_renting": True, "is_returning": True,
+            "num_bikes_available": bikes, "num_bikes_disabled": 1, "num_docks_available": 46 - bikes,
+            "last_reported": 1759834959,
+            "vehicle_types_available": [{"vehicle_type_id": "BOOST", "count": 3},
+                                        {"vehicle_type_id": "ICONIC", "count": bikes - 3}],
+        }),
+        StationStatusInfo({"station_id": "9", "status": "MAINTENANCE", "num_bikes_available": 0}),
+    ], 1759835019)
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.get_snapshot.side_effect = [make_snapshot(12), make_snapshot(10), make_snapshot(8)]
+    return client
+
+
+def test_information_and_status_dataframes(stations_data):
+    info = information_dataframe(stations_data)
+    assert list(info.index) == ["1", "2"]
+    assert list(info.columns) == ["name", "latitude", "longitude", "capacity", "address", "post_code"]
+
+    status = status_dataframe(make_snapshot(12).stations)
+    assert status.loc["1", "bikes_ICONIC"] == 9, "Debe haber una columna por tipo de vehículo"
+    assert status.loc["9", "bikes_BOOST"] == 0, "Los tipos ausentes cuentan como 0"
+    assert information_dataframe(None).empty, "Sin datos debe devolver un DataFrame vacío"
+
+
+@patch('station_join.get_stations_data')
+def test_refresh_joins_both_feeds(mock_get_stations_data, client, stations_data):
+    """
+    Verificar que la tabla unida contiene las columnas de ambos feeds
+    """
+    mock_get_stations_data.return_value = stations_data
+    join = StationJoin(client)
+
+    table = join.refresh()
+
+    assert list(table.index) == ["1", "2"], "La unión 'left' conserva las estaciones de station_information"
+    assert table.loc["1", "capacity"] == 46 and table.loc["1", "num_bikes_available"] == 12
+    assert table.loc["1", "is_operational"], "Debe incluir si la estación está operativa"
+    assert join.get_station("1")["name"] == "GRAN VIA CORTS CATALANES, 760"
+    assert join.get_station("999") is None
+    join.close()
+
+
+@patch('station_join.get_stations_data')
+def test_refresh_only_recomputes_status(mock_get_stations_data, client, stations_data):
+    """
+    Verificar que station_information solo se descarga de nuevo cuando caduca
+    """
+    mock_get_stations_data.return_value = stations_data
+    join = StationJoin(client, information_max_age=3600)
+
+    join.refresh()
+    table = join.refresh()
+    assert mock_get_stations_data.call_count == 1, "station_information solo debe descargarse una vez"
+    assert client.get_snapshot.call_count == 2, "station_status debe descargarse en cada refresco"
+    assert table.loc["1", "num_bikes_available"] == 10, "Debe usarse el estado más reciente"
+
+    join.information_max_age = 0
+    join.refresh()
+    assert mock_get_stations_data.call_count == 2, "Al caducar debe volver a descargarse"
+    join.close()
+
+
+@patch('station_join.get_stations_data')
+def test_information_error_keeps_previous(mock_get_stations_data, client, stations_data):
+    mock_get_stations_data.side_effect = [stations_data, None]
+    join = StationJoin(client, information_max_age=0, how='inner')
+
+    join.refresh()
+    table = join.refresh()
+    assert list(table.index) == ["1"], "Con 'inner' solo quedan las estaciones con estado e información"
+    assert table.loc["1", "name"] == "GRAN VIA CORTS CATALANES, 760", "Debe conservarse la información anterior"
+    join.close()
+
+
+@patch('station_join.get_stations_data')
+def test_first_information_error_retries(mock_get_stations_data, client, stations_data):
+    """
+    Verificar que si la primera descarga de station_information falla se reintenta en el siguiente refresco
+    """
+    mock_get_stations_data.side_effect = [None, stations_data]
+    join = StationJoin(client, information_max_age=3600)
+
+    table = join.refresh()
+    assert table.empty, "Sin station_information la unión 'left' queda vacía"
+
+    table = join.refresh()
+    assert mock_get_stations_data.call_count == 2, "Una descarga fallida no debe contar como reciente"
+    assert list(table.index) == ["1", "2"]
+    assert table.loc["1", "num_bikes_available"] == 10
+    join.close()
@@ -0,0 +1,303 @@
+"""
+Sondeo continuo del feed station_status dentro de un único proceso.
+
+En lugar de ejecutar ej1c3 desde cron cada minuto, StationStatusPoller mantiene un
+BarcelonaBikingClient vivo en un hilo, programa cada descarga según el campo ttl
+del feed y reparte cada nueva instantánea entre los suscriptores. Cada suscriptor
+tiene un buffer acotado con su propia política de desbordamiento, de modo que un
+consumidor lento nunca bloquea al sondeo ni al resto de consumidores.
+
+Uso:
+    poller = StationStatusPoller()
+    subscription = poller.subscribe(maxsize=1, policy=OverflowPolicy.COALESCE)
+    poller.start()
+    snapshot = subscription.get(timeout=120)
+"""
+
+import enum
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from ej1c3 import BarcelonaBikingClient, StationStatusSnapshot
+
+
+class OverflowPolicy(enum.Enum):
+    """
+    Qué hacer cuando llega una instantánea y el buffer del suscriptor está lleno.
+    """
+    DROP_OLDEST = 1     # Se descarta la instantánea más antigua del buffer
+    DROP_NEWEST = 2     # Se descarta la instantánea que acaba de llegar
+    COALESCE = 3        # El buffer guarda solo la instantánea más reciente
+
+
+class Subscription:
+    """
+    Buffer acotado de instantáneas para un consumidor.
+
+    Atributos:
+        maxsize: Número máximo de instantáneas pendientes
+        policy: Política de desbordamiento (OverflowPolicy)
+        dropped: Número de instantáneas descartadas por desbordamiento
+    """
+
+    def __init__(self, maxsize: int = 10, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        """
+        Inicializa el buffer.
+
+        Args:
+            maxsize: Número máximo de instantáneas pendientes (con COALESCE siempre es 1)
+            policy: Política de desbordamiento
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize debe ser al menos 1")
+        self.maxsize = 1 if policy == OverflowPolicy.COALESCE else maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._buffer: deque = deque()
+        self._not_empty = threading.Condition()
+
+    def put(self, snapshot: StationStatusSnapshot) -> bool:
+        """
+        Añade una instantánea sin bloquear nunca al productor.
+
+        Args:
+            snapshot: Instantánea a entregar
+
+        Returns:
+            bool: True si la instantánea ha quedado en el buffer
+        """
+        with self._not_empty:
+            accepted = True
+            if len(self._buffer) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == OverflowPolicy.DROP_NEWEST:
+                    accepted = False
+                else:
+                    self._buffer.popleft()
+            if accepted:
+                self._buffer.append(snapshot)
+                self._not_empty.notify()
+            return accepted
+
+    def get(self, timeout: Optional[float] = None) -> Optional[StationStatusSnapshot]:
+        """
+        Devuelve la instantánea pendiente más antigua, esperando si no hay ninguna.
+
+        Args:
+            timeout: Segundos máximos de espera; None espera indefinidamente
+
+        Returns:
+            Optional[StationStatusSnapshot]: La instantánea, o None si vence el timeout
+        """
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._buffer, timeout):
+                return None
+            return self._buffer.popleft()
+
+    def __len__(self) -> int:
+        with self._not_empty:
+            return len(self._buffer)
+
+
+class StationStatusPoller:
+    """
+    Descarga periódicamente station_status y publica las instantáneas nuevas.
+
+    El intervalo entre descargas es el ttl indicado por el feed, limitado entre
+    min_interval y max_interval; si el feed no indica ttl (o vale 0) se usa
+    default_interval. Tras un error el intervalo se duplica hasta max_interval.
+
+    Cada descarga tiene un timeout (por defecto, la mitad de default_interval): un
+    servidor que no responde cuenta como un error más en lugar de bloquear el hilo
+    del sondeo indefinidamente.
+    """
+
+    def __init__(self, client: Optional[BarcelonaBikingClient] = None, min_interval: float = 5.0,
+                 max_interval: float = 300.0, default_interval: float = 60.0,
+                 fetch_timeout: Optional[float] = None):
+        """
+        Inicializa el poller.
+
+        Args:
+            client: Cliente a utilizar (por defecto, un BarcelonaBikingClient nuevo)
+            min_interval: Intervalo mínimo entre descargas, en segundos
+            max_interval: Intervalo máximo entre descargas, en segundos
+            default_interval: Intervalo cuando el feed no indica ttl, en segundos
+            fetch_timeout: Timeout de cada descarga, en segundos (por defecto, el del
+                           cliente o, si no tiene, la mitad de default_interval)
+        """
+        self.client = client or BarcelonaBikingClient()
+        if fetch_timeout is None:
+            # El timeout se pasa en cada descarga: el cliente puede estar compartido
+            # y no se modifica
+            client_timeout = getattr(self.client, 'timeout', None)
+            fetch_timeout = client_timeout if isinstance(client_timeout, (int, float)) else default_interval / 2
+        self.fetch_timeout = fetch_timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.latest: Optional[StationStatusSnapshot] = None
+
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error_delay = 0.0
+
+        # Métricas
+        self._polls = 0
+        self._errors = 0
+        self._published = 0
+        self._unchanged = 0
+        # Instantáneas descartadas por suscriptores ya eliminados
+        self._dropped_removed = 0
+        self._latency_last: Optional[float] = None
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._lag_last: Optional[float] = None
+
+    def subscribe(self, maxsize: int = 10,
+                  policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST) -> Subscription:
+        """
+        Registra un nuevo suscriptor.
+
+        Args:
+            maxsize: Tamaño máximo de su buffer
+            policy: Política de desbordamiento
+
+        Returns:
+            Subscription: Buffer del que leer las instantáneas
+        """
+        subscription = Subscription(maxsize, policy)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Elimina un suscriptor; deja de recibir instantáneas.
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                self._dropped_removed += subscription.dropped
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def poll_once(self) -> float:
+        """
+        Realiza una descarga, publica la instantánea si es nueva y actualiza las métricas.
+
+        Returns:
+            float: Segundos a esperar hasta la siguiente descarga
+        """
+        start = time.perf_counter()
+        snapshot = self.client.get_snapshot(max_age=0, timeout=self.fetch_timeout)
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            self._polls += 1
+            self._latency_last = latency
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            if not snapshot.stations:
+                self._errors += 1
+                self._error_delay = self._clamp(max(self._error_delay * 2, self.min_interval))
+                return self._error_delay
+            self._error_delay = 0.0
+            if snapshot.last_updated is not None:
+                self._lag_last = time.time() - snapshot.last_updated
+
+            previous = self.latest
+            self.latest = snapshot
+            is_new = previous is None or snapshot.last_updated is None \
+                or snapshot.last_updated != previous.last_updated
+            if is_new:
+                self._published += 1
+                subscriptions = list(self._subscriptions)
+            else:
+                self._unchanged += 1
+                subscriptions = []
+
+        for subscription in subscriptions:
+            subscription.put(snapshot)
+
+        ttl = snapshot.ttl
+        return self._clamp(ttl if ttl else self.default_interval)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                delay = self.poll_once()
+            except Exception as e:
+                # El hilo no debe morir por un error inesperado del cliente
+                print(f"Error en el sondeo de station_status: {e}")
+                with self._lock:
+                    self._errors += 1
+                delay = self.max_interval
+            self._stop.wait(delay)
+
+    def start(self) -> None:
+        """
+        Arranca el sondeo en un hilo en segundo plano.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="station-status-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el sondeo y espera a que termine el hilo.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Devuelve las métricas acumuladas del sondeo.
+
+        Returns:
+            Dict[str, Any]: Diccionario con:
+                - polls, errors: Número de descargas y de descargas fallidas
+                - published, unchanged: Instantáneas publicadas y repetidas (mismo last_updated)
+                - fetch_latency_last/avg/max: Latencia de descarga y parseo, en segundos
+                - lag: Segundos entre last_updated del feed y la descarga más reciente
+                - dropped: Instantáneas descartadas por todos los suscriptores
+                - subscribers: Número de suscriptores
+        """
+        with self._lock:
+            return {
+                'polls': self._polls,
+                'errors': self._errors,
+                'published': self._published,
+                'unchanged': self._unchanged,
+                'fetch_latency_last': self._latency_last,
+                'fetch_latency_avg': self._latency_total / self._polls if self._polls else None,
+                'fetch_latency_max': self._latency_max,
+                'lag': self._lag_last,
+                'dropped': self._dropped_removed + sum(subscription.dropped
+                                                       for subscription in self._subscriptions),
+                'subscribers': len(self._subscriptions),
+            }
+
+
+if __name__ == "__main__":
+    poller = StationStatusPoller()
+    subscription = poller.subscribe(maxsize=1, policy=OverflowPolicy.COALESCE)
+    poller.start()
+    print("Sondeando station_status (Ctrl+C para terminar)...")
+    try:
+        while True:
+            snapshot = subscription.get()
+            metrics = poller.metrics()
+            print(f"{len(snapshot)} estaciones, last_updated={snapshot.last_updated}, "
+                  f"latencia={metrics['fetch_latency_last']:.3f}s, lag={metrics['lag']}")
+    except KeyboardInterrupt:
+        poller.stop()
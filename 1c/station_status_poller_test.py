@@ -0,0 +1,146 @@
+"""
+Tests para station_status_poller.py
+Este archivo contiene pruebas para verificar el sondeo continuo de station_status,
+la programación según el ttl y las políticas de desbordamiento de los suscriptores.
+"""
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from ej1c3 import BarcelonaBikingClient, StationStatusSnapshot, StationStatusInfo
+from station_status_poller import OverflowPolicy, Subscription, StationStatusPoller
+
+
+def make_snapshot(last_updated, ttl=30):
+    station = StationStatusInfo({"station_id": "1", "status": "IN_SERVICE", "num_bikes_available": 3})
+    return StationStatusSnapshot([station], last_updated, ttl=ttl)
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture que proporciona un cliente simulado que devuelve instantáneas consecutivas
+    """
+    client = MagicMock()
+    client.get_snapshot.side_effect = [make_snapshot(100), make_snapshot(100), make_snapshot(130)]
+    return client
+
+
+class TestSubscription:
+    """
+    Pruebas para las políticas de desbordamiento de Subscription
+    """
+
+    def test_drop_oldest(self):
+        subscription = Subscription(maxsize=2, policy=OverflowPolicy.DROP_OLDEST)
+        for item in (1, 2, 3):
+            subscription.put(item)
+        assert subscription.dropped == 1, "Debe descartarse una instantánea"
+        assert subscription.get(timeout=0) == 2, "Debe haberse descartado la más antigua"
+        assert subscription.get(timeout=0) == 3
+
+    def test_drop_newest(self):
+        subscription = Subscription(maxsize=2, policy=OverflowPolicy.DROP_NEWEST)
+        results = [subscription.put(item) for item in (1, 2, 3)]
+        assert results == [True, True, False], "La última instantánea no debe aceptarse"
+        assert subscription.get(timeout=0) == 1, "Deben conservarse las más antiguas"
+
+    def test_coalesce(self):
+        subscription = Subscription(maxsize=5, policy=OverflowPolicy.COALESCE)
+        for item in (1, 2, 3):
+            subscription.put(item)
+        assert len(subscription) == 1, "COALESCE solo guarda una instantánea"
+        assert subscription.get(timeout=0) == 3, "Debe conservarse la más reciente"
+
+    def test_get_timeout(self):
+        subscription = Subscription()
+        assert subscription.get(timeout=0.01) is None, "Sin datos debe devolver None al vencer el timeout"
+
+
+class TestStationStatusPoller:
+    """
+    Pruebas para StationStatusPoller
+    """
+
+    def test_poll_once_publishes_new_snapshots(self, client):
+        """
+        Verificar que solo se publican las instantáneas con un last_updated nuevo
+        """
+        poller = StationStatusPoller(client, min_interval=5, max_interval=300)
+        subscription = poller.subscribe()
+
+        delays = [poller.poll_once() for _ in range(3)]
+
+        assert delays == [30, 30, 30], "El intervalo debe seguir el ttl del feed"
+        assert [subscription.get(timeout=0).last_updated for _ in range(2)] == [100, 130], \
+            "Deben publicarse solo las instantáneas nuevas"
+        metrics = poller.metrics()
+        assert metrics['polls'] == 3 and metrics['published'] == 2 and metrics['unchanged'] == 1
+        assert metrics['fetch_latency_max'] >= 0, "Debe medirse la latencia"
+        assert metrics['lag'] is not None, "Debe calcularse el retraso respecto a last_updated"
+
+    def test_interval_is_clamped(self):
+        """
+        Verificar que el ttl se limita entre min_interval y max_interval
+        """
+        client = MagicMock()
+        client.get_snapshot.side_effect = [make_snapshot(1, ttl=0), make_snapshot(2, ttl=1),
+                                           make_snapshot(3, ttl=1000)]
+        poller = StationStatusPoller(client, min_interval=5, max_interval=120, default_interval=60)
+
+        assert [poller.poll_once() for _ in range(3)] == [60, 5, 120]
+
+    def test_errors_back_off(self):
+        """
+        Verificar que los errores duplican el intervalo hasta max_interval
+        """
+        client = MagicMock()
+        client.get_snapshot.return_value = StationStatusSnapshot([], None)
+        poller = StationStatusPoller(client, min_interval=5, max_interval=15)
+
+        assert [poller.poll_once() for _ in range(4)] == [5, 10, 15, 15]
+        assert poller.metrics()['errors'] == 4, "Deben contarse los errores"
+
+    def test_fetch_timeout(self):
+        """
+        Verificar que las descargas tienen timeout y que un servidor colgado cuenta como error
+        """
+        client = BarcelonaBikingClient()
+        poller = StationStatusPoller(client, min_interval=5, default_interval=60)
+        assert poller.fetch_timeout == 30, "Sin timeout explícito se usa la mitad de default_interval"
+        assert client.timeout is None, "El cliente que se pasa al poller no debe modificarse"
+        assert StationStatusPoller(BarcelonaBikingClient(timeout=3)).fetch_timeout == 3, \
+            "Debe respetarse el timeout del cliente"
+
+        with patch('ej1c3.requests.get', side_effect=requests.exceptions.Timeout) as mock_get:
+            assert poller.poll_once() == 5, "El timeout debe tratarse como un error"
+        assert mock_get.call_args.kwargs['timeout'] == 30, "La descarga debe llevar timeout"
+        assert poller.metrics()['errors'] == 1
+
+    def test_dropped_survives_unsubscribe(self, client):
+        """
+        Verificar que las instantáneas descartadas se siguen contando tras eliminar el suscriptor
+        """
+        poller = StationStatusPoller(client)
+        subscription = poller.subscribe(maxsize=1, policy=OverflowPolicy.DROP_NEWEST)
+        for _ in range(3):
+            poller.poll_once()
+        assert poller.metrics()['dropped'] == 1
+
+        poller.unsubscribe(subscription)
+        assert poller.metrics()['dropped'] == 1, "El total no debe perder los descartes del suscriptor"
+        assert poller.metrics()['subscribers'] == 0
+
+    def test_background_thread(self, client):
+        """
+        Verificar que el hilo en segundo plano entrega instantáneas a los suscriptores
+        """
+        poller = StationStatusPoller(client)
+        subscription = poller.subscribe(maxsize=1, policy=OverflowPolicy.COALESCE)
+        poller.start()
+        try:
+            snapshot = subscription.get(timeout=2)
+        finally:
+            poller.stop(timeout=2)
+        assert snapshot is not None and snapshot.last_updated == 100, "Debe recibirse la primera instantánea"
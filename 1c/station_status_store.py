@@ -0,0 +1,343 @@
+"""
+Almacén local de solo anexado para el histórico de station_status.
+
+BarcelonaBikingClient solo devuelve el estado actual de las estaciones. Este módulo
+guarda cada instantánea en ficheros de segmento columnares dentro de un directorio:
+
+- Las instantáneas se acumulan en memoria y, cada snapshots_per_segment instantáneas
+  (o al llamar a flush()), se escriben en un segmento nuevo que nunca se modifica.
+- Dentro de un segmento los datos se agrupan por estación y, para cada estación, por
+  columna (timestamp, last_reported, bicicletas, anclajes y cantidad por tipo).
+- Cada columna se guarda con codificación delta + zigzag + varint, de modo que las
+  series que cambian poco ocupan aproximadamente un byte por valor.
+- Los campos ausentes se guardan como -1, también la cantidad de los tipos de
+  vehículo que una estación no lista (distinta de un tipo listado con 0).
+- El nombre del fichero contiene el rango de timestamps del segmento y el final del
+  fichero contiene un directorio con la posición de cada estación. Las lecturas
+  usan mmap y solo decodifican el bloque de la estación consultada en los
+  segmentos que se solapan con el intervalo pedido.
+
+Formato de un segmento:
+    MAGIC | bloques de estaciones | directorio JSON | longitud del directorio (8 bytes) | MAGIC
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ej1c3 import StationStatusInfo, StationStatusSnapshot
+
+MAGIC = b"GBFSSEG1"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".bin"
+# Valor con el que se guardan los campos ausentes (None)
+MISSING = -1
+
+
+class StationStatusRecord(NamedTuple):
+    """
+    Estado de una estación en una instantánea almacenada.
+    """
+    timestamp: int
+    last_reported: Optional[int]
+    num_bikes_available: Optional[int]
+    num_docks_available: Optional[int]
+    vehicle_types: Dict[str, int]
+
+
+def _encode_column(values: Iterable[int], out: bytearray) -> None:
+    """
+    Añade a out una columna de enteros con codificación delta + zigzag + varint.
+    """
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        zigzag = (delta << 1) ^ (delta >> 63)
+        while zigzag >= 0x80:
+            out.append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        out.append(zigzag)
+
+
+def _decode_column(buffer, pos: int, count: int) -> Tuple[List[int], int]:
+    """
+    Decodifica count valores de una columna a partir de la posición pos.
+
+    Returns:
+        Tuple[List[int], int]: Valores decodificados y posición siguiente a la columna
+    """
+    values = []
+    previous = 0
+    for _ in range(count):
+        shift = 0
+        zigzag = 0
+        while True:
+            byte = buffer[pos]
+            pos += 1
+            zigzag |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += (zigzag >> 1) ^ -(zigzag & 1)
+        values.append(previous)
+    return values, pos
+
+
+def _optional(value: int) -> Optional[int]:
+    return None if value == MISSING else value
+
+
+class _Segment:
+    """
+    Segmento escrito en disco, abierto con mmap.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC or self._mmap[-len(MAGIC):] != MAGIC:
+            raise ValueError(f"Segmento corrupto: {path}")
+        footer_end = len(self._mmap) - len(MAGIC) - 8
+        (footer_length,) = struct.unpack("<Q", self._mmap[footer_end:footer_end + 8])
+        directory = json.loads(self._mmap[footer_end - footer_length:footer_end])
+        self.start: int = directory["start"]
+        self.end: int = directory["end"]
+        self.vehicle_types: List[str] = directory["vehicle_types"]
+        # station_id -> (posición del bloque, número de filas)
+        self.stations: Dict[str, Tuple[int, int]] = {
+            station_id: tuple(entry) for station_id, entry in directory["stations"].items()
+        }
+
+    def read(self, station_id: str, t1: int, t2: int) -> List[StationStatusRecord]:
+        entry = self.stations.get(station_id)
+        if entry is None:
+            return []
+        pos, count = entry
+        timestamps, pos = _decode_column(self._mmap, pos, count)
+        first = bisect.bisect_left(timestamps, t1)
+        last = bisect.bisect_right(timestamps, t2)
+        if first >= last:
+            return []
+        columns = []
+        for _ in range(3 + len(self.vehicle_types)):
+            column, pos = _decode_column(self._mmap, pos, count)
+            columns.append(column)
+        last_reported, bikes, docks = columns[:3]
+        type_columns = list(zip(self.vehicle_types, columns[3:]))
+        return [
+            StationStatusRecord(
+                timestamps[row],
+                _optional(last_reported[row]),
+                _optional(bikes[row]),
+                _optional(docks[row]),
+                {vehicle_type: counts[row] for vehicle_type, counts in type_columns
+                 if counts[row] != MISSING},
+            )
+            for row in range(first, last)
+        ]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class StationStatusStore:
+    """
+    Almacén de series temporales de station_status en un directorio local.
+    """
+
+    def __init__(self, directory: str, snapshots_per_segment: int = 60):
+        """
+        Abre (o crea) el almacén.
+
+        Args:
+            directory: Directorio donde se guardan los segmentos
+            snapshots_per_segment: Instantáneas que se acumulan antes de escribir un segmento
+        """
+        self.directory = directory
+        self.snapshots_per_segment = snapshots_per_segment
+        os.makedirs(directory, exist_ok=True)
+        self._segments: List[_Segment] = []
+        for name in sorted(os.listdir(directory)):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                self._segments.append(_Segment(os.path.join(directory, name)))
+        self._segments.sort(key=lambda segment: segment.start)
+        # Instantáneas pendientes de escribir: station_id -> lista de filas
+        self._pending: Dict[str, List[Tuple[int, int, int, int, Dict[str, int]]]] = {}
+        self._pending_snapshots = 0
+        self._pending_start: Optional[int] = None
+        self._pending_end: Optional[int] = None
+        self._last_timestamp = max((segment.end for segment in self._segments), default=None)
+
+    def append(self, stations: Iterable[StationStatusInfo], timestamp: int) -> None:
+        """
+        Añade una instantánea al almacén.
+
+        Args:
+            stations: Estaciones de la instantánea
+            timestamp: Timestamp de la instantánea (last_updated del feed)
+
+        Raises:
+            ValueError: Si el timestamp no es posterior al de la última instantánea guardada
+        """
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            raise ValueError(f"El almacén es de solo anexado: {timestamp} <= {self._last_timestamp}")
+        self._last_timestamp = timestamp
+        if self._pending_start is None:
+            self._pending_start = timestamp
+        self._pending_end = timestamp
+        for station in stations:
+            self._pending.setdefault(station.station_id, []).append((
+                timestamp,
+                MISSING if station.last_reported is None else station.last_reported,
+                MISSING if station.num_bikes_available is None else station.num_bikes_available,
+                MISSING if station.num_docks_available is None else station.num_docks_available,
+                station.get_available_bikes_by_type(),
+            ))
+        self._pending_snapshots += 1
+        if self._pending_snapshots >= self.snapshots_per_segment:
+            self.flush()
+
+    def append_snapshot(self, snapshot: StationStatusSnapshot) -> None:
+        """
+        Añade una StationStatusSnapshot (por ejemplo, la publicada por StationStatusPoller).
+
+        Raises:
+            ValueError: Si la instantánea no tiene last_updated o no es posterior a la última
+        """
+        if snapshot.last_updated is None:
+            raise ValueError("La instantánea no tiene last_updated: no se puede almacenar")
+        self.append(snapshot.stations, snapshot.last_updated)
+
+    def flush(self) -> Optional[str]:
+        """
+        Escribe las instantáneas pendientes en un segmento nuevo.
+
+        Returns:
+            Optional[str]: Ruta del segmento escrito, o None si no había nada pendiente
+
+        Raises:
+            FileExistsError: Si ya existe un segmento con el mismo rango de timestamps
+        """
+        if not self._pending_snapshots:
+            return None
+        vehicle_types = sorted({
+            vehicle_type
+            for rows in self._pending.values()
+            for row in rows
+            for vehicle_type in row[4]
+        })
+        data = bytearray(MAGIC)
+        directory = {}
+        for station_id, rows in self._pending.items():
+            directory[station_id] = (len(data), len(rows))
+            for column in range(4):
+                _encode_column((row[column] for row in rows), data)
+            for vehicle_type in vehicle_types:
+                # Un tipo que la estación no lista se distingue de uno listado con 0
+                _encode_column((row[4].get(vehicle_type, MISSING) for row in rows), data)
+        footer = json.dumps({
+            "start": self._pending_start,
+            "end": self._pending_end,
+            "vehicle_types": vehicle_types,
+            "stations": directory,
+        }, separators=(",", ":")).encode()
+        data += footer
+        data += struct.pack("<Q", len(footer))
+        data += MAGIC
+
+        name = f"{SEGMENT_PREFIX}{self._pending_start:012d}-{self._pending_end:012d}{SEGMENT_SUFFIX}"
+        path = os.path.join(self.directory, name)
+        # Escritura atómica: un lector nunca ve un segmento a medias. os.link, a
+        # diferencia de os.replace, falla si el destino existe, así que un segmento
+        # escrito nunca se sobrescribe
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        try:
+            os.link(tmp_path, path)
+        finally:
+            os.remove(tmp_path)
+        self._segments.append(_Segment(path))
+
+        self._pending = {}
+        self._pending_snapshots = 0
+        self._pending_start = self._pending_end = None
+        return path
+
+    def query(self, station_id: str, t1: int, t2: int) -> List[StationStatusRecord]:
+        """
+        Devuelve el estado de una estación en las instantáneas con timestamp entre t1 y t2.
+
+        Solo se leen los segmentos cuyo rango se solapa con [t1, t2] y, dentro de
+        ellos, solo el bloque de la estación pedida.
+
+        Args:
+            station_id: ID de la estación
+            t1: Timestamp inicial (incluido)
+            t2: Timestamp final (incluido)
+
+        Returns:
+            List[StationStatusRecord]: Registros ordenados por timestamp
+        """
+        records = []
+        for segment in self._segments:
+            if segment.end >= t1 and segment.start <= t2:
+                records.extend(segment.read(station_id, t1, t2))
+        for row in self._pending.get(station_id, []):
+            if t1 <= row[0] <= t2:
+                records.append(StationStatusRecord(
+                    row[0], _optional(row[1]), _optional(row[2]), _optional(row[3]), dict(row[4])
+                ))
+        return records
+
+    def segment_paths(self) -> List[str]:
+        """
+        Devuelve las rutas de los segmentos escritos, ordenados por tiempo.
+        """
+        return [segment.path for segment in self._segments]
+
+    def close(self) -> None:
+        """
+        Escribe las instantáneas pendientes y libera los mmap de los segmentos.
+        """
+        self.flush()
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def __enter__(self) -> 'StationStatusStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from station_status_poller import OverflowPolicy, StationStatusPoller
+
+    # Guarda el histórico de station_status en el directorio indicado (por defecto ./history)
+    directory = sys.argv[1] if len(sys.argv) > 1 else "history"
+    poller = StationStatusPoller()
+    subscription = poller.subscribe(maxsize=100, policy=OverflowPolicy.DROP_OLDEST)
+    poller.start()
+    print(f"Guardando instantáneas en {directory} (Ctrl+C para terminar)...")
+    with StationStatusStore(directory) as store:
+        try:
+            while True:
+                snapshot = subscription.get()
+                try:
+                    store.append_snapshot(snapshot)
+                except ValueError as e:
+                    print(f"{time.strftime('%H:%M:%S')} instantánea ignorada: {e}")
+                    continue
+                print(f"{time.strftime('%H:%M:%S')} guardada instantánea {snapshot.last_updated}")
+        except KeyboardInterrupt:
+            poller.stop()
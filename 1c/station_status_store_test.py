@@ -0,0 +1,135 @@
+"""
+Tests para station_status_store.py
+Este archivo contiene pruebas para verificar el almacén de series temporales de
+station_status: codificación de columnas, escritura de segmentos y consultas por rango.
+"""
+
+import os
+import pytest
+
+from ej1c3 import StationStatusInfo, StationStatusSnapshot
+from station_status_store import (
+    StationStatusStore, StationStatusRecord, _encode_column, _decode_column
+)
+
+
+def make_station(station_id, bikes, docks, last_reported, boost=0):
+    return StationStatusInfo({
+        "station_id": station_id,
+        "status": "IN_SERVICE",
+        "num_bikes_available": bikes,
+        "num_docks_available": docks,
+        "last_reported": last_reported,
+        "vehicle_types_available": [
+            {"vehicle_type_id": "BOOST", "count": boost},
+            {"vehicle_type_id": "ICONIC", "count": bikes - boost},
+        ],
+    })
+
+
+def write_minutes(store, minutes, start=1759834800):
+    for minute in range(minutes):
+        timestamp = start + 60 * minute
+        store.append([
+            make_station("1", minute % 10, 20 - minute % 10, timestamp - 5, boost=minute % 3),
+            make_station("2", 5, 15, timestamp - 30),
+        ], timestamp)
+
+
+def test_column_roundtrip():
+    """
+    Verificar que la codificación delta + zigzag + varint es reversible
+    """
+    values = [1759834800, 1759834860, 1759834800, -1, 0, 2 ** 40, -2 ** 40]
+    data = bytearray()
+    _encode_column(values, data)
+    decoded, pos = _decode_column(bytes(data), 0, len(values))
+    assert decoded == values, "Los valores decodificados deben coincidir"
+    assert pos == len(data), "Debe consumirse toda la columna"
+
+    small = bytearray()
+    _encode_column([3, 4, 4, 2, 5], small)
+    assert len(small) == 5, "Las series que cambian poco deben ocupar un byte por valor"
+
+
+def test_query_across_segments(tmp_path):
+    """
+    Verificar las consultas por rango sobre varios segmentos y datos pendientes
+    """
+    store = StationStatusStore(str(tmp_path), snapshots_per_segment=10)
+    write_minutes(store, 25)
+
+    assert len(store.segment_paths()) == 2, "Deben haberse escrito 2 segmentos completos"
+
+    start = 1759834800
+    records = store.query("1", start + 60 * 8, start + 60 * 22)
+    assert [r.timestamp for r in records] == [start + 60 * m for m in range(8, 23)], \
+        "Deben devolverse las instantáneas del intervalo, incluidas las pendientes"
+    assert records[0] == StationStatusRecord(start + 480, start + 475, 8, 12, {"BOOST": 2, "ICONIC": 6}), \
+        "El registro debe contener los valores guardados"
+    assert store.query("999", start, start + 10000) == [], "Una estación inexistente no tiene registros"
+    store.close()
+
+
+def test_reopen_and_append_only(tmp_path):
+    """
+    Verificar que los segmentos persisten al reabrir el almacén y que no se admiten timestamps antiguos
+    """
+    with StationStatusStore(str(tmp_path), snapshots_per_segment=100) as store:
+        write_minutes(store, 5)
+
+    with StationStatusStore(str(tmp_path)) as store:
+        records = store.query("2", 0, 2 ** 40)
+        assert len(records) == 5, "Deben leerse las 5 instantáneas tras reabrir"
+        assert records[-1].num_bikes_available == 5
+        with pytest.raises(ValueError):
+            store.append([make_station("1", 1, 1, 1)], 1)
+        last = records[-1].timestamp
+        with pytest.raises(ValueError):
+            store.append([make_station("1", 1, 1, 1)], last)
+
+
+def test_unlisted_vehicle_types(tmp_path):
+    """
+    Verificar que un tipo no listado se distingue de un tipo listado con cantidad 0
+    """
+    only_boost = StationStatusInfo({"station_id": "3", "status": "IN_SERVICE", "num_bikes_available": 0,
+                                    "vehicle_types_available": [{"vehicle_type_id": "BOOST", "count": 0}]})
+    with StationStatusStore(str(tmp_path)) as store:
+        store.append([only_boost, make_station("1", 4, 10, 100, boost=1)], 100)
+        store.flush()
+        assert store.query("3", 0, 200)[0].vehicle_types == {"BOOST": 0}, \
+            "Solo deben leerse los tipos que lista la estación"
+        assert store.query("1", 0, 200)[0].vehicle_types == {"BOOST": 1, "ICONIC": 3}
+
+
+def test_existing_segment_is_not_overwritten(tmp_path):
+    """
+    Verificar que un flush nunca sobrescribe un segmento con el mismo nombre
+    """
+    store = StationStatusStore(str(tmp_path))
+    store.append([make_station("1", 1, 1, 1)], 100)
+    existing = tmp_path / "segment-000000000100-000000000100.bin"
+    existing.write_bytes(b"previo")
+    with pytest.raises(FileExistsError):
+        store.flush()
+    assert existing.read_bytes() == b"previo", "El segmento existente debe conservarse"
+    assert not list(tmp_path.glob("*.tmp")), "No deben quedar ficheros temporales"
+
+
+def test_append_snapshot_and_missing_values(tmp_path):
+    """
+    Verificar que se pueden guardar StationStatusSnapshot con campos ausentes
+    """
+    station = StationStatusInfo({"station_id": "7", "status": "MAINTENANCE"})
+    with StationStatusStore(str(tmp_path)) as store:
+        store.append_snapshot(StationStatusSnapshot([station], 1759834800))
+        path = store.flush()
+        assert os.path.basename(path).startswith("segment-"), "Debe escribirse un segmento"
+        record = store.query("7", 1759834800, 1759834800)[0]
+    assert record.num_bikes_available is None and record.last_reported is None, \
+        "Los campos ausentes deben leerse como None"
+
+    with StationStatusStore(str(tmp_path)) as store:
+        with pytest.raises(ValueError):
+            store.append_snapshot(StationStatusSnapshot([station], None))
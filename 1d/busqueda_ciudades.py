@@ -0,0 +1,261 @@
+"""
+Búsqueda por prefijo y tolerante a errores de sistemas de pybikes.
+
+buscar_sistema_por_ciudad (ej1d1) exige que el nombre de la ciudad coincida
+exactamente. Este módulo construye, a partir de los metadatos de las instancias de
+pybikes (los mismos 'meta' que devuelve obtener_info_sistema), un índice de
+búsqueda sobre ciudades, países y nombres de sistema con dos estructuras:
+
+- Un trie de prefijos para autocompletar. Se insertan el término completo y cada
+  una de sus palabras, de modo que "paulo" encuentra "São Paulo". Cada nodo guarda
+  la lista ordenada de términos que cuelgan de él, así que autocompletar es
+  recorrer tantos nodos como letras tenga el prefijo.
+- Un índice de trigramas para la búsqueda con errores: los términos que comparten
+  más trigramas con la consulta se comprueban con la distancia de edición
+  (Damerau-Levenshtein restringida, que cuenta una transposición como un error).
+
+Todas las comparaciones usan catalogo_pybikes.normalizar (sin acentos ni mayúsculas).
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from catalogo_pybikes import normalizar, obtener_catalogo
+
+# Campos de 'meta' que se indexan
+CAMPOS = ("city", "country", "name")
+
+
+class _Nodo:
+    __slots__ = ("hijos", "terminos")
+
+    def __init__(self):
+        self.hijos: Dict[str, "_Nodo"] = {}
+        self.terminos: List[int] = []
+
+
+def _trigramas(texto: str) -> Set[str]:
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def distancia_edicion(a: str, b: str, maximo: int) -> int:
+    """
+    Calcula la distancia de Damerau-Levenshtein restringida entre dos textos.
+
+    Deja de calcular en cuanto la distancia supera maximo.
+
+    Args:
+        a (str): Primer texto
+        b (str): Segundo texto
+        maximo (int): Distancia máxima de interés
+
+    Returns:
+        int: Distancia de edición, o maximo + 1 si es mayor que maximo
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2: Optional[List[int]] = None
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            coste = 0 if ca == cb else 1
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + coste)
+            if anterior2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1] if anterior[-1] <= maximo else maximo + 1
+
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda por prefijo y con errores sobre los metadatos de pybikes.
+
+    Atributos:
+        terminos: Lista de términos indexados; cada uno es un diccionario con
+                  'texto' (original), 'clave' (normalizada), 'campo' y 'entradas'
+                  (instancias de pybikes que lo contienen)
+    """
+
+    def __init__(self, entradas: Iterable[Dict[str, Any]], campos: Iterable[str] = CAMPOS):
+        """
+        Construye el índice.
+
+        Args:
+            entradas: Entradas con 'sistema', 'tag' y 'meta' (ver catalogo_pybikes)
+            campos: Campos de 'meta' que se indexan
+        """
+        self.terminos: List[Dict[str, Any]] = []
+        posiciones: Dict[str, int] = {}
+        # Instancias ya añadidas a cada término, por tag
+        vistas: List[Set[Any]] = []
+        for entrada in entradas:
+            identificador = entrada.get("tag") or id(entrada)
+            for campo in campos:
+                texto = entrada.get("meta", {}).get(campo)
+                if not isinstance(texto, str) or not normalizar(texto):
+                    continue
+                clave = normalizar(texto)
+                posicion = posiciones.get(clave)
+                if posicion is None:
+                    posicion = posiciones[clave] = len(self.terminos)
+                    self.terminos.append({"texto": texto, "clave": clave, "campo": campo, "entradas": []})
+                    vistas.append(set())
+                if identificador not in vistas[posicion]:
+                    vistas[posicion].add(identificador)
+                    self.terminos[posicion]["entradas"].append(entrada)
+        self._posiciones = posiciones
+
+        self._raiz = _Nodo()
+        self._trigramas: Dict[str, List[int]] = {}
+        for posicion, termino in enumerate(self.terminos):
+            clave = termino["clave"]
+            palabras = clave.split(" ")
+            # El término completo y cada sufijo que empieza en una palabra
+            for inicio in range(len(palabras)):
+                self._insertar(" ".join(palabras[inicio:]), posicion)
+            for trigrama in _trigramas(clave):
+                self._trigramas.setdefault(trigrama, []).append(posicion)
+        # Los términos más cortos (y con más sistemas) primero en las sugerencias
+        orden = {
+            posicion: (len(termino["clave"]), -len(termino["entradas"]), termino["clave"])
+            for posicion, termino in enumerate(self.terminos)
+        }
+        pendientes = [self._raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            nodo.terminos = sorted(set(nodo.terminos), key=orden.__getitem__)
+            pendientes.extend(nodo.hijos.values())
+
+    def _insertar(self, clave: str, posicion: int) -> None:
+        nodo = self._raiz
+        for caracter in clave:
+            nodo = nodo.hijos.setdefault(caracter, _Nodo())
+            nodo.terminos.append(posicion)
+
+    def _prefijo(self, clave: str) -> List[int]:
+        nodo = self._raiz
+        for caracter in clave:
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return []
+        return nodo.terminos
+
+    def autocompletar(self, prefijo: str, limite: int = 10) -> List[str]:
+        """
+        Devuelve los términos (ciudades, países o nombres) que empiezan por el prefijo.
+
+        Args:
+            prefijo (str): Texto escrito por el usuario
+            limite (int): Número máximo de sugerencias
+
+        Returns:
+            List[str]: Términos con su grafía original, los más cortos primero
+        """
+        clave = normalizar(prefijo)
+        if not clave:
+            return []
+        return [self.terminos[posicion]["texto"] for posicion in self._prefijo(clave)[:limite]]
+
+    def _aproximados(self, clave: str, max_distancia: int, candidatos: int) -> List[int]:
+        comunes = Counter()
+        for trigrama in _trigramas(clave):
+            comunes.update(self._trigramas.get(trigrama, ()))
+        resultado = []
+        for posicion, _ in comunes.most_common(candidatos):
+            distancia = distancia_edicion(clave, self.terminos[posicion]["clave"], max_distancia)
+            if distancia <= max_distancia:
+                resultado.append((distancia, -comunes[posicion], posicion))
+        return [posicion for _, _, posicion in sorted(resultado)]
+
+    def buscar_terminos(self, texto: str, limite: int = 10, max_distancia: int = 2,
+                        candidatos: int = 30) -> List[Dict[str, Any]]:
+        """
+        Busca términos por coincidencia exacta, por prefijo y, si no hay, con errores.
+
+        Args:
+            texto (str): Texto a buscar
+            limite (int): Número máximo de términos devueltos
+            max_distancia (int): Errores de escritura tolerados
+            candidatos (int): Términos con más trigramas en común que se comprueban
+
+        Returns:
+            List[dict]: Términos encontrados, del mejor al peor
+        """
+        clave = normalizar(texto)
+        if not clave:
+            return []
+        posiciones: List[int] = []
+        exacta = self._posiciones.get(clave)
+        if exacta is not None:
+            posiciones.append(exacta)
+        posiciones += [p for p in self._prefijo(clave) if p != exacta]
+        if not posiciones:
+            posiciones = self._aproximados(clave, max_distancia, candidatos)
+        return [self.terminos[posicion] for posicion in posiciones[:limite]]
+
+    def buscar_sistemas(self, texto: str, limite: int = 10, max_distancia: int = 2) -> List[str]:
+        """
+        Devuelve los sistemas de pybikes que coinciden con el texto buscado.
+
+        Args:
+            texto (str): Ciudad, país o nombre del sistema (admite prefijos y errores)
+            limite (int): Número máximo de términos considerados
+            max_distancia (int): Errores de escritura tolerados
+
+        Returns:
+            List[str]: Identificadores de sistema sin repetir, del mejor al peor
+        """
+        sistemas: List[str] = []
+        for termino in self.buscar_terminos(texto, limite, max_distancia):
+            for entrada in termino["entradas"]:
+                if entrada["sistema"] not in sistemas:
+                    sistemas.append(entrada["sistema"])
+        return sistemas
+
+
+# Índice de búsqueda de este proceso
+_indice_busqueda: Optional[IndiceBusqueda] = None
+
+
+def obtener_indice_busqueda() -> IndiceBusqueda:
+    """
+    Devuelve el índice de búsqueda sobre todas las instancias de pybikes.
+
+    Se construye la primera vez a partir de todas las instancias del catálogo, incluidas
+    las que no tienen ciudad (que se encuentran por país o nombre).
+    """
+    global _indice_busqueda
+    if _indice_busqueda is None:
+        catalogo = obtener_catalogo()
+        entradas = [entrada for sistema in catalogo.sistemas() for entrada in catalogo.entradas(sistema)]
+        _indice_busqueda = IndiceBusqueda(entradas)
+    return _indice_busqueda
+
+
+def autocompletar(prefijo: str, limite: int = 10) -> List[str]:
+    """
+    Sugiere ciudades, países o nombres de sistema que empiezan por el prefijo.
+    """
+    return obtener_indice_busqueda().autocompletar(prefijo, limite)
+
+
+def buscar_sistemas(texto: str, limite: int = 10, max_distancia: int = 2) -> List[str]:
+    """
+    Busca sistemas por ciudad, país o nombre, admitiendo prefijos y errores de escritura.
+    """
+    return obtener_indice_busqueda().buscar_sistemas(texto, limite, max_distancia)
+
+
+if __name__ == "__main__":
+    import time
+
+    for consulta in ("barc", "Barcelnoa", "sao paulo", "ES", "bicing"):
+        inicio = time.perf_counter()
+        sistemas = buscar_sistemas(consulta)
+        sugerencias = autocompletar(consulta, limite=5)
+        duracion = (time.perf_counter() - inicio) * 1000
+        print(f"{consulta!r}: {sistemas[:5]} | sugerencias: {sugerencias} ({duracion:.3f} ms)")
@@ -0,0 +1,118 @@
+"""
+Tests para busqueda_ciudades.py
+Este archivo contiene pruebas para verificar la búsqueda por prefijo y con errores
+de escritura sobre las ciudades, países y nombres de los sistemas de pybikes.
+"""
+
+import time
+import pytest
+from unittest.mock import MagicMock
+
+import busqueda_ciudades
+from busqueda_ciudades import IndiceBusqueda, distancia_edicion
+
+
+def entrada(sistema, tag, ciudad, pais, nombre):
+    return {"sistema": sistema, "clase": None, "tag": tag,
+            "meta": {"city": ciudad, "country": pais, "name": nombre}}
+
+
+@pytest.fixture
+def indice():
+    """
+    Fixture que crea un índice con unas pocas instancias de ejemplo
+    """
+    return IndiceBusqueda([
+        entrada("bicing", "bicing", "Barcelona", "ES", "Bicing"),
+        entrada("nextbike", "nextbike-barcelos", "Barcelos", "PT", "nextbike Barcelos"),
+        entrada("gbfs", "bike-sampa", "São Paulo", "BR", "Bike Sampa"),
+        entrada("ecobici", "ecobici", "Ciudad de México", "MX", "Ecobici"),
+        entrada("nextbike", "nextbike-munchen", "München", "DE", "MVG Rad"),
+    ])
+
+
+def test_distancia_edicion():
+    assert distancia_edicion("barcelona", "barcelona", 2) == 0
+    assert distancia_edicion("barcelnoa", "barcelona", 2) == 1, "Una transposición cuenta como un error"
+    assert distancia_edicion("barselona", "barcelona", 2) == 1
+    assert distancia_edicion("madrid", "barcelona", 2) == 3, "Por encima del máximo se devuelve maximo + 1"
+
+
+def test_autocompletar(indice):
+    """
+    Verificar que el autocompletado ignora acentos y mayúsculas y encuentra palabras intermedias
+    """
+    assert indice.autocompletar("barc") == ["Barcelos", "Barcelona", "nextbike Barcelos"], \
+        "Los términos más cortos van primero"
+    assert indice.autocompletar("SAO P") == ["São Paulo"]
+    assert indice.autocompletar("paulo") == ["São Paulo"], "Debe encontrar palabras que no son la primera"
+    assert indice.autocompletar("mexico") == ["Ciudad de México"]
+    assert indice.autocompletar("barc", limite=1) == ["Barcelos"]
+    assert indice.autocompletar("") == []
+    assert indice.autocompletar("zzz") == []
+
+
+def test_buscar_sistemas_exacto_y_prefijo(indice):
+    """
+    Verificar que la coincidencia exacta va antes que las de prefijo
+    """
+    assert indice.buscar_sistemas("Barcelona") == ["bicing"]
+    assert indice.buscar_sistemas("munchen") == ["nextbike"]
+    assert indice.buscar_sistemas("ES") == ["bicing"], "Debe buscar también por país"
+    assert indice.buscar_sistemas("Ecobici") == ["ecobici"], "Debe buscar también por nombre"
+
+
+def test_buscar_con_errores(indice):
+    """
+    Verificar que se toleran errores de escritura
+    """
+    assert indice.buscar_sistemas("Barcelnoa")[0] == "bicing", "El término más parecido debe ir primero"
+    assert indice.buscar_sistemas("Sao Pablo") == ["gbfs"]
+    assert indice.buscar_sistemas("Barcelnoa", max_distancia=0) == [], "Sin errores tolerados no hay resultados"
+    assert indice.buscar_sistemas("Madrid") == []
+
+    terminos = indice.buscar_terminos("Munchn")
+    assert terminos[0]["texto"] == "München"
+    assert terminos[0]["campo"] == "city"
+
+
+def test_indice_real_de_pybikes():
+    """
+    Verificar la búsqueda sobre todas las instancias de pybikes y su tiempo de respuesta
+    """
+    indice = busqueda_ciudades.obtener_indice_busqueda()
+    assert busqueda_ciudades.obtener_indice_busqueda() is indice, "El índice debe construirse una sola vez"
+    assert "Barcelona" in busqueda_ciudades.autocompletar("barcel")
+    assert "bicing" in busqueda_ciudades.buscar_sistemas("Barcelnoa")
+
+    inicio = time.perf_counter()
+    for _ in range(100):
+        indice.autocompletar("bar")
+    duracion = (time.perf_counter() - inicio) / 100
+    assert duracion < 0.001, "El autocompletado debe tardar menos de un milisegundo"
+
+
+def test_indice_incluye_instancias_sin_ciudad(indice, monkeypatch):
+    """
+    Verificar que el índice global se construye con todas las instancias del catálogo
+    """
+    catalogo = MagicMock()
+    catalogo.sistemas.return_value = ["bicing", "sin_ciudad"]
+    catalogo.entradas.side_effect = {
+        "bicing": [entrada("bicing", "bicing", "Barcelona", "ES", "Bicing")],
+        "sin_ciudad": [entrada("sin_ciudad", "bici-rural", None, "AR", "Bici Rural")],
+    }.get
+    monkeypatch.setattr(busqueda_ciudades, "obtener_catalogo", lambda: catalogo)
+    monkeypatch.setattr(busqueda_ciudades, "_indice_busqueda", None)
+
+    assert busqueda_ciudades.buscar_sistemas("Bici Rural") == ["sin_ciudad"], "Debe encontrarse por nombre"
+    assert busqueda_ciudades.buscar_sistemas("AR") == ["sin_ciudad"], "Debe encontrarse por país"
+
+
+def test_terminos_sin_instancias_repetidas():
+    """
+    Verificar que una instancia aparece una sola vez en cada término aunque se repita
+    """
+    bicing = entrada("bicing", "bicing", "Barcelona", "ES", "Barcelona")
+    indice = IndiceBusqueda([bicing, dict(bicing)])
+    assert [len(termino["entradas"]) for termino in indice.terminos] == [1, 1]
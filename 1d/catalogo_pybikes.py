@@ -0,0 +1,236 @@
+"""
+Catálogo compartido de los metadatos de pybikes.
+
+listar_sistemas_disponibles, buscar_sistema_por_ciudad y obtener_info_sistema (ej1d1)
+llamaban cada una por su cuenta a pybikes.getDataFiles()/getDataFile(), de modo que
+el mismo fichero de datos se leía y se parseaba varias veces en un mismo proceso.
+El catálogo centraliza esas lecturas:
+
+- La lista de sistemas se obtiene una sola vez.
+- Cada fichero de datos se carga bajo demanda y se guarda en una caché LRU; con
+  max_ficheros se limita cuántos se conservan en memoria a la vez.
+- El índice por tag solo guarda (sistema, posición), así que es pequeño y
+  sobrevive a la expulsión de los ficheros: consultar una instancia es una
+  búsqueda en un diccionario más, como mucho, la recarga de su fichero.
+
+Las búsquedas por ciudad no pasan por aquí sino por indice_ciudades, que guarda su
+índice en disco y lee los ficheros a través de este catálogo.
+
+Un proceso comparte el catálogo devuelto por obtener_catalogo(). Su límite de
+ficheros se toma de la variable de entorno PYBIKES_MAX_FICHEROS (que heredan
+también los procesos hijos) o se fija con configurar_catalogo().
+"""
+
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pybikes
+
+# Variable de entorno con el número máximo de ficheros del catálogo compartido
+VARIABLE_MAX_FICHEROS = "PYBIKES_MAX_FICHEROS"
+
+
+def normalizar(texto: str) -> str:
+    """
+    Normaliza un texto para comparar nombres de ciudades.
+
+    Elimina acentos, pasa a minúsculas y colapsa los espacios, de modo que
+    "  São  Paulo" y "sao paulo" son equivalentes.
+
+    Args:
+        texto (str): Texto a normalizar
+
+    Returns:
+        str: Texto normalizado
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_acentos.casefold().split())
+
+
+def recorrer_instancias(sistema_data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Recorre las instancias de un fichero de datos de pybikes.
+
+    Los ficheros con una sola clase tienen la lista 'instances' en la raíz; los
+    ficheros con varias clases tienen un diccionario 'class' con una lista de
+    instancias por clase.
+
+    Args:
+        sistema_data (dict): Contenido de un fichero de datos (pybikes.getDataFile)
+
+    Yields:
+        Tuple[str, dict]: Nombre de la clase e instancia
+    """
+    clase = sistema_data.get("class")
+    if isinstance(clase, dict):
+        for nombre_clase, datos_clase in clase.items():
+            for instance in (datos_clase or {}).get("instances", []):
+                yield nombre_clase, instance
+    else:
+        for instance in sistema_data.get("instances", []):
+            yield clase, instance
+
+
+class CatalogoPybikes:
+    """
+    Caché de los ficheros de datos de pybikes con un índice por tag.
+
+    Atributos:
+        max_ficheros: Número máximo de ficheros de datos en memoria (None, sin límite)
+        cargas: Número de ficheros de datos leídos con pybikes.getDataFile
+    """
+
+    def __init__(self, max_ficheros: Optional[int] = None):
+        """
+        Inicializa el catálogo (no lee ningún fichero hasta que se consulta).
+
+        Args:
+            max_ficheros (int): Número máximo de ficheros de datos que se conservan
+                                en memoria; los menos usados se descartan
+        """
+        self.max_ficheros = max_ficheros
+        self.cargas = 0
+        self._sistemas: Optional[List[str]] = None
+        self._entradas: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._por_tag: Optional[Dict[str, Tuple[str, int]]] = None
+        self._lock = threading.RLock()
+
+    def sistemas(self) -> List[str]:
+        """
+        Devuelve los identificadores de todos los sistemas (ficheros de datos) de pybikes.
+        """
+        with self._lock:
+            if self._sistemas is None:
+                self._sistemas = [fichero.split(".")[0] for fichero in pybikes.getDataFiles()]
+            return list(self._sistemas)
+
+    def existe(self, sistema: str) -> bool:
+        """
+        Indica si hay un fichero de datos con ese nombre.
+        """
+        self.sistemas()
+        return sistema in self._sistemas
+
+    def entradas(self, sistema: str) -> List[Dict[str, Any]]:
+        """
+        Devuelve las instancias de un sistema, leyendo su fichero solo si no está en memoria.
+
+        Args:
+            sistema (str): Identificador del sistema (nombre del fichero de datos)
+
+        Returns:
+            List[dict]: Entradas con 'sistema', 'clase', 'tag' y 'meta'
+
+        Raises:
+            FileNotFoundError: Si el sistema no existe
+        """
+        with self._lock:
+            entradas = self._entradas.get(sistema)
+            if entradas is not None:
+                self._entradas.move_to_end(sistema)
+                return entradas
+            sistema_data = pybikes.getDataFile(sistema)
+            self.cargas += 1
+            entradas = [
+                {"sistema": sistema, "clase": clase, "tag": instance.get("tag"), "meta": instance.get("meta", {})}
+                for clase, instance in recorrer_instancias(sistema_data)
+            ]
+            self._entradas[sistema] = entradas
+            self._recortar()
+            return entradas
+
+    def _recortar(self) -> None:
+        if self.max_ficheros is not None:
+            while len(self._entradas) > self.max_ficheros:
+                self._entradas.popitem(last=False)
+
+    def limitar(self, max_ficheros: Optional[int]) -> None:
+        """
+        Cambia el número máximo de ficheros en memoria, descartando los sobrantes.
+
+        Args:
+            max_ficheros (int): Nuevo límite (None, sin límite)
+        """
+        with self._lock:
+            self.max_ficheros = max_ficheros
+            self._recortar()
+
+    def _indice_tags(self) -> Dict[str, Tuple[str, int]]:
+        with self._lock:
+            if self._por_tag is None:
+                por_tag: Dict[str, Tuple[str, int]] = {}
+                for sistema in self.sistemas():
+                    for posicion, entrada in enumerate(self.entradas(sistema)):
+                        if entrada["tag"]:
+                            por_tag.setdefault(entrada["tag"], (sistema, posicion))
+                self._por_tag = por_tag
+            return self._por_tag
+
+    def instancia(self, tag: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve la instancia con el tag indicado (por ejemplo, 'bicing').
+
+        Args:
+            tag (str): Tag de la instancia
+
+        Returns:
+            Optional[dict]: Entrada de la instancia, o None si no existe
+        """
+        referencia = self._indice_tags().get(tag)
+        if referencia is None:
+            return None
+        sistema, posicion = referencia
+        return self.entradas(sistema)[posicion]
+
+    def olvidar(self) -> None:
+        """
+        Descarta los ficheros y los índices en memoria.
+        """
+        with self._lock:
+            self._sistemas = None
+            self._entradas.clear()
+            self._por_tag = None
+
+
+def _max_ficheros_entorno() -> Optional[int]:
+    """
+    Lee el límite de ficheros de PYBIKES_MAX_FICHEROS (None si no está o no es válido).
+    """
+    valor = os.environ.get(VARIABLE_MAX_FICHEROS, "").strip()
+    try:
+        max_ficheros = int(valor)
+    except ValueError:
+        return None
+    return max_ficheros if max_ficheros > 0 else None
+
+
+# Catálogo compartido por todo el proceso
+_catalogo = CatalogoPybikes(_max_ficheros_entorno())
+
+
+def configurar_catalogo(max_ficheros: Optional[int] = None) -> CatalogoPybikes:
+    """
+    Fija el número máximo de ficheros de datos del catálogo compartido.
+
+    Pensado para procesos con poca memoria: los ficheros menos usados se descartan
+    y se vuelven a leer si se consultan de nuevo.
+
+    Args:
+        max_ficheros (int): Número máximo de ficheros en memoria (None, sin límite)
+
+    Returns:
+        CatalogoPybikes: El catálogo compartido
+    """
+    _catalogo.limitar(max_ficheros)
+    return _catalogo
+
+
+def obtener_catalogo() -> CatalogoPybikes:
+    """
+    Devuelve el catálogo de metadatos de pybikes compartido por el proceso.
+    """
+    return _catalogo
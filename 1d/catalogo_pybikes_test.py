@@ -0,0 +1,124 @@
+"""
+Tests para catalogo_pybikes.py
+Este archivo contiene pruebas para verificar que los ficheros de datos de pybikes se
+leen una sola vez, que las consultas por tag usan el índice y que el límite de
+ficheros del catálogo compartido se puede configurar.
+"""
+
+import pybikes
+import pytest
+from unittest.mock import patch
+
+import catalogo_pybikes
+from catalogo_pybikes import CatalogoPybikes, configurar_catalogo
+from ej1d1 import listar_sistemas_disponibles, obtener_info_sistema
+
+
+@pytest.fixture
+def get_data_file():
+    """
+    Fixture que cuenta las lecturas de ficheros de datos sin cambiar su resultado
+    """
+    with patch("pybikes.getDataFile", wraps=pybikes.getDataFile) as mock_get_data_file:
+        yield mock_get_data_file
+
+
+def test_entradas_se_leen_una_vez(get_data_file):
+    catalogo = CatalogoPybikes()
+    entradas = catalogo.entradas("bicing")
+    assert catalogo.entradas("bicing") is entradas, "La segunda consulta debe salir de la caché"
+    assert get_data_file.call_count == 1, "El fichero solo debe leerse una vez"
+    assert catalogo.cargas == 1
+    assert entradas[0]["tag"] == "bicing"
+    with pytest.raises(FileNotFoundError):
+        catalogo.entradas("sistema_inexistente_123456")
+
+
+def test_expulsion_lru(get_data_file):
+    """
+    Verificar que con max_ficheros se descartan los ficheros menos usados
+    """
+    catalogo = CatalogoPybikes(max_ficheros=2)
+    catalogo.entradas("bicing")
+    catalogo.entradas("nextbike")
+    catalogo.entradas("bicing")
+    catalogo.entradas("gbfs")
+    assert get_data_file.call_count == 3
+    catalogo.entradas("bicing")
+    assert get_data_file.call_count == 3, "'bicing' se usó hace poco y debe seguir en memoria"
+    catalogo.entradas("nextbike")
+    assert get_data_file.call_count == 4, "'nextbike' debe haberse descartado y volver a leerse"
+
+
+def test_indice_por_tag(get_data_file):
+    """
+    Verificar las consultas por tag, también con pocos ficheros en memoria
+    """
+    catalogo = CatalogoPybikes(max_ficheros=1)
+    assert catalogo.instancia("bicing")["meta"]["city"] == "Barcelona"
+    assert catalogo.instancia("tag_inexistente_123456") is None
+
+    lecturas = get_data_file.call_count
+    catalogo.instancia("bicing")
+    assert get_data_file.call_count - lecturas <= 1, "Una consulta lee como mucho un fichero"
+    assert "bicing" in catalogo.sistemas() and catalogo.existe("bicing")
+
+
+def test_ej1d1_comparte_catalogo(get_data_file):
+    """
+    Verificar que las funciones de ej1d1 no vuelven a leer los ficheros ya cargados
+    """
+    catalogo_pybikes.obtener_catalogo().olvidar()
+    with patch("pybikes.getDataFiles", wraps=pybikes.getDataFiles) as mock_get_data_files:
+        assert "bicing" in listar_sistemas_disponibles()
+        assert "bicing" in listar_sistemas_disponibles()
+    assert mock_get_data_files.call_count == 1, "La lista de sistemas debe leerse una vez"
+
+    assert obtener_info_sistema("bicing")["city"] == "Barcelona"
+    assert obtener_info_sistema("bicing")["name"] == "Bicing"
+    assert get_data_file.call_count == 1, "El fichero de bicing debe leerse una vez"
+    assert obtener_info_sistema("sistema_inexistente_123456") is None
+
+
+def test_obtener_info_sistema_por_tag_de_instancia(get_data_file):
+    """
+    Verificar que un tag que no es un fichero de datos se busca entre las instancias
+    """
+    catalogo = catalogo_pybikes.obtener_catalogo()
+    catalogo.olvidar()
+    try:
+        assert obtener_info_sistema("nextbike-leipzig")["city"] == "Leipzig", \
+            "Debe encontrarse la instancia aunque el fichero se llame de otra forma"
+        lecturas = get_data_file.call_count
+        assert lecturas == len(catalogo.sistemas()), "La primera búsqueda construye el índice por tag"
+        assert obtener_info_sistema("kvb-rad-koln")["city"] == "Köln"
+        assert obtener_info_sistema("instancia_inexistente_123456") is None
+        assert get_data_file.call_count == lecturas, "Las siguientes búsquedas usan el índice por tag"
+    finally:
+        catalogo.olvidar()
+
+
+def test_configurar_catalogo_compartido(get_data_file, monkeypatch):
+    """
+    Verificar que el límite del catálogo compartido se puede fijar por función y por entorno
+    """
+    catalogo = catalogo_pybikes.obtener_catalogo()
+    limite = catalogo.max_ficheros
+    try:
+        catalogo.olvidar()
+        for sistema in ("bicing", "nextbike", "gbfs"):
+            catalogo.entradas(sistema)
+        assert configurar_catalogo(max_ficheros=1) is catalogo
+        assert catalogo.max_ficheros == 1
+        catalogo.entradas("gbfs")
+        assert get_data_file.call_count == 3, "Debe conservarse el fichero usado más recientemente"
+        catalogo.entradas("bicing")
+        assert get_data_file.call_count == 4, "Los ficheros sobrantes deben descartarse"
+    finally:
+        configurar_catalogo(limite)
+        catalogo.olvidar()
+
+    monkeypatch.setenv("PYBIKES_MAX_FICHEROS", "8")
+    assert catalogo_pybikes._max_ficheros_entorno() == 8
+    monkeypatch.setenv("PYBIKES_MAX_FICHEROS", "no")
+    assert catalogo_pybikes._max_ficheros_entorno() is None
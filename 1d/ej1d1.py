@@ -17,13 +17,24 @@ y permiten concentrarse en el análisis de datos en lugar de en los detalles té
 de la comunicación con la API.
 """
 
+import math
 import pybikes
-import pandas as pd
+import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
-import matplotlib.pyplot as plt
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Iterable, List, Dict, Any, Optional, Sequence, Tuple
 import sys
 
+# pandas, numpy y matplotlib tardan cientos de milisegundos en importarse; solo se
+# cargan dentro de las funciones que los usan (las anotaciones van entre comillas)
+if TYPE_CHECKING:
+    import pandas as pd
+    from matplotlib.figure import Figure
+
+import indice_ciudades
+from catalogo_pybikes import obtener_catalogo
+
 
 def listar_sistemas_disponibles() -> List[str]:
     """
@@ -34,15 +45,10 @@ def listar_sistemas_disponibles() -> List[str]:
     """
     # Implementa aquí la lógica para obtener y devolver la lista
     # de sistemas disponibles en pybikes
+    # La lista de ficheros de datos se lee una sola vez y la comparte el catálogo
     try:
-        sistemas = []
-        files_sistemas = pybikes.getDataFiles()
-        for sistema in files_sistemas:
-            sistema = sistema.split('.')[0]
-            sistemas.append(sistema)
-        
-        return sistemas
-    
+        return obtener_catalogo().sistemas()
+
     except AttributeError:
         return []
 
@@ -59,21 +65,12 @@ def buscar_sistema_por_ciudad(ciudad: str) -> List[str]:
     """
     # Implementa aquí la lógica para buscar y devolver sistemas
     # que coincidan con la ciudad especificada
+    # Consultamos el índice de ciudades (se construye una vez y se guarda en disco)
+    # en lugar de recorrer todos los ficheros de datos de pybikes en cada llamada
     sistemas_city = []
-    sistemas = []
-    
-    files_sistemas = pybikes.getDataFiles()
-    for sistema in files_sistemas:
-        sistema = sistema.split('.')[0]
-        sistemas.append(sistema)
-    for sistema in sistemas:
-        sistema_data = pybikes.getDataFile(sistema)
-        if 'instances' in sistema_data:
-            for instance in sistema_data['instances']: 
-                if 'city' in instance['meta']:
-                    if instance['meta']['city'] == ciudad:
-                        sistemas_city.append(sistema)
-                        #print(sistemas_city)
+    for entrada in indice_ciudades.buscar_instancias(ciudad):
+        if entrada['sistema'] not in sistemas_city:
+            sistemas_city.append(entrada['sistema'])
 
     return sistemas_city
 
@@ -82,23 +79,38 @@ def obtener_info_sistema(tag: str) -> Dict[str, Any]:
     """
     Obtiene la información del sistema especificado.
 
+    Si tag es el nombre de un fichero de datos se devuelve, por orden, la instancia
+    con ese mismo tag, la de Barcelona o la primera del fichero. Si no, se busca una
+    instancia con ese tag en cualquier fichero (por ejemplo, 'nextbike-leipzig'): la
+    primera de estas búsquedas lee todos los ficheros de datos para construir el
+    índice por tag del catálogo, y las siguientes son una consulta a ese índice.
+
     Args:
-        tag (str): Identificador del sistema (por ejemplo, 'bicing')
+        tag (str): Identificador del sistema o de la instancia (por ejemplo, 'bicing')
 
     Returns:
         Dict[str, Any]: Metadatos del sistema o None si no existe
     """
     # Implementa aquí la lógica para obtener y devolver
     # los metadatos del sistema especificado
+    # El catálogo lee cada fichero de datos una sola vez por proceso
+    catalogo = obtener_catalogo()
     try:
-        sistema_bicing = pybikes.getDataFile(tag)
-        if 'instances' in sistema_bicing:
-                for instance in sistema_bicing['instances']:
-                    if 'city' in instance['meta']:
-                        if instance['meta']['city'] == 'Barcelona':
-                            info = instance['meta']
-        return info
-    
+        if catalogo.existe(tag):
+            instancias = catalogo.entradas(tag)
+            # Preferimos la instancia con el mismo tag; si no, la de Barcelona
+            for instance in instancias:
+                if instance['tag'] == tag:
+                    return instance['meta']
+            for instance in instancias:
+                if instance['meta'].get('city') == 'Barcelona':
+                    return instance['meta']
+            return instancias[0]['meta'] if instancias else None
+
+        # Puede ser el tag de una instancia de un fichero con otro nombre
+        instance = catalogo.instancia(tag)
+        return instance['meta'] if instance else None
+
     except FileNotFoundError:
         # Para el caso en que no exista el sistema
         return None
@@ -126,7 +138,153 @@ def obtener_estaciones(tag: str) -> Optional[List]:
         # Para el caso en que no se encuentre el sistema
         return None
 
-def crear_dataframe_estaciones(estaciones: List) -> pd.DataFrame:
+def _actualizar_red(tag: str, timeout: float, inicios: Dict[str, float]) -> List:
+    """
+    Actualiza una red de pybikes y devuelve sus estaciones (se ejecuta en un hilo).
+    """
+    from pybikes.utils import PyBikesScraper
+
+    inicios[tag] = time.monotonic()
+    sistema = pybikes.get(tag)
+    # El scraper propio limita también el tiempo de cada petición HTTP de la red
+    sistema.update(PyBikesScraper(requests_timeout=timeout))
+    return sistema.stations
+
+
+def obtener_estaciones_multi(tags: Iterable[str], workers: int = 8,
+                             timeout: float = 30.0) -> Tuple[Dict[str, List], Dict[str, str]]:
+    """
+    Obtiene las estaciones de varios sistemas a la vez.
+
+    Cada red se actualiza en un hilo de un pool, de modo que el tiempo total depende
+    de la red más lenta y no de la suma de todas. Si una red tarda más de timeout
+    segundos desde que empieza a actualizarse se da por fallida y no se espera por ella.
+
+    Como los hilos de las redes fallidas no se pueden interrumpir y siguen ocupando
+    el pool, además hay un límite total de ceil(redes / workers) * timeout segundos
+    desde el envío: al alcanzarlo, las redes que siguen en curso o en cola se dan por
+    fallidas y las que estaban en cola se cancelan.
+
+    Args:
+        tags (Iterable[str]): Identificadores de los sistemas (por ejemplo, ['bicing', 'velib'])
+        workers (int): Número de redes que se actualizan simultáneamente
+        timeout (float): Tiempo máximo por red, en segundos
+
+    Returns:
+        Tuple[Dict[str, List], Dict[str, str]]:
+            - Listas de estaciones de las redes actualizadas correctamente
+            - Mensajes de error de las redes que han fallado o excedido el timeout
+    """
+    tags = list(dict.fromkeys(tags))
+    resultados: Dict[str, List] = {}
+    errores: Dict[str, str] = {}
+    if not tags:
+        return resultados, errores
+
+    inicios: Dict[str, float] = {}
+    max_workers = min(workers, len(tags))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pybikes")
+    pendientes = {executor.submit(_actualizar_red, tag, timeout, inicios): tag for tag in tags}
+    limite_total = time.monotonic() + math.ceil(len(tags) / max_workers) * timeout
+    try:
+        while pendientes:
+            ahora = time.monotonic()
+            limites = [inicios[tag] + timeout for tag in pendientes.values() if tag in inicios]
+            espera = max(min(limites + [limite_total]) - ahora, 0)
+            hechos, _ = wait(pendientes, timeout=espera, return_when=FIRST_COMPLETED)
+            for future in hechos:
+                tag = pendientes.pop(future)
+                try:
+                    resultados[tag] = future.result()
+                except Exception as e:
+                    errores[tag] = f"{type(e).__name__}: {e}"
+            # Las redes que siguen sin terminar pasado su timeout se dan por fallidas
+            ahora = time.monotonic()
+            for future, tag in list(pendientes.items()):
+                if tag in inicios and ahora - inicios[tag] >= timeout:
+                    del pendientes[future]
+                    errores[tag] = f"TimeoutError: sin respuesta en {timeout} s"
+            # Pasado el límite total tampoco se espera a las redes en cola
+            if ahora >= limite_total:
+                for future, tag in pendientes.items():
+                    if future.cancel():
+                        errores[tag] = "TimeoutError: no ha empezado antes del límite total"
+                    else:
+                        errores[tag] = f"TimeoutError: sin respuesta en {timeout} s"
+                pendientes.clear()
+    finally:
+        # No esperamos a los hilos de las redes que han excedido el timeout
+        executor.shutdown(wait=False, cancel_futures=True)
+    return resultados, errores
+
+
+def _columna_entera(valores: List) -> Any:
+    """
+    Convierte una lista de contadores en un array de enteros.
+
+    Solo se convierten los valores que ya son enteros: si faltan algunos se usa el
+    tipo Int64 de pandas (admite nulos) y, si hay decimales, textos u otros valores,
+    se dejan tal cual para no truncarlos ni interpretarlos.
+    """
+    import numbers
+    import numpy as np
+    import pandas as pd
+
+    array = np.asarray(valores)
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64, copy=False)
+    if array.dtype == object and all(
+            valor is None or (isinstance(valor, numbers.Integral) and not isinstance(valor, bool))
+            for valor in valores):
+        return pd.array(valores, dtype="Int64")
+    return valores
+
+
+def crear_dataframe_columnar(estaciones: List, claves_extra: Sequence[str] = (),
+                             incluir_id: bool = False, incluir_extra: bool = False) -> "pd.DataFrame":
+    """
+    Construye el DataFrame de estaciones columna a columna, sin BikeShareStation.to_dict.
+
+    Los atributos de cada estación se leen directamente en una lista por columna y
+    las columnas numéricas se convierten en arrays con tipo (float64 para las
+    coordenadas, int64 para los contadores). El 'id' de to_dict es un hash MD5 de
+    las coordenadas, así que solo se calcula si se pide.
+
+    Args:
+        estaciones (List): Lista de objetos estación
+        claves_extra (Sequence[str]): Claves de 'extra' que se añaden como columnas
+                                      propias (nulas si la estación no la tiene)
+        incluir_id (bool): Si se añade la columna 'id' (estacion.get_hash())
+        incluir_extra (bool): Si se añade la columna 'extra' con el diccionario completo
+
+    Returns:
+        pd.DataFrame: DataFrame con una fila por estación
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not estaciones:
+        return pd.DataFrame()
+
+    columnas: Dict[str, Any] = {}
+    if incluir_id:
+        columnas['id'] = [estacion.get_hash() for estacion in estaciones]
+    columnas['name'] = [estacion.name for estacion in estaciones]
+    columnas['latitude'] = np.array([estacion.latitude for estacion in estaciones], dtype=np.float64)
+    columnas['longitude'] = np.array([estacion.longitude for estacion in estaciones], dtype=np.float64)
+    columnas['bikes'] = _columna_entera([estacion.bikes for estacion in estaciones])
+    columnas['free'] = _columna_entera([estacion.free for estacion in estaciones])
+    columnas['timestamp'] = [estacion.timestamp for estacion in estaciones]
+    if incluir_extra:
+        columnas['extra'] = [estacion.extra for estacion in estaciones]
+    if claves_extra:
+        extras = [estacion.extra or {} for estacion in estaciones]
+        for clave in claves_extra:
+            columnas[clave] = [extra.get(clave) for extra in extras]
+    return pd.DataFrame(columnas)
+
+
+def crear_dataframe_estaciones(estaciones: List) -> "pd.DataFrame":
     """
     Convierte la lista de estaciones en un DataFrame de pandas.
 
@@ -139,42 +297,56 @@ def crear_dataframe_estaciones(estaciones: List) -> pd.DataFrame:
     # Implementa aquí la lógica para convertir la lista de estaciones
     # en un DataFrame de pandas con al menos las columnas:
     # nombre, latitud, longitud, bicicletas disponibles, espacios libres
-    df_estaciones = pd.DataFrame()
 
-    if not estaciones:
-        return pd.DataFrame()
-    
-    # Creamos una lista de diccionarios con la información de cada estación
-    estaciones_list =[]
-    for estacion in estaciones:
-        datos = pybikes.BikeShareStation.to_dict(estacion)
-        estaciones_list.append(datos)
-    df_estaciones = pd.DataFrame(estaciones_list)
-    return df_estaciones
+    # Mismas columnas que BikeShareStation.to_dict, pero construidas por columnas
+    return crear_dataframe_columnar(estaciones, incluir_id=True, incluir_extra=True)
 
 
-def visualizar_estaciones(df: pd.DataFrame) -> None:
+def _estaciones_destacadas(df: "pd.DataFrame", n: int = 10) -> "pd.DataFrame":
+    """
+    Devuelve las n estaciones con más valor en 'free' sin ordenar todo el DataFrame.
+    """
+    return df.nlargest(n, 'free')[['name', 'free']]
+
+
+def _dibujar_estaciones(ax, df_corto: "pd.DataFrame") -> None:
+    """
+    Dibuja el gráfico de barras de las estaciones destacadas en unos ejes.
+    """
+    ax.bar(df_corto['name'], df_corto['free'])
+    # personalizamos el gráfico
+    ax.tick_params(axis='x', labelrotation=45)
+    for etiqueta in ax.get_xticklabels():
+        etiqueta.set_horizontalalignment('right')
+    ax.set_xlabel("Bicicletas disponibles")
+    ax.set_ylabel("Estaciones")
+    ax.set_title("Estaciones con más bicicletas disponibles")
+
+
+def visualizar_estaciones(df: "pd.DataFrame", destino: Any = None, formato: Optional[str] = None) -> None:
     """
     Genera una visualización simple de la disponibilidad de bicicletas.
 
     Args:
         df (pd.DataFrame): DataFrame con la información de las estaciones
+        destino: Si se indica (ruta o buffer como io.BytesIO), el gráfico se guarda
+                 ahí sin abrir ninguna ventana (ver renderizar_estaciones)
+        formato (str): 'png' o 'svg'; por defecto se deduce de la extensión de la ruta
     """
     # Implementa aquí la lógica para crear un gráfico de barras que muestre
     # las 10 estaciones con más bicicletas disponibles
-    
-    # ordenamos el dataframe por la columna 'free' en orden descendente
-    df_ordenado = df.sort_values(by='free', ascending=False)
-    df_corto = df_ordenado.head(10)
+    if destino is not None:
+        renderizar_estaciones(df, destino, formato)
+        return
+
+    import matplotlib.pyplot as plt
+
+    # nos quedamos con las 10 estaciones con más 'free' (sin ordenar todo el dataframe)
+    df_corto = _estaciones_destacadas(df)
 
     # creamos el gráfico de barras
     plt.figure(figsize=(12, 6))
-    plt.bar(df_corto['name'], df_corto['free'])
-    # personalizamos el gráfico
-    plt.xticks(rotation=45, ha='right')
-    plt.xlabel("Bicicletas disponibles")
-    plt.ylabel("Estaciones")
-    plt.title("Estaciones con más bicicletas disponibles")
+    _dibujar_estaciones(plt.gca(), df_corto)
 
     # mostramos el gráfico
     plt.tight_layout()
@@ -183,6 +355,89 @@ def visualizar_estaciones(df: pd.DataFrame) -> None:
     return 
 
 
+# Figura reutilizada por renderizar_estaciones en cada hilo
+_figuras = threading.local()
+
+
+def _figura_reutilizable() -> "Figure":
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figura = getattr(_figuras, "figura", None)
+    if figura is None:
+        # Figure sin pyplot: se dibuja con Agg y no necesita pantalla
+        figura = _figuras.figura = Figure(figsize=(12, 6))
+        FigureCanvasAgg(figura)
+    else:
+        figura.clear()
+    return figura
+
+
+def renderizar_estaciones(df: "pd.DataFrame", destino: Any, formato: Optional[str] = None) -> Any:
+    """
+    Guarda el gráfico de las estaciones destacadas sin usar pyplot ni pantalla.
+
+    La figura se crea una vez por hilo y se limpia en cada llamada, en lugar de crear
+    (y dejar abierta) una figura nueva por gráfico.
+
+    Args:
+        df (pd.DataFrame): DataFrame con la información de las estaciones
+        destino: Ruta del fichero o buffer binario (por ejemplo, io.BytesIO)
+        formato (str): 'png' o 'svg'; obligatorio si destino es un buffer
+
+    Returns:
+        El destino recibido
+    """
+    figura = _figura_reutilizable()
+    _dibujar_estaciones(figura.add_subplot(), _estaciones_destacadas(df))
+    figura.tight_layout()
+    figura.savefig(destino, format=formato)
+    return destino
+
+
+def _renderizar_trabajo(trabajo: Tuple["pd.DataFrame", Any, Optional[str]]) -> Any:
+    df_corto, destino, formato = trabajo
+    return renderizar_estaciones(df_corto, destino, formato)
+
+
+def renderizar_lote(graficos: Dict[str, "pd.DataFrame"], directorio: str, formato: str = 'png',
+                    procesos: Optional[int] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Genera los gráficos de muchas redes en paralelo en un pool de procesos.
+
+    A cada proceso solo se le envían las estaciones destacadas de cada red, no el
+    DataFrame completo.
+
+    Args:
+        graficos (Dict[str, pd.DataFrame]): DataFrame de estaciones por red
+        directorio (str): Directorio donde se guardan los ficheros '<red>.<formato>'
+        formato (str): 'png' o 'svg'
+        procesos (int): Número de procesos (por defecto, uno por CPU)
+
+    Returns:
+        Tuple[Dict[str, str], Dict[str, str]]:
+            - Ruta del gráfico de cada red generada correctamente
+            - Mensajes de error de las redes que han fallado
+    """
+    os.makedirs(directorio, exist_ok=True)
+    rutas: Dict[str, str] = {}
+    errores: Dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        futures = {}
+        for red, df in graficos.items():
+            ruta = os.path.join(directorio, f"{red}.{formato}")
+            try:
+                futures[red] = executor.submit(_renderizar_trabajo, (_estaciones_destacadas(df), ruta, formato))
+            except KeyError as e:
+                errores[red] = f"KeyError: falta la columna {e}"
+        for red, future in futures.items():
+            try:
+                rutas[red] = future.result()
+            except Exception as e:
+                errores[red] = f"{type(e).__name__}: {e}"
+    return rutas, errores
+
+
 if __name__ == "__main__":
     # Listar sistemas disponibles
     print("\nSistemas de bicicletas disponibles:")
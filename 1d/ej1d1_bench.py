@@ -0,0 +1,65 @@
+"""
+Benchmark de la construcción del DataFrame de estaciones de pybikes.
+
+Compara la versión con BikeShareStation.to_dict (lista de diccionarios) con
+crear_dataframe_columnar, con y sin la columna 'id' (hash MD5 de las coordenadas)
+y aplanando algunas claves de 'extra'.
+
+Uso:
+    python ej1d1_bench.py [--stations 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import random
+import timeit
+from typing import List
+
+import pandas as pd
+import pybikes
+
+from ej1d1 import crear_dataframe_columnar, crear_dataframe_estaciones
+
+
+def synthetic_stations(n: int, seed: int = 0) -> List[pybikes.BikeShareStation]:
+    """
+    Crea n estaciones de pybikes con datos aleatorios.
+    """
+    rng = random.Random(seed)
+    estaciones = []
+    for i in range(n):
+        capacidad = rng.randint(10, 40)
+        bicis = rng.randint(0, capacidad)
+        extra = {"uid": str(i), "slots": capacidad, "ebikes": rng.randint(0, bicis), "online": rng.random() > 0.05}
+        estaciones.append(pybikes.BikeShareStation(f"Estación {i}", rng.uniform(41.3, 41.5), rng.uniform(2.0, 2.3),
+                                                   bicis, capacidad - bicis, extra))
+    return estaciones
+
+
+def dataframe_to_dict(estaciones: List[pybikes.BikeShareStation]) -> pd.DataFrame:
+    """
+    Versión de referencia: un diccionario por estación con to_dict.
+    """
+    return pd.DataFrame([pybikes.BikeShareStation.to_dict(estacion) for estacion in estaciones])
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    casos = [
+        ("to_dict", dataframe_to_dict),
+        ("crear_dataframe_estaciones", crear_dataframe_estaciones),
+        ("columnar sin id", crear_dataframe_columnar),
+        ("columnar + extra", lambda e: crear_dataframe_columnar(e, claves_extra=("uid", "slots", "ebikes"))),
+    ]
+    print(f"{'estaciones':>10} {'método':<28} {'ms':>10}")
+    for n in sizes:
+        estaciones = synthetic_stations(n)
+        for nombre, funcion in casos:
+            segundos = min(timeit.repeat(lambda: funcion(estaciones), number=1, repeat=repeat))
+            print(f"{n:>10} {nombre:<28} {segundos * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.stations, args.repeat)
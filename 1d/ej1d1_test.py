@@ -7,7 +7,9 @@ información de sistemas de bicicletas compartidas.
 Nota: Estas pruebas requieren conexión a internet para acceder a la API.
 """
 
+import io
 import pytest
+import time
 import pandas as pd
 import matplotlib.pyplot as plt
 from unittest.mock import patch, MagicMock
@@ -16,14 +18,37 @@ from unittest.mock import patch, MagicMock
 import sys
 import os
 
+# La raíz del repositorio, para importar el paquete comun
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)
+
+from comun.pruebas import modulos_importados
 from ej1d1 import (
     listar_sistemas_disponibles, 
     buscar_sistema_por_ciudad, 
     obtener_info_sistema,
     obtener_estaciones,
+    obtener_estaciones_multi,
     crear_dataframe_estaciones,
-    visualizar_estaciones
+    crear_dataframe_columnar,
+    visualizar_estaciones,
+    renderizar_estaciones,
+    renderizar_lote
 )
+import indice_ciudades
+
+
+@pytest.fixture(autouse=True)
+def cache_indice_temporal(tmp_path, monkeypatch):
+    """
+    Fixture que lleva la caché en disco del índice de ciudades a un directorio temporal
+    """
+    monkeypatch.setenv(indice_ciudades.VARIABLE_DIRECTORIO_CACHE, str(tmp_path))
+    indice_ciudades.olvidar_indice()
+    yield
+    indice_ciudades.olvidar_indice()
+
 
 # Fixture para simular una estación
 @pytest.fixture
@@ -151,3 +176,170 @@ def test_crear_dataframe_estaciones_lista_vacia():
     df = crear_dataframe_estaciones([])
     assert isinstance(df, pd.DataFrame), "Debe devolver un DataFrame vacío"
     assert len(df) == 0, "El DataFrame debe estar vacío"
+
+def sistema_simulado(tag, espera=0.0, error=None):
+    """
+    Crea un sistema de pybikes simulado cuya actualización tarda 'espera' segundos
+    """
+    sistema = MagicMock()
+    sistema.stations = [f"{tag}-estacion"]
+
+    def update(scraper=None):
+        time.sleep(espera)
+        if error:
+            raise error
+
+    sistema.update.side_effect = update
+    return sistema
+
+@patch('pybikes.get')
+def test_obtener_estaciones_multi(mock_get):
+    """
+    Prueba obtener_estaciones_multi con redes correctas, con error y lentas.
+    """
+    sistemas = {
+        "rapida": sistema_simulado("rapida"),
+        "otra": sistema_simulado("otra", espera=0.1),
+        "rota": sistema_simulado("rota", error=ValueError("sin datos")),
+        "lenta": sistema_simulado("lenta", espera=2.0),
+    }
+    mock_get.side_effect = lambda tag: sistemas[tag]
+
+    inicio = time.monotonic()
+    resultados, errores = obtener_estaciones_multi(["rapida", "otra", "rota", "lenta"], workers=4, timeout=0.5)
+    duracion = time.monotonic() - inicio
+
+    assert resultados == {"rapida": ["rapida-estacion"], "otra": ["otra-estacion"]}
+    assert set(errores) == {"rota", "lenta"}, "Las redes con error o lentas deben ir aparte"
+    assert errores["rota"].startswith("ValueError"), "El mensaje debe incluir el tipo de error"
+    assert errores["lenta"].startswith("TimeoutError")
+    assert duracion < 1.5, "No se debe esperar a las redes que exceden el timeout"
+
+@patch('pybikes.get')
+def test_obtener_estaciones_multi_en_paralelo(mock_get):
+    """
+    Prueba que las redes se actualizan de forma concurrente.
+    """
+    mock_get.side_effect = lambda tag: sistema_simulado(tag, espera=0.2)
+    tags = [f"red{i}" for i in range(8)]
+
+    inicio = time.monotonic()
+    resultados, errores = obtener_estaciones_multi(tags + ["red0"], workers=8)
+    duracion = time.monotonic() - inicio
+
+    assert sorted(resultados) == tags, "Los tags repetidos se actualizan una sola vez"
+    assert errores == {}
+    assert duracion < 1.0, "Las 8 redes deben actualizarse a la vez y no una tras otra"
+    assert obtener_estaciones_multi([]) == ({}, {})
+
+@patch('pybikes.get')
+def test_obtener_estaciones_multi_mas_redes_que_workers(mock_get):
+    """
+    Prueba que las redes en cola detrás de redes bloqueadas también exceden el timeout.
+    """
+    mock_get.side_effect = lambda tag: sistema_simulado(tag, espera=1.5)
+    tags = [f"bloqueada{i}" for i in range(5)]
+
+    inicio = time.monotonic()
+    resultados, errores = obtener_estaciones_multi(tags, workers=2, timeout=0.2)
+    duracion = time.monotonic() - inicio
+
+    assert resultados == {}
+    assert sorted(errores) == tags, "Todas las redes deben darse por fallidas"
+    assert all(error.startswith("TimeoutError") for error in errores.values())
+    assert duracion < 1.0, "El tiempo total debe estar limitado aunque los workers sigan bloqueados"
+    assert mock_get.call_count == 2, "Las redes que seguían en cola deben cancelarse"
+
+def estaciones_reales(n):
+    """
+    Crea n objetos BikeShareStation de pybikes con datos de ejemplo
+    """
+    import pybikes
+    return [
+        pybikes.BikeShareStation(f"Estación {i}", 41.3 + i / 1000, 2.1 + i / 1000, i % 7, 20 - i % 7,
+                                 {"uid": str(i), "slots": 20, "ebikes": i % 3})
+        for i in range(n)
+    ]
+
+def test_crear_dataframe_estaciones_igual_que_to_dict():
+    """
+    Prueba que el DataFrame por columnas coincide con el construido con to_dict.
+    """
+    import pybikes
+    estaciones = estaciones_reales(20)
+    esperado = pd.DataFrame([pybikes.BikeShareStation.to_dict(e) for e in estaciones])
+    pd.testing.assert_frame_equal(crear_dataframe_estaciones(estaciones), esperado)
+
+def test_crear_dataframe_columnar():
+    """
+    Prueba los tipos de las columnas y las claves de 'extra' aplanadas.
+    """
+    estaciones = estaciones_reales(3)
+    estaciones[2].extra = {}
+    df = crear_dataframe_columnar(estaciones, claves_extra=["uid", "ebikes"])
+
+    assert list(df.columns) == ["name", "latitude", "longitude", "bikes", "free", "timestamp", "uid", "ebikes"]
+    assert df["latitude"].dtype == "float64", "Las coordenadas deben ser float64"
+    assert df["bikes"].dtype == "int64", "Los contadores deben ser int64"
+    assert df["uid"].tolist()[:2] == ["0", "1"]
+    assert df["uid"].isna().tolist() == [False, False, True], "Las claves que faltan en 'extra' deben ser nulas"
+
+    estaciones[0].bikes = None
+    df = crear_dataframe_columnar(estaciones)
+    assert df["bikes"].dtype == "Int64", "Si faltan contadores se usa el tipo entero con nulos"
+    assert df["bikes"].isna().tolist() == [True, False, False]
+    assert crear_dataframe_columnar([]).empty
+
+    estaciones[0].bikes, estaciones[1].bikes, estaciones[2].bikes = 2.5, 3.0, 4
+    df = crear_dataframe_columnar(estaciones)
+    assert df["bikes"].tolist() == [2.5, 3.0, 4.0], "Los decimales no deben truncarse"
+    estaciones[0].bikes = "7"
+    df = crear_dataframe_columnar(estaciones)
+    assert df["bikes"].tolist() == ["7", 3.0, 4], "Los textos no deben convertirse en números"
+
+@patch('matplotlib.pyplot.show')
+def test_renderizar_estaciones_sin_pantalla(mock_show, mock_stations, tmp_path):
+    """
+    Prueba que el modo sin pantalla genera PNG y SVG sin llamar a plt.show.
+    """
+    df = pd.DataFrame({
+        'name': [s.name for s in mock_stations],
+        'free': [s.free for s in mock_stations]
+    })
+    buffer = renderizar_estaciones(df, io.BytesIO(), formato="png")
+    assert buffer.getvalue().startswith(b"\x89PNG"), "Debe escribirse un PNG en el buffer"
+
+    ruta = tmp_path / "estaciones.svg"
+    visualizar_estaciones(df, destino=str(ruta))
+    assert b"<svg" in ruta.read_bytes(), "El formato debe deducirse de la extensión"
+    assert not mock_show.called, "En modo sin pantalla no se debe llamar a plt.show"
+
+    import ej1d1
+    figura = ej1d1._figura_reutilizable()
+    assert ej1d1._figura_reutilizable() is figura, "La figura debe reutilizarse entre llamadas"
+
+def test_renderizar_lote(tmp_path):
+    """
+    Prueba la generación de gráficos de varias redes en un pool de procesos.
+    """
+    graficos = {
+        f"red{i}": pd.DataFrame({'name': [f"E{j}" for j in range(30)], 'free': list(range(30))})
+        for i in range(3)
+    }
+    graficos["rota"] = pd.DataFrame({'name': ["E0"]})
+    rutas, errores = renderizar_lote(graficos, str(tmp_path / "graficos"), procesos=2)
+
+    assert sorted(rutas) == ["red0", "red1", "red2"]
+    assert all(open(ruta, "rb").read().startswith(b"\x89PNG") for ruta in rutas.values())
+    assert list(errores) == ["rota"], "Los errores de cada red deben devolverse aparte"
+
+
+def test_importacion_sin_modulos_pesados():
+    """
+    Prueba de regresión del tiempo de importación: ej1d1 no debe cargar pandas ni matplotlib
+    hasta que se usan las funciones que los necesitan.
+    """
+    modulos = modulos_importados("ej1d1", os.path.dirname(os.path.abspath(__file__)))
+    assert "ej1d1" in modulos, "La salida de -X importtime debe incluir el módulo"
+    for pesado in ('pandas', 'matplotlib', 'matplotlib.pyplot'):
+        assert pesado not in modulos, f"Importar ej1d1 no debe importar {pesado}"
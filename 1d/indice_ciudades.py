@@ -0,0 +1,164 @@
+"""
+Índice de ciudades de los sistemas de pybikes.
+
+buscar_sistema_por_ciudad (ej1d1) recorría en cada llamada todos los ficheros de
+datos de pybikes con getDataFiles()/getDataFile(). Este módulo construye una sola
+vez un índice que relaciona cada ciudad (normalizada: sin acentos ni mayúsculas)
+con los sistemas e instancias que la sirven, de modo que las búsquedas son una
+consulta a un diccionario.
+
+El índice se guarda en disco en formato JSON con la versión de pybikes en el nombre
+del fichero, así que solo se reconstruye al actualizar la biblioteca. El directorio
+de la caché se toma de la variable de entorno PYBIKES_INDICE_DIR o, si no está
+definida, es ~/.cache/pybikes_indice. La carga de
+los ficheros de datos puede hacerse en paralelo con hilos o procesos, y pasa por el
+catálogo compartido (catalogo_pybikes).
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import metadata
+from typing import Any, Dict, List, Optional
+
+import pybikes
+
+from catalogo_pybikes import normalizar, obtener_catalogo
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pybikes_indice")
+
+# Variable de entorno con el directorio de la caché en disco (sustituye a CACHE_DIR)
+VARIABLE_DIRECTORIO_CACHE = "PYBIKES_INDICE_DIR"
+
+# Índice cargado en este proceso
+_indice: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+
+def version_pybikes() -> str:
+    """
+    Devuelve la versión instalada de pybikes (o 'desconocida').
+    """
+    try:
+        return metadata.version("pybikes")
+    except metadata.PackageNotFoundError:
+        return getattr(pybikes, "__version__", "desconocida")
+
+
+def _entradas_sistema(sistema: str) -> List[Dict[str, Any]]:
+    """
+    Carga un fichero de datos y devuelve sus instancias en el formato del índice.
+
+    Es una función de nivel superior para poder usarse con ProcessPoolExecutor. Los
+    ficheros se leen a través del catálogo del proceso, así que los que ya se hayan
+    consultado desde ej1d1 no se vuelven a leer.
+    """
+    return obtener_catalogo().entradas(sistema)
+
+
+def construir_indice(ejecutor: Optional[str] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Construye el índice ciudad normalizada -> instancias recorriendo todos los ficheros de datos.
+
+    Args:
+        ejecutor (str): None para cargar los ficheros en serie, 'hilos' o 'procesos'
+                        para cargarlos en paralelo
+        max_workers (int): Número de hilos o procesos
+
+    Returns:
+        Dict[str, List[dict]]: Diccionario cuyas claves son ciudades normalizadas y cuyos
+                               valores son listas de entradas con 'sistema', 'clase',
+                               'tag' y 'meta'
+    """
+    sistemas = obtener_catalogo().sistemas()
+    if ejecutor == "hilos":
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            resultados = list(pool.map(_entradas_sistema, sistemas))
+    elif ejecutor == "procesos":
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            resultados = list(pool.map(_entradas_sistema, sistemas))
+    elif ejecutor is None:
+        resultados = [_entradas_sistema(sistema) for sistema in sistemas]
+    else:
+        raise ValueError(f"Ejecutor desconocido: {ejecutor}")
+
+    indice: Dict[str, List[Dict[str, Any]]] = {}
+    for entradas in resultados:
+        for entrada in entradas:
+            ciudad = entrada["meta"].get("city")
+            if ciudad:
+                indice.setdefault(normalizar(ciudad), []).append(entrada)
+    return indice
+
+
+def ruta_cache(directorio: Optional[str] = None) -> str:
+    """
+    Devuelve la ruta del fichero de caché del índice para la versión instalada de pybikes.
+
+    El directorio es, por orden, el indicado, el de PYBIKES_INDICE_DIR o CACHE_DIR.
+    """
+    directorio = directorio or os.environ.get(VARIABLE_DIRECTORIO_CACHE) or CACHE_DIR
+    return os.path.join(directorio, f"indice-ciudades-{version_pybikes()}.json")
+
+
+def cargar_indice(directorio_cache: Optional[str] = None, usar_cache: bool = True,
+                  ejecutor: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Devuelve el índice de ciudades, construyéndolo solo si no está en memoria ni en disco.
+
+    Args:
+        directorio_cache (str): Directorio de la caché en disco (por defecto, el de
+                                PYBIKES_INDICE_DIR o CACHE_DIR)
+        usar_cache (bool): Si es False no se lee ni se escribe la caché en disco
+        ejecutor (str): Ejecutor a usar si hay que construir el índice (ver construir_indice)
+
+    Returns:
+        Dict[str, List[dict]]: Índice de ciudades
+    """
+    global _indice
+    if _indice is not None:
+        return _indice
+
+    ruta = ruta_cache(directorio_cache)
+    if usar_cache:
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                _indice = json.load(f)
+                return _indice
+        except (OSError, ValueError):
+            # Sin caché (o corrupta): se reconstruye
+            pass
+
+    _indice = construir_indice(ejecutor)
+    if usar_cache:
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            tmp = f"{ruta}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(_indice, f, ensure_ascii=False)
+            os.replace(tmp, ruta)
+        except OSError:
+            # La caché en disco es opcional
+            pass
+    return _indice
+
+
+def olvidar_indice() -> None:
+    """
+    Descarta el índice cargado en memoria (la siguiente consulta lo vuelve a cargar).
+    """
+    global _indice
+    _indice = None
+
+
+def buscar_instancias(ciudad: str) -> List[Dict[str, Any]]:
+    """
+    Devuelve las instancias de pybikes que dan servicio a una ciudad.
+
+    Args:
+        ciudad (str): Nombre de la ciudad (se ignoran acentos y mayúsculas)
+
+    Returns:
+        List[dict]: Entradas del índice con 'sistema', 'clase', 'tag' y 'meta'
+    """
+    return cargar_indice().get(normalizar(ciudad), [])
@@ -0,0 +1,89 @@
+"""
+Tests para indice_ciudades.py
+Este archivo contiene pruebas para verificar el índice de ciudades de pybikes,
+su caché en disco y su uso desde buscar_sistema_por_ciudad.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+import indice_ciudades
+from catalogo_pybikes import recorrer_instancias
+from indice_ciudades import normalizar, construir_indice, cargar_indice, ruta_cache, olvidar_indice
+from ej1d1 import buscar_sistema_por_ciudad
+
+
+@pytest.fixture(autouse=True)
+def indice_limpio(tmp_path, monkeypatch):
+    """
+    Fixture que descarta el índice en memoria antes y después de cada prueba y lleva
+    la caché en disco a un directorio temporal
+    """
+    monkeypatch.setenv(indice_ciudades.VARIABLE_DIRECTORIO_CACHE, str(tmp_path / "cache"))
+    olvidar_indice()
+    yield
+    olvidar_indice()
+
+
+def test_normalizar():
+    assert normalizar("  São   Paulo ") == "sao paulo", "Debe quitar acentos y espacios sobrantes"
+    assert normalizar("MÜNCHEN") == normalizar("München") == "munchen"
+    assert normalizar(None) == ""
+
+
+def test_recorrer_instancias_multiclase():
+    """
+    Verificar que se recorren tanto los ficheros de una clase como los de varias
+    """
+    simple = {"class": "Bicing", "instances": [{"tag": "bicing"}]}
+    multiclase = {"class": {"A": {"instances": [{"tag": "a1"}, {"tag": "a2"}]}, "B": {"instances": [{"tag": "b1"}]}}}
+    assert [tag["tag"] for _, tag in recorrer_instancias(simple)] == ["bicing"]
+    assert [(clase, i["tag"]) for clase, i in recorrer_instancias(multiclase)] == [("A", "a1"), ("A", "a2"), ("B", "b1")]
+
+
+def test_construir_indice():
+    """
+    Verificar que el índice contiene Barcelona y que la carga con hilos da el mismo resultado
+    """
+    indice = construir_indice()
+    assert "barcelona" in indice, "Barcelona debe estar en el índice"
+    assert "bicing" in [entrada["tag"] for entrada in indice["barcelona"]]
+    assert construir_indice(ejecutor="hilos", max_workers=4) == indice, "La carga en paralelo debe ser equivalente"
+    with pytest.raises(ValueError):
+        construir_indice(ejecutor="desconocido")
+
+
+def test_cache_en_disco(tmp_path):
+    """
+    Verificar que el índice se guarda en disco y se reutiliza sin reconstruirlo
+    """
+    indice = cargar_indice(directorio_cache=str(tmp_path))
+    assert os.path.exists(ruta_cache(str(tmp_path))), "Debe escribirse la caché en disco"
+    assert indice_ciudades.version_pybikes() in ruta_cache(str(tmp_path)), "La caché depende de la versión"
+
+    olvidar_indice()
+    with patch("indice_ciudades.construir_indice") as mock_construir:
+        assert cargar_indice(directorio_cache=str(tmp_path)) == indice
+    assert not mock_construir.called, "Con caché en disco no debe reconstruirse el índice"
+
+
+def test_buscar_sistema_por_ciudad_usa_indice(tmp_path):
+    """
+    Verificar que buscar_sistema_por_ciudad consulta el índice una sola vez
+    """
+    cargar_indice(directorio_cache=str(tmp_path))
+    with patch("pybikes.getDataFile") as mock_get_data_file:
+        assert "bicing" in buscar_sistema_por_ciudad("Barcelona")
+        assert "bicing" in buscar_sistema_por_ciudad("barcelona"), "La búsqueda no distingue mayúsculas"
+    assert not mock_get_data_file.called, "No deben volver a leerse los ficheros de datos"
+
+
+def test_directorio_cache_por_entorno(tmp_path):
+    """
+    Verificar que PYBIKES_INDICE_DIR decide dónde se guarda la caché si no se indica directorio
+    """
+    assert ruta_cache().startswith(str(tmp_path / "cache")), "Debe usarse el directorio de la variable de entorno"
+    assert ruta_cache(str(tmp_path / "otro")).startswith(str(tmp_path / "otro")), "El parámetro tiene prioridad"
+    cargar_indice()
+    assert os.path.exists(ruta_cache()), "La caché debe escribirse en el directorio de la variable de entorno"
@@ -0,0 +1,245 @@
+"""
+Benchmarks de los clientes y servidores de todos los ejercicios.
+
+Los *_test.py solo comprueban que los resultados son correctos, y los *_bench.py
+de cada carpeta miden optimizaciones concretas. Este script mide en un solo paso los
+caminos principales de los ejercicios, sin depender de la red:
+
+- servidores: tiempo por petición de /ip (ej1a3) y /time (ej1b3) con keep-alive del
+  cliente, y de /status y /station/<id> del proxy GBFS (gbfs_proxy) sobre el simulador
+- clientes: latencia de get_user_ip, get_user_ip_json y get_response_info (ej1a1,
+  ej1a2) con la API de ipify simulada, y de request_with_error_handling (ej1b2)
+  contra el servidor /time local
+- parseo: get_stations_status (ej1c3) contra el simulador GBFS local y
+  create_stations_dataframe (ej1c2), para 500, 5.000 y 50.000 estaciones
+- pybikes: buscar_sistema_por_ciudad (ej1d1) con el índice en memoria y el
+  recorrido completo de los ficheros de datos para construirlo
+
+Cada resultado es la mediana de --repeat ejecuciones, en milisegundos por operación.
+Con --save se guardan como referencia en bench_baseline.json y con --check se
+comparan con esa referencia: si alguno empeora más de --tolerance (por defecto un
+50 %) el script termina con código 1.
+
+Uso:
+    python bench.py [--groups servidores clientes parseo pybikes] [--stations 500 5000 50000]
+                    [--repeat 5] [--save | --check] [--tolerance 0.5]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import timeit
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cli import RAIZ, cargar_modulo
+
+BASELINE_PATH = os.path.join(RAIZ, "bench_baseline.json")
+GROUPS = ("servidores", "clientes", "parseo", "pybikes")
+
+# Un caso es (nombre, función a medir, operaciones que realiza cada llamada)
+Caso = Tuple[str, Callable[[], Any], int]
+
+
+def arrancar(stack: contextlib.ExitStack, server) -> str:
+    """
+    Arranca un servidor en un hilo, registra su parada y devuelve su URL base.
+    """
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def parar():
+        server.shutdown()
+        server.server_close()
+        thread.join(1)
+    stack.callback(parar)
+    return f"http://localhost:{server.server_port}"
+
+
+def casos_servidores(stack: contextlib.ExitStack, args) -> Iterator[Caso]:
+    import requests
+
+    # Los servidores escriben una línea de log por petición en stderr
+    stack.enter_context(contextlib.redirect_stderr(io.StringIO()))
+    peticiones = 50
+    for ruta, (carpeta, nombre) in (("/ip", ("1a", "ej1a3")), ("/time", ("1b", "ej1b3"))):
+        url = arrancar(stack, cargar_modulo(carpeta, nombre).create_server("localhost", 0)) + ruta
+        session = stack.enter_context(requests.Session())
+
+        def lote(url=url, session=session):
+            return [session.get(url) for _ in range(peticiones)]
+        yield f"servidor {ruta}", lote, peticiones
+
+    gbfs_simulator = cargar_modulo("1c", "gbfs_simulator")
+    gbfs_proxy = cargar_modulo("1c", "gbfs_proxy")
+    upstream = arrancar(stack, gbfs_simulator.create_server("localhost", 0, stations=500, ttl=0))
+    proxy = gbfs_proxy.create_server("localhost", 0, base_url=f"{upstream}/en")
+    proxy.proxy.start()
+    stack.callback(proxy.proxy.stop, 1)
+    url_proxy = arrancar(stack, proxy)
+    proxy.proxy.wait_ready(10)
+    session = stack.enter_context(requests.Session())
+    for ruta in ("/status", "/station/1"):
+        def lote(url=url_proxy + ruta):
+            return [session.get(url) for _ in range(peticiones)]
+        yield f"proxy {ruta}", lote, peticiones
+
+
+def casos_clientes(stack: contextlib.ExitStack, args) -> Iterator[Caso]:
+    import responses
+
+    ej1a1 = cargar_modulo("1a", "ej1a1")
+    ej1a2 = cargar_modulo("1a", "ej1a2")
+    ej1b2 = cargar_modulo("1b", "ej1b2")
+    ej1b3 = cargar_modulo("1b", "ej1b3")
+
+    stack.enter_context(contextlib.redirect_stderr(io.StringIO()))
+    url_time = arrancar(stack, ej1b3.create_server("localhost", 0)) + "/time"
+    yield "cliente request_with_error_handling", lambda: ej1b2.request_with_error_handling(url_time), 1
+
+    # ipify se simula: se mide el coste del cliente, no el de la red
+    rsps = stack.enter_context(responses.RequestsMock(assert_all_requests_are_fired=False))
+    rsps.add_passthru(url_time)
+    rsps.add(responses.GET, "https://api.ipify.org", body="203.0.113.7")
+    rsps.add(responses.GET, "https://api.ipify.org?format=json", json={"ip": "203.0.113.7"})
+    yield "cliente get_user_ip", ej1a1.get_user_ip, 1
+    yield "cliente get_user_ip_json", ej1a2.get_user_ip_json, 1
+    yield "cliente get_response_info", ej1a2.get_response_info, 1
+
+
+def casos_parseo(stack: contextlib.ExitStack, args) -> Iterator[Caso]:
+    ej1c2 = cargar_modulo("1c", "ej1c2")
+    ej1c3 = cargar_modulo("1c", "ej1c3")
+    gbfs_simulator = cargar_modulo("1c", "gbfs_simulator")
+
+    for n in args.stations:
+        server = gbfs_simulator.create_server("localhost", 0, stations=n, ttl=0)
+        url = arrancar(stack, server)
+        client = ej1c3.BarcelonaBikingClient(base_url=f"{url}/en")
+        yield f"get_stations_status {n}", client.get_stations_status, 1
+
+        body, _ = server.simulator.station_information()
+        stations_data = json.loads(body)["data"]
+        yield f"create_stations_dataframe {n}", lambda data=stations_data: ej1c2.create_stations_dataframe(data), 1
+
+
+def casos_pybikes(stack: contextlib.ExitStack, args) -> Iterator[Caso]:
+    ej1d1 = cargar_modulo("1d", "ej1d1")
+    indice_ciudades = cargar_modulo("1d", "indice_ciudades")
+    catalogo = cargar_modulo("1d", "catalogo_pybikes").obtener_catalogo()
+
+    def recorrido_completo():
+        catalogo.olvidar()
+        return indice_ciudades.construir_indice()
+
+    yield "pybikes construir_indice", recorrido_completo, 1
+    indice_ciudades.cargar_indice(usar_cache=False)
+    yield "pybikes buscar_sistema_por_ciudad", lambda: ej1d1.buscar_sistema_por_ciudad("Barcelona"), 1
+
+
+CASOS = {
+    "servidores": casos_servidores,
+    "clientes": casos_clientes,
+    "parseo": casos_parseo,
+    "pybikes": casos_pybikes,
+}
+
+
+def medir(funcion: Callable[[], Any], operaciones: int, repeat: int) -> float:
+    """
+    Mediana del tiempo por operación, en milisegundos, tras una ejecución de calentamiento.
+    """
+    funcion()
+    tiempos = timeit.repeat(funcion, number=1, repeat=repeat)
+    return statistics.median(tiempos) / operaciones * 1000
+
+
+def ejecutar(groups: List[str], args) -> Dict[str, float]:
+    """
+    Ejecuta los benchmarks de los grupos indicados.
+
+    Returns:
+        Dict[str, float]: Milisegundos por operación de cada caso
+    """
+    resultados: Dict[str, float] = {}
+    for group in groups:
+        with contextlib.ExitStack() as stack:
+            for nombre, funcion, operaciones in CASOS[group](stack, args):
+                resultados[nombre] = medir(funcion, operaciones, args.repeat)
+                print(f"{nombre:<45} {resultados[nombre]:>10.3f} ms", flush=True)
+    return resultados
+
+
+def comparar(resultados: Dict[str, float], referencia: Dict[str, float],
+             tolerance: float) -> Dict[str, Tuple[float, float, float]]:
+    """
+    Compara los resultados con la referencia.
+
+    Args:
+        resultados: Milisegundos por operación medidos ahora
+        referencia: Milisegundos por operación de la referencia guardada
+        tolerance: Empeoramiento relativo admitido (0.5 = un 50 % más lento)
+
+    Returns:
+        Dict[str, Tuple[float, float, float]]: Casos que empeoran más de lo admitido,
+                                               con (referencia, actual, ratio)
+    """
+    regresiones = {}
+    for nombre, actual in resultados.items():
+        base = referencia.get(nombre)
+        if base and actual > base * (1 + tolerance):
+            regresiones[nombre] = (base, actual, actual / base)
+    return regresiones
+
+
+def cargar_referencia(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_referencia(resultados: Dict[str, float], args, path: str = BASELINE_PATH) -> None:
+    referencia: Dict[str, Any] = {"resultados": {}}
+    if os.path.exists(path):
+        referencia = cargar_referencia(path)
+    referencia["resultados"].update({nombre: round(ms, 4) for nombre, ms in resultados.items()})
+    referencia["python"] = platform.python_version()
+    referencia["plataforma"] = platform.platform()
+    referencia["repeat"] = args.repeat
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(referencia, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--stations", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    accion = parser.add_mutually_exclusive_group()
+    accion.add_argument("--save", action="store_true", help="Guarda los resultados como referencia")
+    accion.add_argument("--check", action="store_true", help="Compara con la referencia guardada")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Fichero de referencia")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.groups, args)
+    if args.save:
+        guardar_referencia(resultados, args, args.baseline)
+        print(f"Referencia guardada en {args.baseline}")
+    elif args.check:
+        regresiones = comparar(resultados, cargar_referencia(args.baseline)["resultados"], args.tolerance)
+        for nombre, (base, actual, ratio) in regresiones.items():
+            print(f"REGRESIÓN {nombre}: {base:.3f} ms -> {actual:.3f} ms (x{ratio:.2f})")
+        if regresiones:
+            return 1
+        print(f"Sin regresiones (tolerancia {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Tests para bench.py
+Este archivo contiene pruebas para verificar la referencia guardada de los
+benchmarks y la detección de regresiones.
+"""
+
+import json
+
+from bench import comparar, main
+
+
+def test_comparar():
+    referencia = {"a": 1.0, "b": 2.0}
+    regresiones = comparar({"a": 1.4, "b": 3.5, "nuevo": 9.0}, referencia, tolerance=0.5)
+    assert list(regresiones) == ["b"], "Solo deben marcarse los casos que empeoran más de la tolerancia"
+    assert regresiones["b"] == (2.0, 3.5, 1.75)
+    assert comparar({"a": 0.5}, referencia, tolerance=0.0) == {}, "Mejorar nunca es una regresión"
+
+
+def test_guardar_y_comprobar(tmp_path, capsys):
+    """
+    Verificar que se guarda la referencia y que --check detecta una regresión
+    """
+    baseline = tmp_path / "baseline.json"
+    argumentos = ["--groups", "parseo", "--stations", "50", "--repeat", "1", "--baseline", str(baseline)]
+    assert main(argumentos + ["--save"]) == 0
+    referencia = json.loads(baseline.read_text())
+    assert set(referencia["resultados"]) == {"get_stations_status 50", "create_stations_dataframe 50"}
+
+    assert main(argumentos + ["--check", "--tolerance", "100"]) == 0
+
+    referencia["resultados"] = {nombre: 1e-9 for nombre in referencia["resultados"]}
+    baseline.write_text(json.dumps(referencia))
+    assert main(argumentos + ["--check"]) == 1, "Si todo es más lento que la referencia debe fallar"
+    assert "REGRESIÓN" in capsys.readouterr().out
@@ -0,0 +1,343 @@
+"""
+Punto de entrada único para los clientes y servidores de los ejercicios del tema.
+
+Cada ejercicio tiene su propio bloque if __name__ == "__main__" con los argumentos
+fijos. Este script agrupa todos en subcomandos:
+
+    python cli.py ip [--info]
+    python cli.py serve {ip,time,gbfs,gbfs-proxy} [--host HOST] [--port PUERTO]
+    python cli.py check-url URL
+    python cli.py feeds
+    python cli.py stations [--id ID] [--limit N]
+    python cli.py status [--id ID] [--min-bikes N] [--vehicle-type TIPO] [--top K]
+    python cli.py pybikes {sistemas,buscar,info,estaciones} ...
+
+Los módulos de los ejercicios viven en carpetas distintas (1a, 1b, 1c, 1d) y solo
+se importa el del subcomando elegido, de modo que 'ip' no carga pandas ni pybikes.
+
+Los subcomandos de cliente admiten --repeat y --concurrency para hacer pequeñas
+pruebas de carga: la acción se repite N veces con C hilos y se muestra un resumen
+de latencias y errores en lugar del resultado. Con --metrics, además, se miden las
+fases de cada petición HTTP (DNS, conexión, TLS, espera y descarga) y al terminar
+se escriben por stderr las métricas en formato Prometheus:
+
+    python cli.py --metrics status --repeat 20 --concurrency 4
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def cargar_modulo(carpeta: str, nombre: str):
+    """
+    Importa el módulo de un ejercicio a partir de su carpeta.
+
+    Los módulos de cada carpeta se importan entre sí por su nombre, así que la
+    carpeta se añade a sys.path antes de importarlo.
+
+    Args:
+        carpeta (str): Carpeta del ejercicio ('1a', '1b', '1c' o '1d')
+        nombre (str): Nombre del módulo (por ejemplo, 'ej1c3')
+
+    Returns:
+        module: Módulo importado
+    """
+    ruta = os.path.join(RAIZ, carpeta)
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
+    return importlib.import_module(nombre)
+
+
+def estado_a_dict(station) -> Dict[str, Any]:
+    """
+    Convierte un StationStatusInfo en un diccionario serializable.
+    """
+    return {
+        'station_id': station.station_id,
+        'status': station.status.name,
+        'num_bikes_available': station.num_bikes_available,
+        'num_bikes_disabled': station.num_bikes_disabled,
+        'num_docks_available': station.num_docks_available,
+        'is_operational': station.is_operational,
+        'last_reported': station.last_reported,
+        'vehicle_types_available': station.vehicle_types_available,
+    }
+
+
+# Acciones de los subcomandos: cada una devuelve una función sin argumentos que
+# realiza una petición y devuelve un resultado serializable (None si hay error)
+
+def accion_ip(args) -> Callable[[], Any]:
+    if args.info:
+        return cargar_modulo('1a', 'ej1a2').get_response_info
+    ej1a1 = cargar_modulo('1a', 'ej1a1')
+
+    def accion():
+        ip = ej1a1.get_user_ip()
+        return {'ip': ip} if ip else None
+    return accion
+
+
+def accion_check_url(args) -> Callable[[], Any]:
+    request_with_error_handling = cargar_modulo('1b', 'ej1b2').request_with_error_handling
+    return lambda: request_with_error_handling(args.url)
+
+
+def accion_feeds(args) -> Callable[[], Any]:
+    ej1c1 = cargar_modulo('1c', 'ej1c1')
+    return lambda: ej1c1.extract_feeds_info(ej1c1.get_gbfs_feeds())
+
+
+def accion_stations(args) -> Callable[[], Any]:
+    ej1c2 = cargar_modulo('1c', 'ej1c2')
+
+    def accion():
+        stations_data = ej1c2.get_stations_data()
+        if stations_data is None:
+            return None
+        if args.id is not None:
+            return ej1c2.get_station_info(stations_data, args.id)
+        stations = stations_data.get('stations', [])
+        return {
+            'total': len(stations),
+            'stations': [
+                {'station_id': s.get('station_id'), 'name': s.get('name'), 'lat': s.get('lat'), 'lon': s.get('lon')}
+                for s in stations[:args.limit]
+            ],
+        }
+    return accion
+
+
+def accion_status(args) -> Callable[[], Any]:
+    ej1c3 = cargar_modulo('1c', 'ej1c3')
+    client = ej1c3.BarcelonaBikingClient()
+
+    def accion():
+        snapshot = client.get_snapshot(max_age=0)
+        if not len(snapshot):
+            return None
+        if args.id is not None:
+            station = snapshot.find_station_by_id(args.id)
+            return estado_a_dict(station) if station else None
+        if args.top:
+            stations = snapshot.get_top_stations(args.top, args.vehicle_type, args.operational)
+        else:
+            stations = snapshot.get_stations_with_available_bikes(args.min_bikes, args.vehicle_type, args.operational)
+        return {
+            'last_updated': snapshot.last_updated,
+            'total': len(snapshot),
+            'matching': len(stations),
+            'stations': [estado_a_dict(station) for station in stations[:args.limit]],
+        }
+    return accion
+
+
+def accion_pybikes(args) -> Callable[[], Any]:
+    ej1d1 = cargar_modulo('1d', 'ej1d1')
+    if args.pybikes_accion == 'sistemas':
+        return ej1d1.listar_sistemas_disponibles
+    if args.pybikes_accion == 'buscar':
+        return lambda: ej1d1.buscar_sistema_por_ciudad(args.ciudad)
+    if args.pybikes_accion == 'info':
+        return lambda: ej1d1.obtener_info_sistema(args.tag)
+
+    def accion():
+        resultados, errores = ej1d1.obtener_estaciones_multi(args.tags, workers=args.workers, timeout=args.timeout)
+        return {
+            'estaciones': {tag: len(estaciones or []) for tag, estaciones in resultados.items()},
+            'errores': errores,
+        }
+    return accion
+
+
+# Servidores: (carpeta, módulo) de cada servidor de 'serve'
+SERVIDORES: Dict[str, Tuple[str, str]] = {
+    'ip': ('1a', 'ej1a3'),
+    'time': ('1b', 'ej1b3'),
+    'gbfs': ('1c', 'gbfs_simulator'),
+    'gbfs-proxy': ('1c', 'gbfs_proxy'),
+}
+
+
+def comando_serve(args) -> int:
+    carpeta, nombre = SERVIDORES[args.servidor]
+    modulo = cargar_modulo(carpeta, nombre)
+    server = modulo.create_server(args.host, args.port)
+    modulo.run_server(server)
+    return 0
+
+
+def es_error(resultado: Any) -> bool:
+    """
+    Indica si el resultado de una acción corresponde a una petición fallida.
+    """
+    return resultado is None or (isinstance(resultado, dict) and resultado.get('success') is False)
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """
+    Percentil p (0-100) de una lista ordenada, por el método del rango más cercano.
+    """
+    if not valores:
+        return 0.0
+    posicion = max(math.ceil(p / 100 * len(valores)) - 1, 0)
+    return valores[min(posicion, len(valores) - 1)]
+
+
+def repetir(accion: Callable[[], Any], repeat: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Ejecuta una acción varias veces en paralelo y resume latencias y errores.
+
+    Args:
+        accion: Función sin argumentos que realiza una petición
+        repeat (int): Número total de ejecuciones
+        concurrency (int): Número de ejecuciones simultáneas
+
+    Returns:
+        Dict[str, Any]: Resumen con el número de errores, peticiones por segundo y
+                        latencias en milisegundos (mínima, media, p50, p95 y máxima)
+    """
+    def medir(_):
+        inicio = time.perf_counter()
+        try:
+            error = es_error(accion())
+        except Exception:
+            error = True
+        return time.perf_counter() - inicio, error
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        mediciones = list(executor.map(medir, range(repeat)))
+    duracion = time.perf_counter() - inicio
+
+    latencias = sorted(segundos * 1000 for segundos, _ in mediciones)
+    return {
+        'repeticiones': repeat,
+        'concurrencia': concurrency,
+        'errores': sum(error for _, error in mediciones),
+        'duracion_s': round(duracion, 3),
+        'peticiones_por_segundo': round(repeat / duracion, 2) if duracion else None,
+        'latencia_ms': {
+            'min': round(latencias[0], 2) if latencias else None,
+            'media': round(sum(latencias) / len(latencias), 2) if latencias else None,
+            'p50': round(percentil(latencias, 50), 2),
+            'p95': round(percentil(latencias, 95), 2),
+            'max': round(latencias[-1], 2) if latencias else None,
+        },
+    }
+
+
+def imprimir(resultado: Any) -> None:
+    print(json.dumps(resultado, ensure_ascii=False, indent=2, default=str))
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos con todos los subcomandos.
+    """
+    parser = argparse.ArgumentParser(prog='cli.py', description='Clientes y servidores del tema 1.')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Muestra por stderr las métricas de las peticiones HTTP (formato Prometheus)')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    carga = argparse.ArgumentParser(add_help=False)
+    carga.add_argument('--repeat', type=int, default=1, help='Número de veces que se repite la petición')
+    carga.add_argument('--concurrency', type=int, default=1, help='Peticiones simultáneas al repetir')
+
+    ip = subparsers.add_parser('ip', parents=[carga], help='IP pública (ej1a1/ej1a2)')
+    ip.add_argument('--info', action='store_true', help='Información completa de la respuesta')
+    ip.set_defaults(accion=accion_ip)
+
+    serve = subparsers.add_parser('serve', help='Arranca uno de los servidores HTTP')
+    serve.add_argument('servidor', choices=sorted(SERVIDORES))
+    serve.add_argument('--host', default='localhost')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.set_defaults(comando_directo=comando_serve)
+
+    check_url = subparsers.add_parser('check-url', parents=[carga], help='Comprueba una URL (ej1b2)')
+    check_url.add_argument('url')
+    check_url.set_defaults(accion=accion_check_url)
+
+    feeds = subparsers.add_parser('feeds', parents=[carga], help='Feeds GBFS de Barcelona (ej1c1)')
+    feeds.set_defaults(accion=accion_feeds)
+
+    stations = subparsers.add_parser('stations', parents=[carga], help='Información de estaciones (ej1c2)')
+    stations.add_argument('--id', help='ID de la estación')
+    stations.add_argument('--limit', type=int, default=10, help='Número de estaciones mostradas')
+    stations.set_defaults(accion=accion_stations)
+
+    status = subparsers.add_parser('status', parents=[carga], help='Estado de las estaciones (ej1c3)')
+    status.add_argument('--id', help='ID de la estación')
+    status.add_argument('--min-bikes', type=int, default=1)
+    status.add_argument('--vehicle-type', help='Tipo de vehículo (por ejemplo, ICONIC)')
+    status.add_argument('--operational', action='store_true', help='Solo estaciones operativas')
+    status.add_argument('--top', type=int, help='Las K estaciones con más bicicletas')
+    status.add_argument('--limit', type=int, default=10, help='Número de estaciones mostradas')
+    status.set_defaults(accion=accion_status)
+
+    pybikes = subparsers.add_parser('pybikes', help='Sistemas de pybikes (ej1d1)')
+    pybikes_sub = pybikes.add_subparsers(dest='pybikes_accion', required=True)
+    sistemas = pybikes_sub.add_parser('sistemas', parents=[carga], help='Lista los sistemas disponibles')
+    sistemas.set_defaults(accion=accion_pybikes)
+    buscar = pybikes_sub.add_parser('buscar', parents=[carga], help='Sistemas de una ciudad')
+    buscar.add_argument('ciudad')
+    buscar.set_defaults(accion=accion_pybikes)
+    info = pybikes_sub.add_parser('info', parents=[carga], help='Metadatos de un sistema')
+    info.add_argument('tag')
+    info.set_defaults(accion=accion_pybikes)
+    estaciones = pybikes_sub.add_parser('estaciones', parents=[carga], help='Estaciones de una o varias redes')
+    estaciones.add_argument('tags', nargs='+')
+    estaciones.add_argument('--workers', type=int, default=8)
+    estaciones.add_argument('--timeout', type=float, default=30.0)
+    estaciones.set_defaults(accion=accion_pybikes)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ejecuta el subcomando indicado.
+
+    Returns:
+        int: Código de salida (0 si todo ha ido bien, 1 si ha habido algún error)
+    """
+    args = crear_parser().parse_args(argv)
+    if getattr(args, 'comando_directo', None):
+        return args.comando_directo(args)
+
+    if not args.metrics:
+        return ejecutar_accion(args)
+
+    from comun import instrumentacion_http
+    from comun.metricas import RegistroMetricas
+
+    registro = RegistroMetricas()
+    with instrumentacion_http.instrumentado(registro):
+        codigo = ejecutar_accion(args)
+    print(registro.exportar_prometheus(), end='', file=sys.stderr)
+    return codigo
+
+
+def ejecutar_accion(args) -> int:
+    accion = args.accion(args)
+    if args.repeat > 1:
+        resumen = repetir(accion, args.repeat, args.concurrency)
+        imprimir(resumen)
+        return 1 if resumen['errores'] else 0
+
+    resultado = accion()
+    imprimir(resultado)
+    return 1 if es_error(resultado) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
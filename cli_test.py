@@ -0,0 +1,120 @@
+"""
+Tests para cli.py
+Este archivo contiene pruebas para verificar los subcomandos del punto de entrada
+único, la carga perezosa de los módulos y las repeticiones con --repeat/--concurrency.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+import responses
+from unittest.mock import patch
+
+import cli
+from cli import main, percentil, cargar_modulo
+
+STATUS_URL = "https://barcelona.publicbikesystem.net/customer/gbfs/v2/en/station_status"
+
+
+@pytest.fixture
+def mock_responses():
+    """
+    Fixture que simula las respuestas HTTP de una URL de prueba y de station_status
+    """
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add(responses.GET, "https://httpstatuses.maor.io/200", json={"code": 200}, status=200)
+        rsps.add(responses.GET, "https://httpstatuses.maor.io/500", json={"code": 500}, status=500)
+        rsps.add(responses.GET, STATUS_URL, json={
+            "last_updated": 1759835019,
+            "ttl": 0,
+            "data": {"stations": [
+                {"station_id": "1", "num_bikes_available": 12, "num_bikes_disabled": 0, "num_docks_available": 3,
+                 "last_reported": 1759834959, "status": "IN_SERVICE", "is_renting": True, "is_returning": True},
+                {"station_id": "2", "num_bikes_available": 0, "num_bikes_disabled": 1, "num_docks_available": 20,
+                 "last_reported": 1759834959, "status": "IN_SERVICE", "is_renting": True, "is_returning": True},
+            ]},
+        })
+        yield rsps
+
+
+def salida_json(capsys):
+    return json.loads(capsys.readouterr().out)
+
+
+def test_check_url(mock_responses, capsys):
+    assert main(["check-url", "https://httpstatuses.maor.io/200"]) == 0
+    assert salida_json(capsys)["success"] is True
+
+    assert main(["check-url", "https://httpstatuses.maor.io/500"]) == 1, "Un error debe dar código de salida 1"
+    assert salida_json(capsys)["status_code"] == 500
+
+
+def test_metrics(mock_responses, capsys):
+    """
+    Verificar que --metrics escribe las métricas de las peticiones por stderr
+    """
+    assert main(["--metrics", "check-url", "https://httpstatuses.maor.io/200", "--repeat", "3"]) == 0
+    salida = capsys.readouterr()
+    assert json.loads(salida.out)["repeticiones"] == 3
+    assert 'http_client_requests_total{host="httpstatuses.maor.io",method="GET",status="200"} 3' in salida.err
+    assert "http_client_request_duration_seconds_bucket" in salida.err
+
+
+def test_repeat_y_concurrency(mock_responses, capsys):
+    """
+    Verificar que --repeat/--concurrency muestran un resumen de la prueba de carga
+    """
+    assert main(["check-url", "https://httpstatuses.maor.io/200", "--repeat", "6", "--concurrency", "3"]) == 0
+    resumen = salida_json(capsys)
+    assert resumen["repeticiones"] == 6
+    assert resumen["concurrencia"] == 3
+    assert resumen["errores"] == 0
+    assert resumen["latencia_ms"]["min"] <= resumen["latencia_ms"]["p50"] <= resumen["latencia_ms"]["max"]
+
+    assert main(["check-url", "https://httpstatuses.maor.io/500", "--repeat", "4", "--concurrency", "2"]) == 1
+    assert salida_json(capsys)["errores"] == 4, "Deben contarse todas las peticiones fallidas"
+
+
+def test_status(mock_responses, capsys):
+    assert main(["status"]) == 0
+    resultado = salida_json(capsys)
+    assert resultado["total"] == 2
+    assert [s["station_id"] for s in resultado["stations"]] == ["1"], "Por defecto, estaciones con bicicletas"
+
+    assert main(["status", "--id", "2"]) == 0
+    assert salida_json(capsys)["num_docks_available"] == 20
+
+    assert main(["status", "--id", "99"]) == 1, "Una estación inexistente es un error"
+
+
+def test_serve():
+    """
+    Verificar que 'serve' arranca el servidor indicado con el host y el puerto recibidos
+    """
+    ej1b3 = cargar_modulo("1b", "ej1b3")
+    with patch.object(ej1b3, "create_server") as mock_create, patch.object(ej1b3, "run_server") as mock_run:
+        assert main(["serve", "time", "--host", "127.0.0.1", "--port", "9999"]) == 0
+    mock_create.assert_called_once_with("127.0.0.1", 9999)
+    mock_run.assert_called_once_with(mock_create.return_value)
+
+
+def test_carga_perezosa():
+    """
+    Verificar que un subcomando solo importa el módulo de su ejercicio
+    """
+    codigo = (
+        "import sys, cli; "
+        "cli.accion_ip(cli.crear_parser().parse_args(['ip'])); "
+        "print(','.join(m for m in ('ej1a1', 'ej1c3', 'ej1d1', 'pandas', 'pybikes', 'matplotlib') if m in sys.modules))"
+    )
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == "ej1a1", "Solo debe cargarse el módulo del subcomando"
+
+
+def test_percentil():
+    assert percentil([], 95) == 0.0
+    assert percentil([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert percentil(list(range(1, 101)), 95) == 95
@@ -0,0 +1,6 @@
+"""
+Código compartido por los ejercicios de las distintas carpetas (1a, 1b, 1c, 1d).
+
+Los módulos de cada carpeta se importan entre sí por su nombre; los que necesitan
+algo de este paquete añaden antes la raíz del repositorio a sys.path.
+"""
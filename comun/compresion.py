@@ -0,0 +1,224 @@
+"""
+Negociación de Accept-Encoding y compresión de las respuestas de los servidores.
+
+Las respuestas de ej1a3 y ej1b3 son pequeñas, pero el mismo manejador sirve
+también cuerpos grandes (las instantáneas de estaciones, que son JSON muy
+repetitivo y se reducen a una fracción con gzip). Compresor decide, para cada
+petición, si se comprime y con qué codificación:
+
+- Solo se comprimen los cuerpos de al menos 'umbral' bytes; por debajo las
+  cabeceras y el coste de CPU superan el ahorro.
+- Se elige la codificación con mayor q en Accept-Encoding entre las disponibles
+  (br si está instalado el paquete brotli, gzip y deflate); a igualdad de q gana
+  la primera de ese orden.
+- Los cuerpos que se repiten se comprimen una sola vez y se guardan en una caché
+  LRU; los que cambian en cada petición (como /time o /metrics) se comprimen sin
+  pasar por ella (cachear=False), para no expulsar a los que sí se repiten.
+- Los cuerpos estáticos (como las respuestas del proxy de 1c/gbfs_proxy.py) se
+  preparan de antemano con preparar(), que guarda todas sus versiones comprimidas.
+  Si falta la versión preferida por el cliente se usa la siguiente que acepte.
+"""
+
+import functools
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tamaño mínimo, en bytes, de los cuerpos que se comprimen
+UMBRAL = 1024
+# Codificaciones soportadas, en orden de preferencia del servidor
+CODIFICACIONES = (("br",) if brotli is not None else ()) + ("gzip", "deflate")
+# Cuerpos mayores no se guardan en la caché (para ellos está preparar())
+MAX_TAMANO_CACHE = 64 * 1024
+
+
+@functools.lru_cache(maxsize=256)
+def parsear_accept_encoding(valor: str) -> Dict[str, float]:
+    """
+    Convierte una cabecera Accept-Encoding en un diccionario codificación -> q.
+
+    Los clientes repiten siempre la misma cabecera, así que el resultado se cachea.
+
+    Args:
+        valor (str): Valor de la cabecera (por ejemplo, "gzip, deflate;q=0.5, br;q=0")
+
+    Returns:
+        Dict[str, float]: Peso de cada codificación, en minúsculas
+    """
+    pesos: Dict[str, float] = {}
+    for parte in valor.split(","):
+        token, *parametros = parte.split(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for parametro in parametros:
+            nombre, _, numero = parametro.strip().partition("=")
+            if nombre.strip().lower() == "q":
+                try:
+                    q = float(numero)
+                except ValueError:
+                    q = 0.0
+        pesos["gzip" if token == "x-gzip" else token] = q
+    return pesos
+
+
+def comprimir(body: bytes, codificacion: str, nivel: int = 6) -> bytes:
+    """
+    Comprime un cuerpo con la codificación indicada.
+
+    Args:
+        body (bytes): Cuerpo sin comprimir
+        codificacion (str): 'br', 'gzip' o 'deflate'
+        nivel (int): Nivel de compresión (1-9; en brotli se usa como calidad)
+
+    Returns:
+        bytes: Cuerpo comprimido
+    """
+    if codificacion == "gzip":
+        # mtime=0 hace que el resultado sea siempre el mismo para un mismo cuerpo
+        return gzip.compress(body, compresslevel=nivel, mtime=0)
+    if codificacion == "deflate":
+        # En HTTP, deflate es el formato zlib (RFC 1950), no deflate sin envoltorio
+        return zlib.compress(body, nivel)
+    if codificacion == "br" and brotli is not None:
+        return brotli.compress(body, quality=nivel)
+    raise ValueError(f"Codificación no soportada: {codificacion}")
+
+
+class CuerpoEstatico:
+    """
+    Cuerpo de respuesta con sus versiones comprimidas calculadas de antemano.
+
+    Atributos:
+        body: Cuerpo sin comprimir
+        versiones: Cuerpo comprimido de cada codificación
+    """
+
+    __slots__ = ("body", "versiones")
+
+    def __init__(self, body: bytes, versiones: Dict[str, bytes]):
+        self.body = body
+        self.versiones = versiones
+
+    def __len__(self):
+        return len(self.body)
+
+
+class Compresor:
+    """
+    Decide la codificación de cada respuesta y cachea los cuerpos comprimidos.
+
+    Atributos:
+        umbral: Tamaño mínimo de los cuerpos que se comprimen
+        nivel: Nivel de compresión
+        codificaciones: Codificaciones que se ofrecen, en orden de preferencia
+        aciertos, fallos: Consultas a la caché resueltas sin y con compresión
+    """
+
+    def __init__(self, umbral: int = UMBRAL, nivel: int = 6, codificaciones: Iterable[str] = CODIFICACIONES,
+                 max_cache: int = 128):
+        self.umbral = umbral
+        self.nivel = nivel
+        self.codificaciones = tuple(c for c in codificaciones if c in CODIFICACIONES)
+        self.max_cache = max_cache
+        self.aciertos = 0
+        self.fallos = 0
+        self._cache: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def negociar(self, accept_encoding: Optional[str], tamano: int,
+                 disponibles: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Elige la codificación de una respuesta.
+
+        Args:
+            accept_encoding: Cabecera Accept-Encoding de la petición (None si no hay)
+            tamano: Tamaño del cuerpo sin comprimir
+            disponibles: Codificaciones entre las que se elige (por defecto, todas)
+
+        Returns:
+            Optional[str]: Codificación elegida, o None para enviarlo sin comprimir
+        """
+        if not accept_encoding or tamano < self.umbral:
+            return None
+        pesos = parsear_accept_encoding(accept_encoding)
+        comodin = pesos.get("*", 0.0)
+        elegida, mejor = None, 0.0
+        for codificacion in self.codificaciones:
+            if disponibles is not None and codificacion not in disponibles:
+                continue
+            q = pesos.get(codificacion, comodin)
+            if q > mejor:
+                elegida, mejor = codificacion, q
+        return elegida
+
+    def comprimir(self, body: bytes, codificacion: str, cachear: bool = True) -> bytes:
+        """
+        Comprime un cuerpo, reutilizando el resultado si ya se había comprimido.
+
+        Con cachear=False (cuerpos que no se repiten) no se consulta ni se llena la caché.
+        """
+        if not cachear or len(body) > MAX_TAMANO_CACHE:
+            return comprimir(body, codificacion, self.nivel)
+        clave = (codificacion, body)
+        with self._lock:
+            comprimido = self._cache.get(clave)
+            if comprimido is not None:
+                self._cache.move_to_end(clave)
+                self.aciertos += 1
+                return comprimido
+        comprimido = comprimir(body, codificacion, self.nivel)
+        with self._lock:
+            self.fallos += 1
+            self._cache[clave] = comprimido
+            while len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return comprimido
+
+    def preparar(self, body: bytes) -> CuerpoEstatico:
+        """
+        Comprime de antemano un cuerpo estático con todas las codificaciones.
+        """
+        versiones = {}
+        if len(body) >= self.umbral:
+            for codificacion in self.codificaciones:
+                comprimido = comprimir(body, codificacion, self.nivel)
+                # Un cuerpo que no se reduce se envía sin comprimir
+                if len(comprimido) < len(body):
+                    versiones[codificacion] = comprimido
+        return CuerpoEstatico(body, versiones)
+
+    def codificar(self, body, accept_encoding: Optional[str],
+                  cachear: bool = True) -> Tuple[bytes, Optional[str]]:
+        """
+        Devuelve el cuerpo que hay que enviar y su Content-Encoding.
+
+        Args:
+            body: bytes o CuerpoEstatico
+            accept_encoding: Cabecera Accept-Encoding de la petición
+            cachear: Si el cuerpo comprimido se guarda en la caché (False para los
+                     cuerpos que cambian en cada petición)
+
+        Returns:
+            Tuple[bytes, Optional[str]]: Cuerpo (comprimido o no) y codificación
+                                         (None si no se comprime)
+        """
+        if isinstance(body, CuerpoEstatico):
+            # Solo se elige entre las versiones que se han preparado
+            codificacion = self.negociar(accept_encoding, len(body), body.versiones)
+            return (body.versiones[codificacion], codificacion) if codificacion else (body.body, None)
+        codificacion = self.negociar(accept_encoding, len(body))
+        if codificacion is None:
+            return body, None
+        comprimido = self.comprimir(body, codificacion, cachear)
+        if len(comprimido) >= len(body):
+            return body, None
+        return comprimido, codificacion
@@ -0,0 +1,90 @@
+"""
+Tests para compresion.py
+Este archivo contiene pruebas para verificar la negociación de Accept-Encoding,
+la compresión de los cuerpos y su caché.
+"""
+
+import gzip
+import json
+import os
+import zlib
+import pytest
+
+from comun.compresion import Compresor, CuerpoEstatico, parsear_accept_encoding
+
+CUERPO = json.dumps([{"station_id": str(i), "num_bikes_available": i % 20} for i in range(200)]).encode()
+
+
+def test_parsear_accept_encoding():
+    assert parsear_accept_encoding("gzip, deflate;q=0.5, br;q=0") == {"gzip": 1.0, "deflate": 0.5, "br": 0.0}
+    assert parsear_accept_encoding("X-GZIP;Q=0.3, *;q=0.1") == {"gzip": 0.3, "*": 0.1}
+    assert parsear_accept_encoding("gzip;q=abc") == {"gzip": 0.0}, "Un q inválido no debe aceptarse"
+
+
+@pytest.mark.parametrize("accept_encoding, esperada", [
+    ("gzip, deflate", "gzip"),
+    ("deflate", "deflate"),
+    ("deflate, gzip;q=0.8", "deflate"),
+    ("gzip;q=0, deflate;q=0", None),
+    ("*", "gzip"),
+    ("*, gzip;q=0", "deflate"),
+    ("identity", None),
+    (None, None),
+])
+def test_negociar(accept_encoding, esperada):
+    compresor = Compresor(codificaciones=("gzip", "deflate"))
+    assert compresor.negociar(accept_encoding, len(CUERPO)) == esperada
+
+
+def test_umbral():
+    compresor = Compresor(umbral=1024)
+    assert compresor.codificar(b'{"ip": "127.0.0.1"}', "gzip") == (b'{"ip": "127.0.0.1"}', None), \
+        "Los cuerpos pequeños no deben comprimirse"
+
+
+def test_codificar_y_cache():
+    compresor = Compresor(codificaciones=("gzip", "deflate"))
+    comprimido, codificacion = compresor.codificar(CUERPO, "gzip")
+    assert codificacion == "gzip" and gzip.decompress(comprimido) == CUERPO
+    assert len(comprimido) < len(CUERPO) / 3
+
+    comprimido, codificacion = compresor.codificar(CUERPO, "deflate")
+    assert codificacion == "deflate" and zlib.decompress(comprimido) == CUERPO
+
+    compresor.codificar(bytes(CUERPO), "gzip")
+    assert (compresor.fallos, compresor.aciertos) == (2, 1), \
+        "Un cuerpo igual ya comprimido debe salir de la caché"
+
+
+def test_cuerpo_estatico():
+    compresor = Compresor(codificaciones=("gzip", "deflate"))
+    estatico = compresor.preparar(CUERPO)
+    assert set(estatico.versiones) == {"gzip", "deflate"}
+    assert compresor.codificar(estatico, "deflate") == (estatico.versiones["deflate"], "deflate")
+    assert compresor.codificar(estatico, "identity") == (CUERPO, None)
+    assert compresor.fallos == 0, "Un cuerpo estático no debe volver a comprimirse"
+
+    solo_gzip = CuerpoEstatico(CUERPO, {"gzip": estatico.versiones["gzip"]})
+    assert compresor.codificar(solo_gzip, "deflate, gzip;q=0.5") == (estatico.versiones["gzip"], "gzip"), \
+        "Sin la versión preferida debe usarse la siguiente que acepte el cliente"
+    assert compresor.codificar(solo_gzip, "deflate") == (CUERPO, None)
+
+
+def test_cuerpo_sin_cachear():
+    """
+    Verificar que los cuerpos que cambian en cada petición no ocupan la caché
+    """
+    compresor = Compresor(codificaciones=("gzip",))
+    comprimido, codificacion = compresor.codificar(CUERPO, "gzip", cachear=False)
+    assert codificacion == "gzip" and gzip.decompress(comprimido) == CUERPO
+    assert (compresor.fallos, compresor.aciertos) == (0, 0) and not compresor._cache
+
+
+def test_cuerpo_incompresible():
+    """
+    Verificar que un cuerpo que no se reduce al comprimirlo se envía tal cual
+    """
+    aleatorio = os.urandom(4096)
+    compresor = Compresor()
+    assert compresor.codificar(aleatorio, "deflate") == (aleatorio, None)
+    assert compresor.preparar(aleatorio).versiones == {}
@@ -0,0 +1,288 @@
+"""
+Medición de las fases de cada petición HTTP hecha con requests.
+
+Los clientes de los ejercicios (ej1a1, ej1a2, ej1b2, ej1c1-ej1c3 y pybikes en ej1d1)
+llaman a requests.get o a una Session sin pasar por ningún punto común, y sus tests
+comprueban los argumentos exactos de esas llamadas. Por eso la instrumentación no
+se añade a cada cliente, sino que instalar() envuelve, mientras está activa, las
+capas por las que pasan todas las peticiones:
+
+- requests.Session.send: duración total, código de estado, bytes del cuerpo,
+  reintentos de urllib3 y redirecciones
+- requests.adapters.HTTPAdapter.send: momento en que llegan las cabeceras
+- urllib3 HTTPConnection._new_conn y HTTPSConnection.connect: conexión TCP y TLS
+- socket.getaddrinfo: resolución DNS
+
+Con ello cada petición se descompone en dns, conexion, tls, ttfb (espera desde que
+la conexión está lista hasta las cabeceras) y descarga (lectura del cuerpo). Las
+fases de conexión solo aparecen cuando no se reutiliza una conexión keep-alive.
+
+Cada medición se guarda en histogramas del registro de métricas (comun.metricas),
+exportables en formato Prometheus, y se pasa a los observadores registrados con
+agregar_observador().
+
+    from comun import instrumentacion_http
+    with instrumentacion_http.instrumentado():
+        get_user_ip()
+    print(obtener_registro().exportar_prometheus())
+"""
+
+import contextlib
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+import requests.adapters
+import urllib3.connection
+
+from comun.metricas import BUCKETS_BYTES, RegistroMetricas, obtener_registro
+
+FASES = ("dns", "conexion", "tls", "ttfb", "descarga")
+
+
+@dataclass
+class MedicionPeticion:
+    """
+    Tiempos (en segundos) y resultado de una petición HTTP.
+
+    Atributos:
+        metodo, url, host: Petición realizada
+        status: Código de estado (None si no hubo respuesta)
+        error: Tipo de la excepción si la petición falló
+        total: Duración total, incluidas redirecciones y reintentos
+        dns, conexion, tls, ttfb, descarga: Duración de cada fase
+        bytes: Tamaño del cuerpo recibido (None si no se conoce, por ejemplo con stream=True)
+        reintentos: Reintentos hechos por urllib3
+        redirecciones: Redirecciones seguidas
+    """
+    metodo: str
+    url: str
+    host: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    total: float = 0.0
+    dns: float = 0.0
+    conexion: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    descarga: float = 0.0
+    bytes: Optional[int] = None
+    reintentos: int = 0
+    redirecciones: int = 0
+    _inicio: float = field(default=0.0, repr=False)
+    _cabeceras: Optional[float] = field(default=None, repr=False)
+
+    def fases(self) -> Dict[str, float]:
+        """
+        Devuelve la duración de cada fase.
+        """
+        return {fase: getattr(self, fase) for fase in FASES}
+
+
+Observador = Callable[[MedicionPeticion], None]
+
+_local = threading.local()
+_observadores: List[Observador] = []
+# Funciones originales sustituidas por instalar(), para restaurarlas. No se vacía al
+# desinstalar, por si alguna petición en curso aún pasa por los envoltorios.
+_originales: Dict[str, tuple] = {}
+_instalado = False
+_registro: Optional[RegistroMetricas] = None
+
+
+def _medicion_actual() -> Optional[MedicionPeticion]:
+    return getattr(_local, "medicion", None)
+
+
+def _getaddrinfo(*args, **kwargs):
+    medicion = _medicion_actual()
+    if medicion is None:
+        return _originales["getaddrinfo"][1](*args, **kwargs)
+    inicio = time.perf_counter()
+    try:
+        return _originales["getaddrinfo"][1](*args, **kwargs)
+    finally:
+        medicion.dns += time.perf_counter() - inicio
+
+
+def _new_conn(self):
+    medicion = _medicion_actual()
+    if medicion is None:
+        return _originales["_new_conn"][1](self)
+    inicio, dns = time.perf_counter(), medicion.dns
+    try:
+        return _originales["_new_conn"][1](self)
+    finally:
+        # La resolución DNS ocurre dentro de _new_conn y se cuenta aparte
+        medicion.conexion += time.perf_counter() - inicio - (medicion.dns - dns)
+
+
+def _https_connect(self):
+    medicion = _medicion_actual()
+    if medicion is None:
+        return _originales["https_connect"][1](self)
+    inicio, dns, conexion = time.perf_counter(), medicion.dns, medicion.conexion
+    try:
+        return _originales["https_connect"][1](self)
+    finally:
+        # connect() abre la conexión TCP con _new_conn y después negocia TLS
+        anidado = (medicion.dns - dns) + (medicion.conexion - conexion)
+        medicion.tls += time.perf_counter() - inicio - anidado
+
+
+def _adapter_send(self, request, *args, **kwargs):
+    respuesta = _originales["adapter_send"][1](self, request, *args, **kwargs)
+    medicion = _medicion_actual()
+    if medicion is not None and medicion._cabeceras is None:
+        medicion._cabeceras = time.perf_counter()
+    return respuesta
+
+
+def _session_send(self, request, **kwargs):
+    if _medicion_actual() is not None:
+        # Redirecciones: las mide la llamada exterior
+        return _originales["session_send"][1](self, request, **kwargs)
+
+    medicion = MedicionPeticion(metodo=request.method or "", url=request.url or "",
+                                host=urlsplit(request.url or "").hostname or "")
+    _local.medicion = medicion
+    medicion._inicio = time.perf_counter()
+    try:
+        respuesta = _originales["session_send"][1](self, request, **kwargs)
+    except Exception as e:
+        medicion.error = type(e).__name__
+        medicion.total = time.perf_counter() - medicion._inicio
+        raise
+    else:
+        final = time.perf_counter()
+        medicion.total = final - medicion._inicio
+        _completar(medicion, respuesta, final, kwargs.get("stream", False))
+    finally:
+        _local.medicion = None
+        _registrar(medicion)
+    return respuesta
+
+
+def _completar(medicion: MedicionPeticion, respuesta: requests.Response, final: float, stream: bool) -> None:
+    medicion.status = respuesta.status_code
+    medicion.redirecciones = len(respuesta.history)
+    retries = getattr(getattr(respuesta, "raw", None), "retries", None)
+    medicion.reintentos = len(getattr(retries, "history", None) or ())
+
+    cabeceras = medicion._cabeceras if medicion._cabeceras is not None else final
+    conexion = medicion.dns + medicion.conexion + medicion.tls
+    medicion.ttfb = max(cabeceras - medicion._inicio - conexion, 0.0)
+    medicion.descarga = final - cabeceras
+    if not stream:
+        # Sin stream, Session.send ya ha leído el cuerpo completo
+        medicion.bytes = len(respuesta.content or b"")
+    elif respuesta.headers.get("Content-Length", "").isdigit():
+        medicion.bytes = int(respuesta.headers["Content-Length"])
+
+
+def _registrar(medicion: MedicionPeticion) -> None:
+    registro = _registro or obtener_registro()
+    status = str(medicion.status) if medicion.status is not None else "error"
+    registro.contador("http_client_requests_total", "Peticiones HTTP realizadas",
+                      ("host", "method", "status")).con(medicion.host, medicion.metodo, status).inc()
+    registro.histograma("http_client_request_duration_seconds", "Duración total de las peticiones HTTP",
+                        ("host", "method")).con(medicion.host, medicion.metodo).observar(medicion.total)
+    if medicion.error:
+        registro.contador("http_client_errors_total", "Peticiones HTTP sin respuesta",
+                          ("host", "error")).con(medicion.host, medicion.error).inc()
+    else:
+        fases = registro.histograma("http_client_phase_duration_seconds", "Duración de cada fase de las peticiones",
+                                    ("host", "phase"))
+        for fase, segundos in medicion.fases().items():
+            # Las fases de conexión no existen cuando se reutiliza la conexión
+            if segundos > 0 or fase in ("ttfb", "descarga"):
+                fases.con(medicion.host, fase).observar(segundos)
+    if medicion.bytes is not None:
+        registro.histograma("http_client_response_bytes", "Tamaño del cuerpo de las respuestas",
+                            ("host",), BUCKETS_BYTES).con(medicion.host).observar(medicion.bytes)
+    if medicion.reintentos:
+        registro.contador("http_client_retries_total", "Reintentos de urllib3",
+                          ("host",)).con(medicion.host).inc(medicion.reintentos)
+
+    for observador in list(_observadores):
+        try:
+            observador(medicion)
+        except Exception:
+            # Un observador defectuoso no debe romper la petición que se está midiendo
+            pass
+
+
+def agregar_observador(observador: Observador) -> None:
+    """
+    Registra una función que recibe cada MedicionPeticion al terminar la petición.
+    """
+    _observadores.append(observador)
+
+
+def quitar_observador(observador: Observador) -> None:
+    if observador in _observadores:
+        _observadores.remove(observador)
+
+
+def instalado() -> bool:
+    return _instalado
+
+
+def instalar(registro: Optional[RegistroMetricas] = None) -> None:
+    """
+    Activa la medición de todas las peticiones hechas con requests en el proceso.
+
+    Args:
+        registro: Registro donde se guardan las métricas (por defecto, el compartido)
+    """
+    global _registro, _instalado
+    _registro = registro
+    if _instalado:
+        return
+    parches = {
+        "getaddrinfo": (socket, "getaddrinfo", _getaddrinfo),
+        "_new_conn": (urllib3.connection.HTTPConnection, "_new_conn", _new_conn),
+        "https_connect": (urllib3.connection.HTTPSConnection, "connect", _https_connect),
+        "adapter_send": (requests.adapters.HTTPAdapter, "send", _adapter_send),
+        "session_send": (requests.Session, "send", _session_send),
+    }
+    for clave, (objetivo, nombre, envoltorio) in parches.items():
+        _originales[clave] = (objetivo, getattr(objetivo, nombre), nombre)
+        setattr(objetivo, nombre, envoltorio)
+    _instalado = True
+
+
+def desinstalar() -> None:
+    """
+    Restaura las funciones originales de requests, urllib3 y socket.
+    """
+    global _registro, _instalado
+    if _instalado:
+        for objetivo, original, nombre in _originales.values():
+            setattr(objetivo, nombre, original)
+    _instalado = False
+    _registro = None
+
+
+@contextlib.contextmanager
+def instrumentado(registro: Optional[RegistroMetricas] = None) -> Iterator[None]:
+    """
+    Activa la medición dentro de un bloque with.
+
+    Si la medición ya estaba activa, al salir se recupera el registro anterior en
+    lugar de desinstalarla.
+    """
+    global _registro
+    ya_instalado, registro_anterior = instalado(), _registro
+    instalar(registro)
+    try:
+        yield
+    finally:
+        if ya_instalado:
+            _registro = registro_anterior
+        else:
+            desinstalar()
@@ -0,0 +1,151 @@
+"""
+Tests para instrumentacion_http.py
+Este archivo contiene pruebas para verificar la medición de las fases de las
+peticiones hechas con requests contra un servidor HTTP local.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from comun import instrumentacion_http
+from comun.metricas import RegistroMetricas
+
+CUERPO = b'{"ip": "203.0.113.7"}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/inestable" and self.server.fallos > 0:
+            self.server.fallos -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/redirige":
+            self.send_response(302)
+            self.send_header("Location", "/ip")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CUERPO)))
+        self.end_headers()
+        self.wfile.write(CUERPO)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    server = ThreadingHTTPServer(("localhost", 0), Handler)
+    server.fallos = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mediciones():
+    """
+    Fixture que instala la instrumentación con un registro propio y recoge las mediciones
+    """
+    registro = RegistroMetricas()
+    recogidas = []
+    instrumentacion_http.agregar_observador(recogidas.append)
+    with instrumentacion_http.instrumentado(registro):
+        yield registro, recogidas
+    instrumentacion_http.quitar_observador(recogidas.append)
+
+
+def test_fases_de_una_peticion(servidor, mediciones):
+    registro, recogidas = mediciones
+    url = f"http://localhost:{servidor.server_port}/ip"
+    assert requests.get(url).json() == {"ip": "203.0.113.7"}
+
+    assert len(recogidas) == 1, "Debe registrarse una medición por petición"
+    medicion = recogidas[0]
+    assert medicion.host == "localhost" and medicion.metodo == "GET" and medicion.status == 200
+    assert medicion.bytes == len(CUERPO)
+    assert medicion.dns > 0 and medicion.conexion > 0, "Una conexión nueva debe medir DNS y TCP"
+    assert medicion.tls == 0, "Una petición HTTP no negocia TLS"
+    assert medicion.ttfb > 0 and medicion.descarga >= 0
+    assert sum(medicion.fases().values()) == pytest.approx(medicion.total, abs=1e-3), \
+        "Las fases deben sumar la duración total"
+
+    texto = registro.exportar_prometheus()
+    assert 'http_client_requests_total{host="localhost",method="GET",status="200"} 1' in texto
+    assert 'http_client_phase_duration_seconds_count{host="localhost",phase="ttfb"} 1' in texto
+    assert 'http_client_response_bytes_sum{host="localhost"} 21' in texto
+
+
+def test_conexion_reutilizada(servidor, mediciones):
+    """
+    Verificar que con keep-alive solo la primera petición mide la conexión
+    """
+    _, recogidas = mediciones
+    url = f"http://localhost:{servidor.server_port}/ip"
+    with requests.Session() as session:
+        session.get(url)
+        session.get(url)
+    # http.server responde con HTTP/1.0 y cierra la conexión, salvo que se use HTTP/1.1
+    Handler.protocol_version = "HTTP/1.1"
+    try:
+        with requests.Session() as session:
+            session.get(url)
+            session.get(url)
+    finally:
+        Handler.protocol_version = "HTTP/1.0"
+    assert recogidas[2].conexion > 0
+    assert recogidas[3].conexion == 0 and recogidas[3].dns == 0, "La conexión keep-alive no debe medirse de nuevo"
+
+
+def test_reintentos_y_redirecciones(servidor, mediciones):
+    registro, recogidas = mediciones
+    servidor.fallos = 2
+    with requests.Session() as session:
+        session.mount("http://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0, status_forcelist=[503])))
+        assert session.get(f"http://localhost:{servidor.server_port}/inestable").status_code == 200
+        assert session.get(f"http://localhost:{servidor.server_port}/redirige").status_code == 200
+
+    assert recogidas[0].reintentos == 2, "Deben contarse los reintentos de urllib3"
+    assert recogidas[1].redirecciones == 1 and len(recogidas) == 2, \
+        "Una redirección debe medirse dentro de la petición original"
+    assert 'http_client_retries_total{host="localhost"} 2' in registro.exportar_prometheus()
+
+
+def test_errores(mediciones):
+    registro, recogidas = mediciones
+    with pytest.raises(requests.exceptions.ConnectionError):
+        requests.get("http://localhost:1/", timeout=1)
+    assert recogidas[0].error == "ConnectionError" and recogidas[0].status is None
+    assert 'http_client_errors_total{host="localhost",error="ConnectionError"} 1' in registro.exportar_prometheus()
+
+
+def test_desinstalar():
+    originales = (requests.Session.send, requests.adapters.HTTPAdapter.send)
+    with instrumentacion_http.instrumentado():
+        assert instrumentacion_http.instalado()
+        assert requests.Session.send is not originales[0]
+    assert not instrumentacion_http.instalado()
+    assert (requests.Session.send, requests.adapters.HTTPAdapter.send) == originales, \
+        "Al salir deben restaurarse las funciones originales"
+
+
+def test_instrumentado_anidado(servidor):
+    exterior, interior = RegistroMetricas(), RegistroMetricas()
+    url = f"http://localhost:{servidor.server_port}/ip"
+    with instrumentacion_http.instrumentado(exterior):
+        with instrumentacion_http.instrumentado(interior):
+            requests.get(url)
+        assert instrumentacion_http.instalado(), "El bloque interior no debe desinstalar la medición"
+        requests.get(url)
+    assert 'http_client_requests_total{host="localhost",method="GET",status="200"} 1' in interior.exportar_prometheus()
+    assert 'http_client_requests_total{host="localhost",method="GET",status="200"} 1' in exterior.exportar_prometheus(), \
+        "Al salir del bloque interior debe recuperarse el registro anterior"
@@ -0,0 +1,230 @@
+"""
+Registro de métricas en memoria exportable en formato de texto de Prometheus.
+
+Contiene los tres tipos de métricas que usan los clientes y servidores: contadores,
+gauges e histogramas con buckets fijos. Cada métrica tiene una serie por
+combinación de valores de sus etiquetas. El método con() devuelve la serie ya
+resuelta para que el camino caliente (por ejemplo, una petición al servidor) solo
+haga una búsqueda binaria y unas sumas bajo un lock.
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Buckets por defecto para duraciones, en segundos
+BUCKETS_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets por defecto para tamaños, en bytes
+BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatear(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return repr(valor)
+
+
+def _etiquetas_texto(nombres: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    partes = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _nueva_serie(self):
+        raise NotImplementedError
+
+    def con(self, *valores: str):
+        """
+        Devuelve la serie de unos valores de etiquetas (creándola si no existe).
+        """
+        serie = self._series.get(valores)
+        if serie is None:
+            if len(valores) != len(self.etiquetas):
+                raise ValueError(f"{self.nombre} espera las etiquetas {self.etiquetas}")
+            with self._lock:
+                serie = self._series.setdefault(valores, self._nueva_serie())
+        return serie
+
+    def _lineas(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def exportar(self) -> str:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        lineas.extend(self._lineas())
+        return "\n".join(lineas)
+
+
+class _SerieValor:
+    __slots__ = ("valor", "_lock")
+
+    def __init__(self):
+        self.valor = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, cantidad: float = 1.0) -> None:
+        with self._lock:
+            self.valor += cantidad
+
+    def dec(self, cantidad: float = 1.0) -> None:
+        with self._lock:
+            self.valor -= cantidad
+
+    def set(self, valor: float) -> None:
+        self.valor = valor
+
+
+class Contador(_Metrica):
+    """
+    Métrica que solo crece (por ejemplo, número de peticiones).
+    """
+
+    tipo = "counter"
+
+    def _nueva_serie(self):
+        return _SerieValor()
+
+    def inc(self, cantidad: float = 1.0, *valores: str) -> None:
+        self.con(*valores).inc(cantidad)
+
+    def valor(self, *valores: str) -> float:
+        serie = self._series.get(valores)
+        return serie.valor if serie else 0.0
+
+    def _lineas(self):
+        for valores, serie in sorted(self._series.items()):
+            yield f"{self.nombre}{_etiquetas_texto(self.etiquetas, valores)} {_formatear(serie.valor)}"
+
+
+class Gauge(Contador):
+    """
+    Métrica que sube y baja (por ejemplo, peticiones en curso).
+    """
+
+    tipo = "gauge"
+
+
+class _SerieHistograma:
+    __slots__ = ("buckets", "cuentas", "suma", "total", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Una posición por bucket más la de +Inf; se acumulan al exportar
+        self.cuentas = [0] * (len(buckets) + 1)
+        self.suma = 0.0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float) -> None:
+        posicion = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            self.cuentas[posicion] += 1
+            self.suma += valor
+            self.total += 1
+
+
+class Histograma(_Metrica):
+    """
+    Distribución de valores en buckets fijos (por ejemplo, latencias).
+    """
+
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS_SEGUNDOS):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+
+    def _nueva_serie(self):
+        return _SerieHistograma(self.buckets)
+
+    def observar(self, valor: float, *valores: str) -> None:
+        self.con(*valores).observar(valor)
+
+    def _lineas(self):
+        limites = self.buckets + (float("inf"),)
+        for valores, serie in sorted(self._series.items()):
+            with serie._lock:
+                cuentas, suma, total = list(serie.cuentas), serie.suma, serie.total
+            acumulado = 0
+            for limite, cuenta in zip(limites, cuentas):
+                acumulado += cuenta
+                le = 'le="' + _formatear(float(limite)) + '"'
+                yield f"{self.nombre}_bucket{_etiquetas_texto(self.etiquetas, valores, le)} {acumulado}"
+            yield f"{self.nombre}_sum{_etiquetas_texto(self.etiquetas, valores)} {_formatear(suma)}"
+            yield f"{self.nombre}_count{_etiquetas_texto(self.etiquetas, valores)} {total}"
+
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas con nombre único, exportable en formato Prometheus.
+    """
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+
+    def _obtener(self, clase, nombre: str, *args, **kwargs):
+        metrica = self._metricas.get(nombre)
+        if metrica is None:
+            with self._lock:
+                metrica = self._metricas.get(nombre)
+                if metrica is None:
+                    metrica = self._metricas[nombre] = clase(nombre, *args, **kwargs)
+        if type(metrica) is not clase:
+            raise ValueError(f"La métrica {nombre} ya existe con otro tipo")
+        return metrica
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Contador:
+        return self._obtener(Contador, nombre, ayuda, etiquetas)
+
+    def gauge(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Gauge:
+        return self._obtener(Gauge, nombre, ayuda, etiquetas)
+
+    def histograma(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (),
+                   buckets: Sequence[float] = BUCKETS_SEGUNDOS) -> Histograma:
+        return self._obtener(Histograma, nombre, ayuda, etiquetas, buckets)
+
+    def metrica(self, nombre: str) -> Optional[_Metrica]:
+        return self._metricas.get(nombre)
+
+    def exportar_prometheus(self) -> str:
+        """
+        Devuelve todas las métricas en el formato de texto de Prometheus (versión 0.0.4).
+        """
+        bloques: List[str] = [metrica.exportar() for _, metrica in sorted(self._metricas.items())]
+        return "\n".join(bloques) + "\n" if bloques else ""
+
+    def limpiar(self) -> None:
+        """
+        Elimina todas las métricas.
+        """
+        with self._lock:
+            self._metricas.clear()
+
+
+# Registro compartido por todo el proceso
+_registro = RegistroMetricas()
+
+
+def obtener_registro() -> RegistroMetricas:
+    """
+    Devuelve el registro de métricas compartido por el proceso.
+    """
+    return _registro
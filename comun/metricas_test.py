@@ -0,0 +1,79 @@
+"""
+Tests para metricas.py
+Este archivo contiene pruebas para verificar los contadores, gauges e histogramas
+del registro de métricas y su exportación en formato Prometheus.
+"""
+
+import threading
+import pytest
+
+from comun.metricas import RegistroMetricas
+
+
+def test_contador_y_gauge():
+    registro = RegistroMetricas()
+    peticiones = registro.contador("peticiones_total", "Peticiones", ("ruta",))
+    peticiones.con("/ip").inc()
+    peticiones.con("/ip").inc(2)
+    peticiones.inc(1, "/time")
+    assert peticiones.valor("/ip") == 3, "El contador debe acumular los incrementos"
+    assert peticiones.valor("/otra") == 0, "Una serie sin incrementos vale 0"
+
+    en_curso = registro.gauge("en_curso", "Peticiones en curso")
+    en_curso.con().inc()
+    en_curso.con().inc()
+    en_curso.con().dec()
+    assert en_curso.valor() == 1, "El gauge debe poder bajar"
+
+    assert registro.contador("peticiones_total", "Peticiones", ("ruta",)) is peticiones, \
+        "Pedir dos veces la misma métrica debe devolver la misma instancia"
+    with pytest.raises(ValueError):
+        registro.gauge("peticiones_total", "Otro tipo")
+    with pytest.raises(ValueError):
+        peticiones.con("/ip", "sobra")
+
+
+def test_histograma_prometheus():
+    """
+    Verificar que los buckets se exportan acumulados, con +Inf, _sum y _count
+    """
+    registro = RegistroMetricas()
+    latencia = registro.histograma("latencia_seconds", "Latencia", ("ruta",), buckets=(0.1, 0.5, 1))
+    for valor in (0.05, 0.1, 0.3, 2):
+        latencia.observar(valor, "/ip")
+
+    texto = registro.exportar_prometheus()
+    assert "# TYPE latencia_seconds histogram" in texto
+    assert 'latencia_seconds_bucket{ruta="/ip",le="0.1"} 2' in texto, "El límite del bucket es inclusivo"
+    assert 'latencia_seconds_bucket{ruta="/ip",le="0.5"} 3' in texto
+    assert 'latencia_seconds_bucket{ruta="/ip",le="1"} 3' in texto
+    assert 'latencia_seconds_bucket{ruta="/ip",le="+Inf"} 4' in texto
+    assert 'latencia_seconds_sum{ruta="/ip"} 2.45' in texto
+    assert 'latencia_seconds_count{ruta="/ip"} 4' in texto
+    assert texto.endswith("\n")
+
+
+def test_escapado_de_etiquetas():
+    registro = RegistroMetricas()
+    registro.contador("errores_total", "Errores", ("mensaje",)).con('di "hola"\n').inc()
+    assert 'errores_total{mensaje="di \\"hola\\"\\n"} 1' in registro.exportar_prometheus()
+
+
+def test_concurrencia():
+    """
+    Verificar que no se pierden observaciones con varios hilos
+    """
+    registro = RegistroMetricas()
+    latencia = registro.histograma("latencia_seconds", "Latencia")
+
+    def observar():
+        serie = latencia.con()
+        for _ in range(2000):
+            serie.observar(0.01)
+
+    hilos = [threading.Thread(target=observar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert latencia.con().total == 16000, "Deben contarse todas las observaciones"
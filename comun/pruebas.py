@@ -0,0 +1,29 @@
+"""
+Utilidades compartidas por los tests de varias carpetas.
+"""
+
+import subprocess
+import sys
+from typing import Dict
+
+
+def modulos_importados(modulo: str, directorio: str) -> Dict[str, int]:
+    """
+    Importa un módulo en un intérprete nuevo con -X importtime.
+
+    Args:
+        modulo (str): Nombre del módulo a importar
+        directorio (str): Carpeta desde la que se importa (la del ejercicio)
+
+    Returns:
+        Dict[str, int]: Módulos cargados con su tiempo acumulado en microsegundos
+    """
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                            cwd=directorio, capture_output=True, text=True, check=True)
+    modulos = {}
+    for linea in salida.stderr.splitlines():
+        if linea.startswith("import time:") and "|" in linea:
+            _, acumulado, nombre = linea.split("|")
+            if acumulado.strip().isdigit():
+                modulos[nombre.strip()] = int(acumulado)
+    return modulos
@@ -0,0 +1,210 @@
+"""
+Log de accesos de los servidores HTTP escrito en segundo plano.
+
+BaseHTTPRequestHandler.log_message formatea la línea y escribe y vacía stderr en
+cada petición desde el propio hilo que la atiende, y con los servidores de un solo
+hilo (ej1a3, ej1b3) ese trabajo se suma a la latencia de cada respuesta.
+RegistroAccesos solo encola un registro estructurado (un diccionario con la IP, la
+hora, la petición, el código y el tamaño); un hilo escritor recoge todos los que
+haya pendientes, les da formato (texto como el de http.server, o JSON) y los
+escribe de una vez, de modo que bajo carga se hace una escritura por lote y no por
+petición.
+
+Para que el log no pueda frenar ni agotar la memoria del servidor:
+
+- La cola tiene un tamaño máximo; si el escritor no da abasto los registros nuevos
+  se descartan y se cuentan en 'perdidas'.
+- Con muestreo < 1 solo se guarda esa fracción de las respuestas correctas; las de
+  error (código >= 400) se guardan siempre. Las descartadas se cuentan en
+  'descartadas'.
+
+Tras cerrar() ya no hay hilo escritor: los registros que lleguen después (por
+ejemplo, de peticiones que terminan durante el apagado) se escriben en el momento.
+"""
+
+import itertools
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional, TextIO, Union
+
+FORMATOS = ("texto", "json")
+MESES = BaseHTTPRequestHandler.monthname
+# Tabla con la que http.server escapa los caracteres de control de la petición
+_CARACTERES_CONTROL = getattr(BaseHTTPRequestHandler, "_control_char_table", {})
+# Marca que indica al hilo escritor que debe terminar
+_FIN = object()
+
+Registro = Union[str, Dict[str, Any]]
+
+
+def formatear_fecha(segundos: float) -> str:
+    """
+    Formatea una hora como BaseHTTPRequestHandler.log_date_time_string.
+    """
+    año, mes, dia, hh, mm, ss, *_ = time.localtime(segundos)
+    return "%02d/%3s/%04d %02d:%02d:%02d" % (dia, MESES[mes], año, hh, mm, ss)
+
+
+class RegistroAccesos:
+    """
+    Escritor asíncrono, por lotes y con cola limitada de registros de acceso.
+
+    Atributos:
+        lote: Número máximo de registros por escritura
+        muestreo: Fracción de respuestas correctas que se guardan (0-1)
+        formato: 'texto' (como http.server) o 'json' (una línea JSON por registro)
+        escritas: Registros escritos hasta el momento
+        escrituras: Número de escrituras (lotes) realizadas
+        perdidas: Registros descartados por tener la cola llena
+        descartadas: Registros descartados por el muestreo
+    """
+
+    def __init__(self, destino: Optional[TextIO] = None, lote: int = 256, max_pendientes: int = 10000,
+                 muestreo: float = 1.0, formato: str = "texto", seed: Optional[int] = None):
+        """
+        Inicializa el registro (el hilo escritor se arranca con el primer registro).
+
+        Args:
+            destino: Fichero donde se escribe (None, el sys.stderr de cada momento)
+            lote: Número máximo de registros por escritura
+            max_pendientes: Tamaño máximo de la cola de registros pendientes
+            muestreo: Fracción de respuestas correctas que se guardan (0-1)
+            formato: 'texto' o 'json'
+            seed: Semilla del muestreo (None, aleatoria)
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de log desconocido: {formato}")
+        self.destino = destino
+        self.lote = lote
+        self.muestreo = muestreo
+        self.formato = formato
+        self.escritas = 0
+        self.escrituras = 0
+        self.perdidas = 0
+        self.descartadas = 0
+        self.max_pendientes = max_pendientes
+        self._random = random.Random(seed)
+        # SimpleQueue (en C) es varias veces más rápida que Queue; el límite se lleva
+        # aparte con el número de registros encolados y el de consumidos por el escritor
+        self._cola: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._secuencia = itertools.count(1)
+        self._encolados = 0
+        self._consumidos = 0
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._cerrado = False
+
+    def escribir(self, linea: str) -> None:
+        """
+        Encola una línea ya formateada (con su salto de línea).
+        """
+        self._encolar(linea)
+
+    def registrar(self, registro: Dict[str, Any]) -> None:
+        """
+        Encola un registro de acceso, salvo que lo descarte el muestreo.
+
+        Args:
+            registro: Diccionario con 'ip', 'tiempo' (segundos desde epoch),
+                      'peticion', 'status' y 'tamano'
+        """
+        if self.muestreo < 1 and self._random.random() >= self.muestreo:
+            status = registro.get("status")
+            if not isinstance(status, int) or status < 400:
+                with self._lock:
+                    self.descartadas += 1
+                return
+        self._encolar(registro)
+
+    def _encolar(self, elemento: Registro) -> None:
+        if self._cerrado:
+            self._volcar([self.formatear(elemento)])
+            return
+        if self._hilo is None:
+            self._arrancar()
+        # Con varios hilos a la vez el límite puede superarse por unos pocos registros
+        if self._encolados - self._consumidos >= self.max_pendientes:
+            with self._lock:
+                self.perdidas += 1
+            return
+        self._encolados = next(self._secuencia)
+        self._cola.put(elemento)
+
+    def _arrancar(self) -> None:
+        with self._lock:
+            if self._hilo is None and not self._cerrado:
+                self._hilo = threading.Thread(target=self._escritor, name="registro-accesos", daemon=True)
+                self._hilo.start()
+
+    def formatear(self, elemento: Registro) -> str:
+        """
+        Da formato de línea de log a un registro.
+        """
+        if isinstance(elemento, str):
+            return elemento
+        if self.formato == "json":
+            return json.dumps(elemento, ensure_ascii=False, default=str) + "\n"
+        peticion = str(elemento.get("peticion", "")).translate(_CARACTERES_CONTROL)
+        return (f"{elemento.get('ip', '-')} - - [{formatear_fecha(elemento.get('tiempo', time.time()))}] "
+                f"\"{peticion}\" {elemento.get('status', '-')} {elemento.get('tamano', '-')}\n")
+
+    def _escritor(self) -> None:
+        terminar = False
+        while not terminar:
+            lineas: List[str] = []
+            elemento = self._cola.get()
+            while True:
+                if elemento is _FIN:
+                    terminar = True
+                    break
+                self._consumidos += 1
+                lineas.append(self.formatear(elemento))
+                if len(lineas) >= self.lote:
+                    break
+                try:
+                    elemento = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+            if lineas:
+                self._volcar(lineas)
+
+    def _volcar(self, lineas: List[str]) -> None:
+        destino = self.destino or sys.stderr
+        try:
+            destino.write("".join(lineas))
+            destino.flush()
+        except (OSError, ValueError):
+            # Destino cerrado: el log no debe tumbar el servidor
+            return
+        self.escritas += len(lineas)
+        self.escrituras += 1
+
+    def cerrar(self, timeout: float = 1.0) -> None:
+        """
+        Escribe los registros pendientes y detiene el hilo escritor.
+        """
+        with self._lock:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            hilo = self._hilo
+        if hilo is not None:
+            self._cola.put(_FIN)
+            hilo.join(timeout)
+        # Registros encolados justo mientras se cerraba, detrás de la marca de fin
+        lineas = []
+        while True:
+            try:
+                elemento = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if elemento is not _FIN:
+                self._consumidos += 1
+                lineas.append(self.formatear(elemento))
+        if lineas:
+            self._volcar(lineas)
@@ -0,0 +1,106 @@
+"""
+Tests para registro_accesos.py
+Este archivo contiene pruebas para verificar la escritura en segundo plano y por
+lotes del log de accesos, sus formatos, el muestreo y la cola limitada.
+"""
+
+import io
+import json
+import threading
+import pytest
+
+from comun.registro_accesos import RegistroAccesos
+
+
+def test_escribe_todas_las_lineas_al_cerrar():
+    destino = io.StringIO()
+    registro = RegistroAccesos(destino, lote=10)
+    for i in range(95):
+        registro.escribir(f"linea {i}\n")
+    registro.cerrar()
+
+    lineas = destino.getvalue().splitlines()
+    assert lineas == [f"linea {i}" for i in range(95)], "Deben escribirse todas las líneas y en orden"
+    assert registro.escritas == 95
+    assert 10 <= registro.escrituras <= 95, "Las líneas pendientes deben escribirse en lotes de como mucho 10"
+
+
+def test_registros_tras_cerrar():
+    """
+    Verificar que lo que llega después de cerrar se escribe en el momento y no se pierde en la cola
+    """
+    destino = io.StringIO()
+    registro = RegistroAccesos(destino)
+    registro.escribir("antes\n")
+    registro.cerrar()
+    registro.escribir("despues\n")
+    registro.registrar(registro_acceso())
+    registro.cerrar()
+
+    lineas = destino.getvalue().splitlines()
+    assert lineas[:2] == ["antes", "despues"] and "GET /time" in lineas[2]
+    assert registro.escritas == 3
+
+
+def test_sin_lineas_no_arranca_hilo():
+    registro = RegistroAccesos(io.StringIO())
+    registro.cerrar()
+    assert registro.escrituras == 0
+
+
+def registro_acceso(status=200):
+    return {"ip": "127.0.0.1", "tiempo": 0, "peticion": "GET /time HTTP/1.1", "status": status, "tamano": "-"}
+
+
+def test_formato_texto_y_json():
+    registro = RegistroAccesos(io.StringIO())
+    linea = registro.formatear(registro_acceso())
+    assert linea.startswith("127.0.0.1 - - [") and linea.endswith('] "GET /time HTTP/1.1" 200 -\n'), \
+        "El formato de texto debe ser el de http.server"
+    assert registro.formatear(dict(registro_acceso(), peticion="GET /\x1b HTTP/1.1")).count("\\x1b") == 1, \
+        "Los caracteres de control deben escaparse"
+
+    destino = io.StringIO()
+    registro = RegistroAccesos(destino, formato="json")
+    registro.registrar(registro_acceso(404))
+    registro.cerrar()
+    assert json.loads(destino.getvalue()) == registro_acceso(404)
+
+    with pytest.raises(ValueError):
+        RegistroAccesos(formato="xml")
+
+
+def test_muestreo_conserva_errores():
+    destino = io.StringIO()
+    registro = RegistroAccesos(destino, muestreo=0.1, formato="json", seed=1)
+    for _ in range(1000):
+        registro.registrar(registro_acceso(200))
+    for _ in range(10):
+        registro.registrar(registro_acceso(500))
+    registro.cerrar()
+
+    escritos = [json.loads(linea)["status"] for linea in destino.getvalue().splitlines()]
+    assert escritos.count(500) == 10, "Las respuestas con error no deben descartarse"
+    assert 50 < escritos.count(200) < 150, "Debe guardarse aproximadamente el 10 % de las correctas"
+    assert registro.descartadas == 1000 - escritos.count(200)
+
+
+def test_cola_llena():
+    """
+    Verificar que con el escritor bloqueado los registros sobrantes se descartan y se cuentan
+    """
+    bloqueo = threading.Event()
+
+    class DestinoLento(io.StringIO):
+        def write(self, texto):
+            bloqueo.wait(5)
+            return super().write(texto)
+
+    destino = DestinoLento()
+    registro = RegistroAccesos(destino, lote=1, max_pendientes=5)
+    for _ in range(50):
+        registro.registrar(registro_acceso())
+    assert registro.perdidas >= 44, "Con la cola llena los registros deben descartarse sin bloquear"
+    bloqueo.set()
+    registro.cerrar()
+    assert registro.escritas + registro.perdidas == 50
@@ -0,0 +1,261 @@
+"""
+Métricas y log de accesos para los servidores hechos con http.server.
+
+ej1a3 y ej1b3 no exponen ninguna telemetría. Sus manejadores heredan de
+ManejadorInstrumentado y sus servidores son ServidorInstrumentado, que añaden:
+
+- Métricas de cada petición en un registro propio del servidor (comun.metricas):
+  peticiones por ruta, método y código, histograma de latencias con buckets fijos,
+  peticiones en curso y número de 404. Las rutas no declaradas se agrupan como
+  "otras" para que una ruta inventada no cree series nuevas; una ruta declarada con
+  un parámetro, como "/station/<id>", agrupa todas las que empiezan por "/station/".
+- enviar_metricas(), que responde con esas métricas en formato Prometheus (la ruta
+  /metrics de cada servidor).
+- Un log de accesos con tres modos: 'estandar' (el de http.server, síncrono por
+  stderr), 'asincrono' (un registro estructurado por petición que escribe en lotes
+  un RegistroAccesos en segundo plano) y 'desactivado'. Los registros descartados
+  por el muestreo o por tener la cola llena se publican también en /metrics.
+- enviar_cuerpo(), que envía una respuesta con Content-Length y, si el cliente lo
+  acepta y el cuerpo supera el umbral, comprimida con gzip, deflate o brotli
+  (comun.compresion). Los bytes enviados se cuentan por codificación.
+
+Registrar una petición son dos búsquedas en diccionarios, una búsqueda binaria y
+unas sumas bajo lock: unos pocos microsegundos (ver medir_sobrecarga()).
+"""
+
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, Iterable, Optional, Union
+
+from comun.compresion import Compresor, CuerpoEstatico
+from comun.metricas import RegistroMetricas
+from comun.registro_accesos import RegistroAccesos
+
+# Buckets de latencia en segundos; las respuestas de estos servidores rondan el milisegundo
+BUCKETS_SERVIDOR = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+RUTA_DESCONOCIDA = "otras"
+CONTENT_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+LOG_ESTANDAR = "estandar"
+LOG_ASINCRONO = "asincrono"
+LOG_DESACTIVADO = "desactivado"
+MODOS_LOG = (LOG_ESTANDAR, LOG_ASINCRONO, LOG_DESACTIVADO)
+
+
+class MetricasServidor:
+    """
+    Métricas de las peticiones atendidas por un servidor.
+
+    Atributos:
+        registro: Registro con las métricas, exportable en formato Prometheus
+        rutas: Rutas que se cuentan por separado
+    """
+
+    def __init__(self, rutas: Iterable[str] = (), registro: Optional[RegistroMetricas] = None):
+        self.registro = registro if registro is not None else RegistroMetricas()
+        rutas = tuple(rutas)
+        self.rutas = frozenset(ruta for ruta in rutas if "<" not in ruta)
+        # (prefijo, plantilla) de las rutas con parámetros
+        self._prefijos = tuple((ruta[:ruta.index("<")], ruta) for ruta in rutas if "<" in ruta)
+        self.peticiones = self.registro.contador(
+            "http_server_requests_total", "Peticiones atendidas", ("route", "method", "status"))
+        self.latencia = self.registro.histograma(
+            "http_server_request_duration_seconds", "Tiempo de respuesta de las peticiones", ("route",),
+            BUCKETS_SERVIDOR)
+        self.en_curso = self.registro.gauge("http_server_requests_in_flight", "Peticiones en curso").con()
+        self.no_encontrados = self.registro.contador("http_server_not_found_total", "Respuestas 404").con()
+        self.bytes_enviados = self.registro.contador(
+            "http_server_response_bytes_total", "Bytes de cuerpo enviados", ("encoding",))
+        self.log_descartados = self.registro.contador(
+            "http_server_access_log_dropped_total", "Registros de acceso no escritos", ("reason",))
+
+    def ruta(self, path: str) -> str:
+        """
+        Etiqueta de ruta de una petición (sin query string, o "otras" si no está declarada).
+        """
+        ruta = path.split("?", 1)[0]
+        if ruta in self.rutas:
+            return ruta
+        for prefijo, plantilla in self._prefijos:
+            if ruta.startswith(prefijo) and len(ruta) > len(prefijo):
+                return plantilla
+        return RUTA_DESCONOCIDA
+
+    def registrar(self, path: str, metodo: str, status: int, segundos: float) -> None:
+        """
+        Registra una petición terminada.
+        """
+        ruta = self.ruta(path)
+        self.peticiones.con(ruta, metodo, str(status)).inc()
+        self.latencia.con(ruta).observar(segundos)
+        if status == 404:
+            self.no_encontrados.inc()
+
+    def actualizar_log(self, registro_accesos: RegistroAccesos) -> None:
+        """
+        Copia los contadores de registros descartados del log de accesos.
+        """
+        self.log_descartados.con("queue_full").set(registro_accesos.perdidas)
+        self.log_descartados.con("sampling").set(registro_accesos.descartadas)
+
+    def medir_sobrecarga(self, repeticiones: int = 10000) -> float:
+        """
+        Devuelve el coste medio, en microsegundos, de registrar una petición.
+        """
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            self.en_curso.inc()
+            self.registrar("/medicion", "GET", 200, 0.001)
+            self.en_curso.dec()
+        return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+class ServidorInstrumentado(HTTPServer):
+    """
+    HTTPServer con métricas y log de accesos configurable.
+
+    Atributos:
+        metricas: MetricasServidor de las peticiones atendidas
+        log: Modo del log de accesos ('estandar', 'asincrono' o 'desactivado')
+        registro_accesos: RegistroAccesos del modo 'asincrono' (None en los demás)
+        compresor: Compresor de las respuestas (None, sin compresión)
+    """
+
+    def __init__(self, server_address, RequestHandlerClass, rutas: Iterable[str] = (),
+                 log: str = LOG_ASINCRONO, registro_accesos: Optional[RegistroAccesos] = None,
+                 compresor: Optional[Compresor] = None, bind_and_activate: bool = True):
+        """
+        Args:
+            rutas: Rutas que se cuentan por separado en las métricas
+            log: Modo del log de accesos
+            registro_accesos: RegistroAccesos que se usa en el modo 'asincrono'
+                              (por defecto, uno que escribe en stderr)
+            compresor: Compresor de las respuestas (por defecto, uno con el umbral estándar)
+        """
+        if log not in MODOS_LOG:
+            raise ValueError(f"Modo de log desconocido: {log}")
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+        self.metricas = MetricasServidor(rutas)
+        self.log = log
+        self.compresor = compresor if compresor is not None else Compresor()
+        self.registro_accesos = None
+        if log == LOG_ASINCRONO:
+            self.registro_accesos = registro_accesos if registro_accesos is not None else RegistroAccesos()
+
+    def server_close(self):
+        super().server_close()
+        if self.registro_accesos is not None:
+            self.registro_accesos.cerrar()
+
+
+class ServidorInstrumentadoHilos(ThreadingMixIn, ServidorInstrumentado):
+    """
+    ServidorInstrumentado que atiende cada conexión en un hilo.
+    """
+
+    daemon_threads = True
+
+
+class ManejadorInstrumentado(BaseHTTPRequestHandler):
+    """
+    Manejador base que mide cada petición y escribe el log de accesos en segundo plano.
+
+    Funciona también con un HTTPServer normal: sin server.metricas no mide nada y sin
+    server.registro_accesos escribe el log como BaseHTTPRequestHandler.
+    Los errores (log_error) no pasan por el muestreo y se escriben en todos los modos.
+    """
+
+    _inicio: Optional[float] = None
+    _status: Optional[int] = None
+
+    def parse_request(self):
+        correcta = super().parse_request()
+        metricas = getattr(self.server, "metricas", None)
+        if correcta and metricas is not None:
+            # Se mide desde que se ha leído la petición hasta que termina la respuesta
+            self._inicio = time.perf_counter()
+            metricas.en_curso.inc()
+        return correcta
+
+    def handle_one_request(self):
+        self._inicio = None
+        self._status = None
+        try:
+            super().handle_one_request()
+        finally:
+            if self._inicio is not None:
+                metricas = self.server.metricas
+                metricas.en_curso.dec()
+                metricas.registrar(self.path, self.command, self._status or 0, time.perf_counter() - self._inicio)
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def enviar_cuerpo(self, code: int, body: Union[bytes, CuerpoEstatico], content_type: str,
+                      cabeceras: Optional[Dict[str, str]] = None, cachear: bool = True) -> None:
+        """
+        Envía una respuesta completa, comprimida si el cliente lo acepta.
+
+        Args:
+            code: Código de estado
+            body: Cuerpo (bytes, o CuerpoEstatico ya comprimido de antemano)
+            content_type: Valor de Content-Type
+            cabeceras: Cabeceras adicionales
+            cachear: Si el cuerpo comprimido se guarda en la caché del compresor
+                     (False para los cuerpos que cambian en cada petición)
+        """
+        compresor = getattr(self.server, "compresor", None)
+        codificacion = None
+        datos = body.body if isinstance(body, CuerpoEstatico) else body
+        if compresor is not None:
+            datos, codificacion = compresor.codificar(body, self.headers.get("Accept-Encoding"), cachear)
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(datos)))
+        if codificacion is not None:
+            self.send_header("Content-Encoding", codificacion)
+        if compresor is not None and len(body) >= compresor.umbral:
+            # La respuesta depende de Accept-Encoding, también cuando no se comprime
+            self.send_header("Vary", "Accept-Encoding")
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(datos)
+        metricas = getattr(self.server, "metricas", None)
+        if metricas is not None:
+            metricas.bytes_enviados.con(codificacion or "identity").inc(len(datos))
+
+    def enviar_metricas(self):
+        """
+        Responde con las métricas del servidor en formato Prometheus.
+        """
+        metricas = getattr(self.server, "metricas", None)
+        registro_accesos = getattr(self.server, "registro_accesos", None)
+        if metricas is not None and registro_accesos is not None:
+            metricas.actualizar_log(registro_accesos)
+        body = metricas.registro.exportar_prometheus().encode() if metricas is not None else b""
+        self.enviar_cuerpo(200, body, CONTENT_TYPE_PROMETHEUS, cachear=False)
+
+    def log_request(self, code="-", size="-"):
+        if getattr(self.server, "log", None) == LOG_DESACTIVADO:
+            return
+        registro = getattr(self.server, "registro_accesos", None)
+        if registro is None:
+            super().log_request(code, size)
+            return
+        if isinstance(code, HTTPStatus):
+            code = code.value
+        # El formato de la línea se hace en el hilo escritor
+        registro.registrar({"ip": self.client_address[0], "tiempo": time.time(),
+                            "peticion": self.requestline, "status": code, "tamano": size})
+
+    def log_message(self, format, *args):
+        registro = getattr(self.server, "registro_accesos", None)
+        if registro is None:
+            super().log_message(format, *args)
+            return
+        mensaje = (format % args).translate(getattr(self, "_control_char_table", {}))
+        registro.escribir(f"{self.address_string()} - - [{self.log_date_time_string()}] {mensaje}\n")
@@ -0,0 +1,138 @@
+"""
+Tests para servidor_http.py
+Este archivo contiene pruebas para verificar las métricas y el log de accesos de
+los servidores instrumentados.
+"""
+
+import io
+import json
+import threading
+import pytest
+import requests
+
+from comun.registro_accesos import RegistroAccesos
+from comun.servidor_http import ManejadorInstrumentado, MetricasServidor, ServidorInstrumentado
+
+
+GRANDE = json.dumps([{"station_id": str(i), "num_bikes_available": i % 20} for i in range(200)]).encode()
+
+
+class Handler(ManejadorInstrumentado):
+    def do_GET(self):
+        if self.path.startswith("/hola"):
+            self.send_response(200)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"hola")
+        elif self.path == "/grande":
+            self.enviar_cuerpo(200, GRANDE, "application/json")
+        elif self.path == "/metrics":
+            self.enviar_metricas()
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def servidor():
+    log = io.StringIO()
+    server = ServidorInstrumentado(("localhost", 0), Handler, rutas=("/hola", "/metrics"),
+                                   registro_accesos=RegistroAccesos(log))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, log, f"http://localhost:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    thread.join(1)
+
+
+def test_metricas_por_ruta(servidor):
+    server, _, url = servidor
+    requests.get(url + "/hola?x=1")
+    requests.get(url + "/hola")
+    requests.get(url + "/no-existe")
+    requests.get(url + "/otra-inventada")
+    # La petición se registra después de enviar la respuesta
+    server.shutdown()
+
+    metricas = server.metricas
+    assert metricas.peticiones.valor("/hola", "GET", "200") == 2, "La query string no debe crear otra ruta"
+    assert metricas.peticiones.valor("otras", "GET", "404") == 2
+    assert metricas.no_encontrados.valor == 2
+    assert metricas.latencia.con("/hola").total == 2
+    assert metricas.en_curso.valor == 0, "Al terminar no debe quedar ninguna petición en curso"
+
+
+def test_rutas_con_parametros():
+    metricas = MetricasServidor(rutas=("/status", "/station/<id>"))
+    assert metricas.ruta("/station/42?x=1") == "/station/<id>"
+    assert metricas.ruta("/station/") == "otras", "El parámetro no puede estar vacío"
+    assert metricas.ruta("/status") == "/status"
+
+
+def test_log_asincrono(servidor):
+    server, log, url = servidor
+    requests.get(url + "/hola")
+    server.registro_accesos.cerrar()
+    assert '"GET /hola HTTP/1.1" 200' in log.getvalue(), "La línea debe tener el formato de http.server"
+
+
+def test_modos_de_log(capsys):
+    """
+    Verificar los modos 'estandar' (stderr síncrono) y 'desactivado'
+    """
+    for modo, esperado in (("estandar", True), ("desactivado", False)):
+        server = ServidorInstrumentado(("localhost", 0), Handler, log=modo)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        requests.get(f"http://localhost:{server.server_port}/hola")
+        server.shutdown()
+        server.server_close()
+        assert server.registro_accesos is None
+        assert ('"GET /hola HTTP/1.1" 200' in capsys.readouterr().err) == esperado, f"Modo {modo}"
+
+    with pytest.raises(ValueError):
+        ServidorInstrumentado(("localhost", 0), Handler, log="otro")
+
+
+def test_descartes_en_metricas():
+    server = ServidorInstrumentado(("localhost", 0), Handler, rutas=("/metrics",),
+                                   registro_accesos=RegistroAccesos(io.StringIO(), muestreo=0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://localhost:{server.server_port}"
+        for _ in range(3):
+            requests.get(url + "/hola")
+        texto = requests.get(url + "/metrics").text
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'http_server_access_log_dropped_total{reason="sampling"} 3' in texto
+    assert 'http_server_access_log_dropped_total{reason="queue_full"} 0' in texto
+
+
+def test_compresion(servidor):
+    server, _, url = servidor
+    response = requests.get(url + "/grande", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < len(GRANDE) / 3
+    assert response.content == GRANDE, "requests debe descomprimir el cuerpo"
+
+    response = requests.get(url + "/grande", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers and response.content == GRANDE
+    response = requests.get(url + "/hola", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers, "Los cuerpos pequeños no deben comprimirse"
+
+    server.shutdown()
+    assert server.metricas.bytes_enviados.valor("identity") == len(GRANDE)
+    assert 0 < server.metricas.bytes_enviados.valor("gzip") < len(GRANDE) / 3
+
+
+def test_sobrecarga():
+    """
+    Verificar que registrar una petición cuesta pocos microsegundos
+    """
+    metricas = MetricasServidor(rutas=("/medicion",))
+    # Margen amplio para máquinas lentas; aquí ronda 2 µs
+    assert metricas.medir_sobrecarga() < 50